@@ -0,0 +1,154 @@
+"""Compare the JSON decoders on execution details and log lines.
+
+Usage:
+    python benchmarks/decoders.py [--details PATH] [--logs PATH] [--repeat N]
+
+Recorded fixtures can be passed in, an execution details response saved from
+`/pipeline/api/pipelines/execution/v2/{id}` and a log blob saved from
+`/log-service/blob`. Otherwise synthetic fixtures of a similar shape are generated.
+"""
+
+import argparse
+import json
+import random
+import timeit
+import typing as t
+from pathlib import Path
+
+from harness_tui.api.decoder import DECODERS, Decoder
+
+
+def _node(rng: random.Random, i: int) -> t.Dict[str, t.Any]:
+    return {
+        "uuid": f"node-{i}",
+        "setupId": f"setup-{i}",
+        "name": f"Step {i}",
+        "identifier": f"step_{i}",
+        "baseFqn": f"pipeline.stages.build.spec.execution.steps.step_{i}",
+        "stepType": rng.choice(["Run", "ShellScript", "Http", "K8sRollingDeploy"]),
+        "status": rng.choice(["Success", "Failed", "Running", "Skipped"]),
+        "startTs": 1716926400000 + i * 1000,
+        "endTs": 1716926400000 + i * 1000 + rng.randrange(100000),
+        "logBaseKey": f"accountId:acct/orgId:o/projectId:p/pipelineId:x/runSequence:1/level0:pipeline/level1:stages/level2:build/level3:step_{i}",
+        "outcomes": {
+            "output": {"outputVariables": {f"VAR_{j}": "x" * 20 for j in range(5)}}
+        },
+        "stepParameters": {
+            "spec": {"command": "echo hello\n" * rng.randrange(1, 20), "shell": "Bash"},
+            "timeout": "10m",
+        },
+        "executableResponses": [{"async": {"callbackIds": [f"cb-{i}"], "logKeys": []}}],
+        "delegateInfoList": [
+            {"id": "delegate", "name": "delegate", "taskId": f"task-{i}"}
+        ],
+        "unitProgresses": [{"unitName": "Execute", "status": "SUCCESS"}],
+    }
+
+
+def synthetic_details(nodes: int = 500, seed: int = 0) -> bytes:
+    """A response shaped like the execution details of a large pipeline."""
+    rng = random.Random(seed)
+    node_map = {f"node-{i}": _node(rng, i) for i in range(nodes)}
+    payload = {
+        "status": "SUCCESS",
+        "data": {
+            "pipelineExecutionSummary": {
+                "pipelineIdentifier": "x",
+                "planExecutionId": "plan",
+                "status": "Success",
+                "layoutNodeMap": {
+                    f"stage-{i}": {
+                        "nodeType": "CI",
+                        "status": "Success",
+                        "edgeLayoutList": {},
+                    }
+                    for i in range(nodes // 20)
+                },
+            },
+            "executionGraph": {
+                "rootNodeId": "node-0",
+                "nodeMap": node_map,
+                "nodeAdjacencyListMap": {
+                    key: {"children": [], "nextIds": []} for key in node_map
+                },
+            },
+        },
+    }
+    return json.dumps(payload).encode()
+
+
+def synthetic_logs(lines: int = 100_000, seed: int = 0) -> bytes:
+    """A log blob shaped like the output of the log service."""
+    rng = random.Random(seed)
+    return b"".join(
+        json.dumps(
+            {
+                "level": rng.choice(["info", "info", "info", "warn", "error"]),
+                "pos": i,
+                "out": f"Step {i}: {'x' * rng.randrange(10, 120)}\n",
+                "time": f"2024-05-28T20:{i // 60 % 60:02d}:{i % 60:02d}.000Z",
+                "args": {"stage": "build", "step": f"step_{i % 50}"},
+            }
+        ).encode()
+        + b"\n"
+        for i in range(lines)
+    )
+
+
+def available() -> t.List[Decoder]:
+    """The decoders which are installed, the standard library first."""
+    decoders = []
+    for factory in DECODERS.values():
+        try:
+            decoders.append(factory())
+        except ImportError:
+            continue
+    return decoders[::-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--details", type=Path, help="A recorded execution details response."
+    )
+    parser.add_argument("--logs", type=Path, help="A recorded log blob.")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per decoder, the best is reported."
+    )
+    args = parser.parse_args()
+
+    details = args.details.read_bytes() if args.details else synthetic_details()
+    lines = (args.logs.read_bytes() if args.logs else synthetic_logs()).splitlines()
+    lines = [line for line in lines if line]
+    print(
+        f"execution details: {len(details) / 1024 / 1024:.1f} MB, log lines: {len(lines)}"
+    )
+
+    baseline: t.Dict[str, float] = {}
+    for decoder in available():
+        results = {
+            "details": min(
+                timeit.repeat(
+                    lambda: decoder.loads(details), number=1, repeat=args.repeat
+                )
+            ),
+            "logs": min(
+                timeit.repeat(
+                    lambda: [decoder.loads_log_line(line) for line in lines],
+                    number=1,
+                    repeat=args.repeat,
+                )
+            ),
+        }
+        baseline = baseline or results
+        print(
+            f"{decoder.name:>8}  "
+            + "  ".join(
+                f"{name} {seconds * 1000:8.1f} ms ({baseline[name] / seconds:4.1f}x)"
+                for name, seconds in results.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
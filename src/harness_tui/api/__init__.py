@@ -1,56 +1,107 @@
 import os
+import typing as t
+from pathlib import Path
 
+import httpx
 import requests
 import requests.adapters
 
 from harness_tui.api.logs import LogClient
 from harness_tui.api.pipeline import PipelineClient
+from harness_tui.api.store import ExecutionStore
+from harness_tui.utils import data_dir
+
+try:
+    import h2  # noqa: F401
+except ImportError:
+    HTTP2 = False
+else:
+    HTTP2 = True
+"""Whether HTTP/2 is available for the async transport. Install `httpx[http2]` to enable it."""
 
 
 class HarnessClient:
     """Client for interacting with the Harness API."""
 
-    def __init__(self, api_key: str, account: str, org: str, project: str):
+    def __init__(
+        self,
+        api_key: str,
+        account: str,
+        org: str,
+        project: str,
+        data_dir: t.Optional[t.Union[str, Path]] = None,
+    ):
         self.api_key = api_key
         self.account = account
         self.org = org
         self.project = project
+        self.data_dir = data_dir
+        self.store = ExecutionStore(Path(data_dir) / "executions") if data_dir else None
         session = requests.Session()
         session.headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
         }
-        adapter = requests.adapters.HTTPAdapter(max_retries=3)
+        # Sized for the log scraper, which downloads many logs at once from threads
+        adapter = requests.adapters.HTTPAdapter(max_retries=3, pool_maxsize=32)
         session.mount("https://", adapter)
         self.session = session
+        # The async transport multiplexes requests over a single HTTP/2 connection to
+        # app.harness.io when h2 is installed, otherwise it pools HTTP/1.1 connections
+        self.async_session = httpx.AsyncClient(
+            headers=dict(session.headers),
+            http2=HTTP2,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            transport=httpx.AsyncHTTPTransport(retries=3, http2=HTTP2),
+        )
         self.pipelines = PipelineClient(
-            session, account=account, org=org, project=project
+            session,
+            account=account,
+            org=org,
+            project=project,
+            async_session=self.async_session,
+            store=self.store,
+        )
+        self.logs = LogClient(
+            session,
+            account=account,
+            org=org,
+            project=project,
+            async_session=self.async_session,
         )
-        self.logs = LogClient(session, account=account, org=org, project=project)
 
     @classmethod
     def default(cls) -> "HarnessClient":
         """Create a default instance of the class from environment variables."""
+        account = os.environ["HARNESS_ACCOUNT"]
+        org = os.environ["HARNESS_ORG"]
+        project = os.environ["HARNESS_PROJECT"]
         return cls(
             api_key=os.environ["HARNESS_API_KEY"],
-            account=os.environ["HARNESS_ACCOUNT"],
-            org=os.environ["HARNESS_ORG"],
-            project=os.environ["HARNESS_PROJECT"],
+            account=account,
+            org=org,
+            project=project,
+            data_dir=data_dir(account, org, project),
         )
 
+    async def aclose(self) -> None:
+        """Close the async transport and any pooled connections."""
+        await self.async_session.aclose()
+
     def __getstate__(self):
         return {
             "api_key": self.api_key,
             "account": self.account,
             "org": self.org,
             "project": self.project,
+            "data_dir": self.data_dir,
         }
 
     def __setstate__(self, state):
         self.__init__(**state)
 
 
-__all__ = ["HarnessClient"]
+__all__ = ["HTTP2", "HarnessClient"]
 
 
 # Example usage
@@ -0,0 +1,134 @@
+"""Pluggable JSON decoding for API responses and log lines.
+
+The fastest installed decoder is used, msgspec then orjson then the standard library,
+unless `HARNESS_TUI_JSON_DECODER` names another one which is installed. Every decoder
+raises a `ValueError` for malformed input, like `json.loads`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import typing as t
+import warnings
+from dataclasses import dataclass
+
+LOG_FIELDS = ("out", "level", "time", "pos")
+"""The fields of a log line which are used, others are dropped while decoding."""
+
+
+class LogLine(t.TypedDict, total=False):
+    """A decoded log line."""
+
+    out: t.Any
+    level: t.Any
+    time: t.Any
+    pos: t.Any
+
+
+@dataclass(frozen=True)
+class Decoder:
+    """A JSON implementation."""
+
+    name: str
+    loads: t.Callable[[t.Union[bytes, str]], t.Any]
+    """Decode a JSON document."""
+    loads_log_line: t.Callable[[t.Union[bytes, str]], LogLine]
+    """Decode a log line, keeping only the `LOG_FIELDS`."""
+
+
+def _project(payload: t.Dict[str, t.Any]) -> LogLine:
+    return t.cast(LogLine, {k: payload[k] for k in LOG_FIELDS if k in payload})
+
+
+def _stdlib() -> Decoder:
+    return Decoder("json", json.loads, lambda data: _project(json.loads(data)))
+
+
+def _orjson() -> Decoder:
+    import orjson
+
+    return Decoder("orjson", orjson.loads, lambda data: _project(orjson.loads(data)))
+
+
+def _msgspec() -> Decoder:
+    import msgspec
+
+    document = msgspec.json.Decoder()
+    # Typed decoding skips the fields which aren't declared instead of building them
+    log_line = msgspec.json.Decoder(LogLine)
+
+    def loads(data: t.Union[bytes, str]) -> t.Any:
+        try:
+            return document.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def loads_log_line(data: t.Union[bytes, str]) -> LogLine:
+        try:
+            return log_line.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return Decoder("msgspec", loads, loads_log_line)
+
+
+DECODERS: t.Dict[str, t.Callable[[], Decoder]] = {
+    "msgspec": _msgspec,
+    "orjson": _orjson,
+    "json": _stdlib,
+}
+"""Decoder factories by name in order of preference."""
+
+
+def get_decoder(name: t.Optional[str] = None) -> Decoder:
+    """Get a decoder by name or the fastest one installed.
+
+    Raises:
+        ImportError: If the named decoder isn't installed.
+        KeyError: If there is no decoder with that name.
+    """
+    if name:
+        return DECODERS[name]()
+    for factory in DECODERS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _stdlib()
+
+
+def _configured() -> Decoder:
+    """The decoder named by `HARNESS_TUI_JSON_DECODER`, falling back to the fastest."""
+    name = os.getenv("HARNESS_TUI_JSON_DECODER")
+    try:
+        return get_decoder(name)
+    except (ImportError, KeyError) as e:
+        warnings.warn(
+            f"Can't use the JSON decoder HARNESS_TUI_JSON_DECODER={name!r} ({e!r}),"
+            " using the fastest one installed",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return get_decoder()
+
+
+decoder = _configured()
+"""The decoder in use."""
+
+
+def use(name: t.Optional[str] = None) -> Decoder:
+    """Switch the decoder in use, returning it."""
+    global decoder
+    decoder = get_decoder(name)
+    return decoder
+
+
+def loads(data: t.Union[bytes, str]) -> t.Any:
+    """Decode a JSON document with the decoder in use."""
+    return decoder.loads(data)
+
+
+def loads_log_line(data: t.Union[bytes, str]) -> LogLine:
+    """Decode a log line with the decoder in use, keeping only the `LOG_FIELDS`."""
+    return decoder.loads_log_line(data)
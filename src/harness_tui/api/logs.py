@@ -1,14 +1,77 @@
-import json
 import typing as t
 from contextlib import suppress
 
+import httpx
 import requests
 import sseclient
 from requests.exceptions import RequestException
 
+from harness_tui.api import decoder
 from harness_tui.api.mixin import ClientMixin
 from harness_tui.utils import ttl_cache
 
+BLOB_CHUNK_SIZE = 16 * 1024
+"""The number of bytes read at a time when streaming a log blob."""
+
+
+async def _aiter_sse(
+    lines: t.AsyncIterator[str],
+) -> t.AsyncIterator[t.Tuple[str, str]]:
+    """Parse a server-sent event stream into (event, data) pairs."""
+    event, data = "message", []
+    async for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+def _iter_byte_lines(chunks: t.Iterable[bytes]) -> t.Iterator[bytes]:
+    """Split a stream of bytes into lines, keeping their line endings.
+
+    The lengths of the lines add up to the bytes read, whatever the line endings.
+    """
+    buffer = b""
+    for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if buffer:
+        yield buffer
+
+
+async def _aiter_byte_lines(chunks: t.AsyncIterator[bytes]) -> t.AsyncIterator[bytes]:
+    """Split a stream of bytes into lines asynchronously, see `_iter_byte_lines`."""
+    buffer = b""
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if buffer:
+        yield buffer
+
+
+def _decode_blob_line(line: bytes, pos: t.Optional[int]) -> t.Optional[decoder.LogLine]:
+    """Decode a line of a blob unless it is empty or positioned before `pos`."""
+    line = line.rstrip(b"\r\n")
+    if not line:
+        return None
+    payload = decoder.loads_log_line(line)
+    if pos is not None and payload.get("pos", pos) < pos:
+        return None
+    return payload
+
 
 class LogClient(ClientMixin):
     BASE_URL = "https://app.harness.io/gateway/log-service/"
@@ -21,6 +84,7 @@ class LogClient(ClientMixin):
         account: str,
         org: str,
         project: str,
+        async_session: t.Optional[httpx.AsyncClient] = None,
     ) -> None:
         """A wrapper around the Harness API for managing pipelines.
 
@@ -30,55 +94,113 @@ class LogClient(ClientMixin):
             org (str): The Harness organization identifier.
             project (str): The Harness project identifier.
             session (requests.Session): An authenticated requests session.
+            async_session (httpx.AsyncClient): An authenticated httpx client used by the
+                async methods.
         """
         self.session = session
+        self.async_session = async_session
         self.account = account
         self.org = org
         self.project = project
 
-    @ttl_cache(300)
+    @property
+    def cache_key(self) -> t.Tuple[str]:
+        """Identifies the client's account in cache keys."""
+        return (self.account,)
+
+    @ttl_cache(300, maxsize=4, namespace="logs.token")
     def get_log_token(self):
         """Get a log token."""
         return self._request(
             "GET", "token", params={"accountID": self.account}, parse_json=False
         ).text
 
-    def blob(self, log_key: str) -> t.Iterable[dict]:
-        """Get a new line delimited json blob of log data."""
+    @ttl_cache(300, maxsize=4, namespace="logs.token")
+    async def aget_log_token(self):
+        """Get a log token asynchronously."""
+        return (
+            await self._arequest(
+                "GET", "token", params={"accountID": self.account}, parse_json=False
+            )
+        ).text
+
+    def _log_request(self, path: str, log_key: str, token: str) -> t.Dict[str, t.Any]:
+        return {
+            "method": "GET",
+            "path": path,
+            "headers": {
+                "Accept": "*/*",
+                "Content-Type": "application/json",
+                "X-Harness-Token": token,
+            },
+            "params": {
+                "accountID": self.account,
+                "X-Harness-Token": "",
+                "key": log_key,
+            },
+        }
+
+    def _blob_request(self, log_key: str, token: str, start: int) -> t.Dict[str, t.Any]:
+        request = self._log_request("blob", log_key, token)
+        if start:
+            request["headers"]["Range"] = f"bytes={start}-"
+        return request
+
+    def blob(
+        self, log_key: str, *, start: int = 0, pos: t.Optional[int] = None
+    ) -> t.Iterable[dict]:
+        """Stream a new line delimited json blob of log data.
+
+        The blob is read in chunks and lines are yielded as soon as they arrive.
+
+        Args:
+            log_key (str): The key of the log.
+            start (int): The byte offset to resume reading from. It must be the start
+                of a line, ie. the total size of the lines already read including
+                their line endings.
+            pos (int): Skip the log lines before this position.
+        """
         with suppress(RequestException):
-            for line in self._request(
-                "GET",
-                "blob",
-                headers={
-                    "Accept": "*/*",
-                    "Content-Type": "application/json",
-                    "X-Harness-Token": self.get_log_token(),
-                },
-                params={
-                    "accountID": self.account,
-                    "X-Harness-Token": "",
-                    "key": log_key,
-                },
+            with self._request(
+                **self._blob_request(log_key, self.get_log_token(), start),
+                stream=True,
                 parse_json=False,
-            ).iter_lines():
-                yield json.loads(line.decode("utf-8"))
+            ) as response:
+                # A server which ignores the range sends the whole blob
+                skip = start if response.status_code != 206 else 0
+                for line in _iter_byte_lines(
+                    response.iter_content(chunk_size=BLOB_CHUNK_SIZE)
+                ):
+                    if skip > 0:
+                        skip -= len(line)
+                    elif payload := _decode_blob_line(line, pos):
+                        yield payload
+
+    async def ablob(
+        self, log_key: str, *, start: int = 0, pos: t.Optional[int] = None
+    ) -> t.AsyncIterator[dict]:
+        """Stream a new line delimited json blob of log data asynchronously.
+
+        See `blob` for the arguments.
+        """
+        with suppress(httpx.HTTPError):
+            async with self._astream(
+                **self._blob_request(log_key, await self.aget_log_token(), start)
+            ) as response:
+                skip = start if response.status_code != 206 else 0
+                async for line in _aiter_byte_lines(
+                    response.aiter_bytes(BLOB_CHUNK_SIZE)
+                ):
+                    if skip > 0:
+                        skip -= len(line)
+                    elif payload := _decode_blob_line(line, pos):
+                        yield payload
 
     def stream(self, log_key: str) -> t.Iterable[dict]:
         """Stream log data."""
         with suppress(RequestException):
             response = self._request(
-                "GET",
-                "stream",
-                headers={
-                    "Accept": "*/*",
-                    "Content-Type": "application/json",
-                    "X-Harness-Token": self.get_log_token(),
-                },
-                params={
-                    "accountID": self.account,
-                    "X-Harness-Token": "",
-                    "key": log_key,
-                },
+                **self._log_request("stream", log_key, self.get_log_token()),
                 stream=True,
                 parse_json=False,
             )
@@ -91,4 +213,21 @@ class LogClient(ClientMixin):
                     else:
                         raise Exception(f"Error streaming logs: {sse.data}")
                 else:
-                    yield json.loads(sse.data)
+                    yield decoder.loads_log_line(sse.data)
+
+    async def astream(self, log_key: str) -> t.AsyncIterator[dict]:
+        """Stream log data asynchronously."""
+        with suppress(httpx.HTTPError):
+            async with self._astream(
+                **self._log_request("stream", log_key, await self.aget_log_token())
+            ) as response:
+                async for event, data in _aiter_sse(response.aiter_lines()):
+                    if event == "ping":
+                        continue
+                    elif event == "error":
+                        if data.upper() == "EOF":
+                            break
+                        else:
+                            raise Exception(f"Error streaming logs: {data}")
+                    else:
+                        yield decoder.loads_log_line(data)
@@ -1,8 +1,12 @@
 import typing as t
+from contextlib import asynccontextmanager
 from urllib.parse import urljoin, urlparse
 
+import httpx
 import requests
 
+from harness_tui.api import decoder
+
 
 class ClientMixin:
     """A mixin for making requests to the Harness API."""
@@ -13,6 +17,15 @@ class ClientMixin:
     session: requests.Session
     """A requests session to use for making requests."""
 
+    async_session: t.Optional[httpx.AsyncClient] = None
+    """An httpx client to use for making asynchronous requests."""
+
+    def _url(self, path: str) -> str:
+        """Resolve a path against the base URL unless it is already absolute."""
+        if not urlparse(path).scheme:
+            return urljoin(self.BASE_URL, path)
+        return path
+
     def _request(
         self,
         method: t.Literal["GET", "POST", "PUT", "DELETE"],
@@ -33,14 +46,83 @@ class ClientMixin:
         Returns:
             t.Any: The JSON response.
         """
-        if not urlparse(path).scheme:
-            path = urljoin(self.BASE_URL, path)
-        response = getattr(self.session, method.lower())(path, **kwargs)
+        response = getattr(self.session, method.lower())(self._url(path), **kwargs)
         response.raise_for_status()
         if parse_json:
-            return response.json()
+            return decoder.loads(response.content)
         return response
 
+    def _async_kwargs(self, kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        """Translate requests style keyword arguments to their httpx equivalents."""
+        if self.async_session is None:
+            raise RuntimeError(
+                f"{type(self).__name__} was created without an async session."
+            )
+        kwargs.pop("stream", None)
+        data = kwargs.get("data")
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = kwargs.pop("data")
+        return kwargs
+
+    async def _arequest(
+        self,
+        method: t.Literal["GET", "POST", "PUT", "DELETE"],
+        path: str,
+        parse_json: bool = True,
+        **kwargs,
+    ) -> t.Any:
+        """Make an asynchronous request to the Harness API.
+
+        This is the async counterpart of `_request`. The request runs on the event loop
+        so cancelling the awaiting task also cancels the HTTP call.
+
+        Args:
+            method (str): The HTTP method to use.
+            path (str): The path to request.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
+
+        Returns:
+            t.Any: The JSON response.
+        """
+        kwargs = self._async_kwargs(kwargs)
+        response = await t.cast(httpx.AsyncClient, self.async_session).request(
+            method, self._url(path), **kwargs
+        )
+        response.raise_for_status()
+        if parse_json:
+            return decoder.loads(response.content)
+        return response
+
+    @asynccontextmanager
+    async def _astream(
+        self,
+        method: t.Literal["GET", "POST", "PUT", "DELETE"],
+        path: str,
+        **kwargs,
+    ) -> t.AsyncIterator[httpx.Response]:
+        """Make an asynchronous request to the Harness API and stream the response.
+
+        Args:
+            method (str): The HTTP method to use.
+            path (str): The path to request.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
+
+        Yields:
+            httpx.Response: The response with an unread body.
+        """
+        kwargs = self._async_kwargs(kwargs)
+        async with t.cast(httpx.AsyncClient, self.async_session).stream(
+            method, self._url(path), **kwargs
+        ) as response:
+            response.raise_for_status()
+            yield response
+
     def get(self, path: str, **kwargs) -> t.Any:
         """Make a GET request to the Harness API.
 
@@ -88,3 +170,19 @@ class ClientMixin:
             t.Any: The JSON response.
         """
         return self._request("DELETE", path, **kwargs)
+
+    async def aget(self, path: str, **kwargs) -> t.Any:
+        """Make an asynchronous GET request to the Harness API."""
+        return await self._arequest("GET", path, **kwargs)
+
+    async def apost(self, path: str, **kwargs) -> t.Any:
+        """Make an asynchronous POST request to the Harness API."""
+        return await self._arequest("POST", path, **kwargs)
+
+    async def aput(self, path: str, **kwargs) -> t.Any:
+        """Make an asynchronous PUT request to the Harness API."""
+        return await self._arequest("PUT", path, **kwargs)
+
+    async def adelete(self, path: str, **kwargs) -> t.Any:
+        """Make an asynchronous DELETE request to the Harness API."""
+        return await self._arequest("DELETE", path, **kwargs)
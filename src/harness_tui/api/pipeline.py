@@ -1,12 +1,58 @@
 """A simple wrapper around the Harness API for managing pipelines."""
 
+import asyncio
+import functools
+import math
+import threading
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
+import httpx
 import requests
 
+from pydantic import BaseModel, TypeAdapter
+
 import harness_tui.models as M
 from harness_tui.api.mixin import ClientMixin
-from harness_tui.utils import ttl_cache
+from harness_tui.api.store import ExecutionStore
+from harness_tui.utils import TTLCache, load_yaml, ttl_cache
+
+MB = 1024 * 1024
+
+PAGE_SIZE = 100
+"""The default page size used when iterating over every page of a list endpoint."""
+
+INCREMENTAL_PAGE_SIZE = 10
+"""The page size used to refresh an execution history which is already populated."""
+
+HISTORY_TTL = 15.0
+"""Seconds an execution history is considered fresh."""
+
+HISTORY_MAX_ITEMS = 500
+"""The maximum number of executions held per pipeline."""
+
+HISTORY_MAX_PIPELINES = 32
+"""The number of execution histories held, the least recently used are dropped."""
+
+T = t.TypeVar("T", bound=BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model: t.Type[T]) -> TypeAdapter[t.List[T]]:
+    """A validator for a list of models, which validates a whole page in one call."""
+    return TypeAdapter(t.List[model])  # type: ignore[valid-type]
+
+
+def _execution_model(compact: bool) -> t.Type[M.PipelineExecution]:
+    return M.CompactPipelineExecution if compact else M.PipelineExecution
+
+
+def _definition(pipeline: M.Pipeline) -> t.Dict[str, t.Any]:
+    return load_yaml(pipeline.resolved_template_pipeline_yaml or "") or load_yaml(
+        pipeline.pipeline_yaml
+    )
 
 
 def _strip_unset(kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
@@ -14,6 +60,161 @@ def _strip_unset(kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
     return {k: v for k, v in kwargs.items() if v is not None}
 
 
+@dataclass
+class Page(t.Generic[T]):
+    """A page of results from a paginated endpoint."""
+
+    content: t.List[T]
+    page: int
+    total_pages: int
+    total_items: int
+
+    @classmethod
+    def from_response(
+        cls, data: t.Dict[str, t.Any], model: t.Type[T], page: int
+    ) -> "Page[T]":
+        """Build a page from the `data` member of a paginated response."""
+        content = data.get("content") or []
+        return cls(
+            content=_list_adapter(model).validate_python(content),
+            page=page,
+            total_pages=data.get("totalPages", 1),
+            total_items=data.get("totalItems", data.get("totalElements", len(content))),
+        )
+
+
+class ExecutionHistory:
+    """A local record of a pipeline's executions which is refreshed incrementally.
+
+    Executions are keyed by `plan_execution_id` and ordered by `run_sequence`, newest
+    first. Raw API payloads are only validated when they describe an execution which is
+    not held yet, whose status changed, or which is still running and changed in any
+    other way, such as its stage progress.
+    """
+
+    def __init__(self, max_items: int = HISTORY_MAX_ITEMS) -> None:
+        self.max_items = max_items
+        self.exhausted = False
+        """Whether the oldest execution of the pipeline has been loaded."""
+        self.refreshed_at = 0.0
+        self._executions: t.Dict[str, M.PipelineExecutionSummary] = {}
+        self._running: t.Dict[str, t.Dict[str, t.Any]] = {}
+        """The payloads of the held executions which haven't finished."""
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._executions)
+
+    @property
+    def executions(self) -> t.List[M.PipelineExecutionSummary]:
+        """The held executions, newest first."""
+        with self._lock:
+            return sorted(
+                self._executions.values(), key=lambda e: e.run_sequence, reverse=True
+            )
+
+    @property
+    def max_run_sequence(self) -> int:
+        """The highest run sequence held, or -1 if the history is empty."""
+        with self._lock:
+            return max((e.run_sequence for e in self._executions.values()), default=-1)
+
+    @property
+    def min_run_sequence(self) -> int:
+        """The lowest run sequence held, or -1 if the history is empty."""
+        with self._lock:
+            return min((e.run_sequence for e in self._executions.values()), default=-1)
+
+    @property
+    def refresh_boundary(self) -> int:
+        """Executions at or below this run sequence don't need to be fetched again."""
+        with self._lock:
+            running = [
+                e.run_sequence for e in self._executions.values() if not e.is_terminal
+            ]
+            return min([self.max_run_sequence, *(seq - 1 for seq in running)])
+
+    def needs_refresh(self) -> bool:
+        """Whether the history is older than `HISTORY_TTL`."""
+        return time.monotonic() - self.refreshed_at > HISTORY_TTL
+
+    def refresh_page_size(self, size: int) -> int:
+        """Use small pages once the history is populated since only the head changes."""
+        return min(size, INCREMENTAL_PAGE_SIZE) if self._executions else size
+
+    def _merge(
+        self, content: t.List[t.Dict[str, t.Any]]
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Validate and store payloads which are new or changed."""
+        with self._lock:
+            changed = {}
+            for payload in content:
+                plan_execution_id = payload.get("planExecutionId", "")
+                held = self._executions.get(plan_execution_id)
+                if (
+                    held is None
+                    or held.status != payload.get("status")
+                    or self._running.get(plan_execution_id, payload) != payload
+                ):
+                    changed[plan_execution_id] = payload
+            merged = _list_adapter(M.PipelineExecutionSummary).validate_python(
+                list(changed.values())
+            )
+            for execution in merged:
+                self._executions[execution.plan_execution_id] = execution
+                if execution.is_terminal:
+                    self._running.pop(execution.plan_execution_id, None)
+                else:
+                    self._running[execution.plan_execution_id] = changed[
+                        execution.plan_execution_id
+                    ]
+            if len(self._executions) > self.max_items:
+                newest = sorted(
+                    self._executions.values(),
+                    key=lambda e: e.run_sequence,
+                    reverse=True,
+                )[: self.max_items]
+                self._executions = {e.plan_execution_id: e for e in newest}
+                self._running = {
+                    key: payload
+                    for key, payload in self._running.items()
+                    if key in self._executions
+                }
+                self.exhausted = False
+        return merged
+
+    def ingest(self, data: t.Dict[str, t.Any], page: int) -> bool:
+        """Merge a page fetched while refreshing from the newest execution.
+
+        Returns:
+            Whether the next page needs to be fetched as well.
+        """
+        boundary = self.refresh_boundary
+        content = data.get("content") or []
+        self._merge(content)
+        last_page = not content or page + 1 >= data.get("totalPages", 1)
+        if last_page:
+            self.exhausted = True
+        self.refreshed_at = time.monotonic()
+        if boundary < 0 or last_page:
+            return False
+        return min(p.get("runSequence", -1) for p in content) > boundary
+
+    def ingest_older(
+        self, data: t.Dict[str, t.Any], page: int
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Merge a page fetched while loading older executions.
+
+        Returns:
+            The executions older than any previously held.
+        """
+        floor = self.min_run_sequence
+        content = data.get("content") or []
+        if not content or page + 1 >= data.get("totalPages", 1):
+            self.exhausted = True
+        return [e for e in self._merge(content) if floor < 0 or e.run_sequence < floor]
+
+
 class PipelineClient(ClientMixin):
     BASE_URL = "https://app.harness.io/pipeline/api/"
 
@@ -25,6 +226,8 @@ class PipelineClient(ClientMixin):
         account: str,
         org: str,
         project: str,
+        async_session: t.Optional[httpx.AsyncClient] = None,
+        store: t.Optional[ExecutionStore] = None,
     ) -> None:
         """A wrapper around the Harness API for managing pipelines.
 
@@ -34,18 +237,38 @@ class PipelineClient(ClientMixin):
             org (str): The Harness organization identifier.
             project (str): The Harness project identifier.
             session (requests.Session): An authenticated requests session.
+            async_session (httpx.AsyncClient): An authenticated httpx client used by the
+                async methods.
+            store (ExecutionStore): A persistent store which serves details of finished
+                executions without a network call.
         """
         self.session = session
+        self.async_session = async_session
         self.account = account
         self.org = org
         self.project = project
+        self.store = store
+        self._histories = TTLCache(math.inf, maxsize=HISTORY_MAX_PIPELINES)
+        self._histories_lock = threading.Lock()
 
-    @ttl_cache(10)
-    def list(
+    @property
+    def cache_key(self) -> t.Tuple[str, str, str]:
+        """Identifies the client's scope in cache keys."""
+        return (self.account, self.org, self.project)
+
+    @property
+    def scope(self) -> t.Dict[str, str]:
+        """The account, org and project query parameters shared by most endpoints."""
+        return {
+            "accountIdentifier": self.account,
+            "orgIdentifier": self.org,
+            "projectIdentifier": self.project,
+        }
+
+    def _list_request(
         self,
-        filter_type: str = "PipelineSetup",
-        page: int = 0,
-        size: int = 25,
+        page: int,
+        size: int,
         sort: t.Optional[str] = None,
         search_term: t.Optional[str] = None,
         module: t.Optional[str] = None,
@@ -54,17 +277,13 @@ class PipelineClient(ClientMixin):
         repo_identifier: t.Optional[str] = None,
         get_default_from_other_repo: bool = False,
         get_distinct_from_branches: bool = False,
-    ) -> t.List[M.PipelineSummary]:
-        """List pipelines."""
-        _ = filter_type
-        pipelines = self._request(
-            "POST",
-            "pipelines/list",
-            params=_strip_unset(
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "method": "POST",
+            "path": "pipelines/list",
+            "params": _strip_unset(
                 {
-                    "accountIdentifier": self.account,
-                    "orgIdentifier": self.org,
-                    "projectIdentifier": self.project,
+                    **self.scope,
                     "page": page,
                     "size": size,
                     "sort": sort,
@@ -77,8 +296,317 @@ class PipelineClient(ClientMixin):
                     "getDistinctFromBranches": get_distinct_from_branches,
                 }
             ),
-        )["data"]["content"]
-        return list(map(M.PipelineSummary.model_validate, pipelines))
+        }
+
+    @ttl_cache(10, maxsize=64, stale=20, namespace="pipelines.list")
+    def list_page(
+        self,
+        page: int = 0,
+        size: int = 25,
+        sort: t.Optional[str] = None,
+        search_term: t.Optional[str] = None,
+        module: t.Optional[str] = None,
+        filter_identifier: t.Optional[str] = None,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        get_distinct_from_branches: bool = False,
+    ) -> Page[M.PipelineSummary]:
+        """Get a single page of pipelines along with the pagination metadata."""
+        return Page.from_response(
+            self._request(
+                **self._list_request(
+                    page,
+                    size,
+                    sort,
+                    search_term,
+                    module,
+                    filter_identifier,
+                    branch,
+                    repo_identifier,
+                    get_default_from_other_repo,
+                    get_distinct_from_branches,
+                )
+            )["data"],
+            M.PipelineSummary,
+            page,
+        )
+
+    @ttl_cache(10, maxsize=64, stale=20, namespace="pipelines.list")
+    async def alist_page(
+        self,
+        page: int = 0,
+        size: int = 25,
+        sort: t.Optional[str] = None,
+        search_term: t.Optional[str] = None,
+        module: t.Optional[str] = None,
+        filter_identifier: t.Optional[str] = None,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        get_distinct_from_branches: bool = False,
+    ) -> Page[M.PipelineSummary]:
+        """Get a single page of pipelines along with the pagination metadata asynchronously."""
+        return Page.from_response(
+            (
+                await self._arequest(
+                    **self._list_request(
+                        page,
+                        size,
+                        sort,
+                        search_term,
+                        module,
+                        filter_identifier,
+                        branch,
+                        repo_identifier,
+                        get_default_from_other_repo,
+                        get_distinct_from_branches,
+                    )
+                )
+            )["data"],
+            M.PipelineSummary,
+            page,
+        )
+
+    def list(
+        self,
+        filter_type: str = "PipelineSetup",
+        page: int = 0,
+        size: int = 25,
+        sort: t.Optional[str] = None,
+        search_term: t.Optional[str] = None,
+        module: t.Optional[str] = None,
+        filter_identifier: t.Optional[str] = None,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        get_distinct_from_branches: bool = False,
+    ) -> t.List[M.PipelineSummary]:
+        """List pipelines.
+
+        Only a single page is returned, use `iter_pages` or `iter_all` to fetch every
+        pipeline in the project.
+        """
+        _ = filter_type
+        return self.list_page(
+            page,
+            size,
+            sort,
+            search_term,
+            module,
+            filter_identifier,
+            branch,
+            repo_identifier,
+            get_default_from_other_repo,
+            get_distinct_from_branches,
+        ).content
+
+    async def alist(
+        self,
+        filter_type: str = "PipelineSetup",
+        page: int = 0,
+        size: int = 25,
+        sort: t.Optional[str] = None,
+        search_term: t.Optional[str] = None,
+        module: t.Optional[str] = None,
+        filter_identifier: t.Optional[str] = None,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        get_distinct_from_branches: bool = False,
+    ) -> t.List[M.PipelineSummary]:
+        """List pipelines asynchronously."""
+        _ = filter_type
+        return (
+            await self.alist_page(
+                page,
+                size,
+                sort,
+                search_term,
+                module,
+                filter_identifier,
+                branch,
+                repo_identifier,
+                get_default_from_other_repo,
+                get_distinct_from_branches,
+            )
+        ).content
+
+    def iter_pages(
+        self, size: int = PAGE_SIZE, concurrency: int = 4, **filters: t.Any
+    ) -> t.Iterator[Page[M.PipelineSummary]]:
+        """Iterate over every page of pipelines, in order.
+
+        The first page is fetched on its own to learn `totalPages`, the remaining pages
+        are then fetched concurrently by at most `concurrency` threads. A page with
+        fewer than `size` pipelines is the last one. Pages which weren't fetched yet are
+        cancelled if iteration stops early or a request fails.
+
+        Args:
+            size (int): The number of pipelines per page.
+            concurrency (int): The maximum number of pages fetched at once.
+            **filters: Additional filters accepted by `list_page`.
+        """
+        first = self.list_page(0, size, **filters)
+        yield first
+        if first.total_pages <= 1 or len(first.content) < size:
+            return
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = [
+                executor.submit(self.list_page, page, size, **filters)
+                for page in range(1, first.total_pages)
+            ]
+            for future in futures:
+                page = future.result()
+                yield page
+                if len(page.content) < size:
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aiter_pages(
+        self, size: int = PAGE_SIZE, concurrency: int = 4, **filters: t.Any
+    ) -> t.AsyncIterator[Page[M.PipelineSummary]]:
+        """Iterate over every page of pipelines asynchronously, in order.
+
+        See `iter_pages`. Outstanding requests are cancelled if iteration stops early.
+        """
+        first = await self.alist_page(0, size, **filters)
+        yield first
+        if first.total_pages <= 1 or len(first.content) < size:
+            return
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> Page[M.PipelineSummary]:
+            async with semaphore:
+                return await self.alist_page(page, size, **filters)
+
+        tasks = [
+            asyncio.ensure_future(fetch(page)) for page in range(1, first.total_pages)
+        ]
+        try:
+            for task in tasks:
+                page = await task
+                yield page
+                if len(page.content) < size:
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def iter_all(
+        self, size: int = PAGE_SIZE, concurrency: int = 4, **filters: t.Any
+    ) -> t.Iterator[M.PipelineSummary]:
+        """Iterate over every pipeline in the project."""
+        for page in self.iter_pages(size, concurrency, **filters):
+            yield from page.content
+
+    async def aiter_all(
+        self, size: int = PAGE_SIZE, concurrency: int = 4, **filters: t.Any
+    ) -> t.AsyncIterator[M.PipelineSummary]:
+        """Iterate over every pipeline in the project asynchronously."""
+        async for page in self.aiter_pages(size, concurrency, **filters):
+            for pipeline in page.content:
+                yield pipeline
+
+    def history(
+        self, pipeline_identifier: str, status: t.Optional[t.Sequence[str]] = None
+    ) -> ExecutionHistory:
+        """Get the execution history held for a pipeline and status filter.
+
+        Only the `HISTORY_MAX_PIPELINES` most recently used histories are held.
+        """
+        key = (pipeline_identifier, tuple(sorted(status or ())))
+        with self._histories_lock:
+            history = self._histories.get(key)
+            if history is None:
+                history = ExecutionHistory()
+                self._histories.set(key, history)
+        return history
+
+    def _execution_details_request(self, plan_execution_id: str) -> t.Dict[str, t.Any]:
+        return {
+            "method": "GET",
+            "path": f"pipelines/execution/v2/{plan_execution_id}",
+            "params": {**self.scope, "renderFullBottomGraph": True},
+        }
+
+    def _stored_execution_details(
+        self, plan_execution_id: str
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        if self.store is None:
+            return None
+        return self.store.get(plan_execution_id)
+
+    def _store_execution_details(
+        self, plan_execution_id: str, payload: t.Dict[str, t.Any]
+    ) -> None:
+        """Persist the payload if the execution is finished and can no longer change."""
+        status = payload.get("pipelineExecutionSummary", {}).get("status")
+        if self.store is not None and M.is_terminal_status(status):
+            self.store.put(plan_execution_id, payload)
+
+    @ttl_cache(
+        15, maxsize=64, max_bytes=64 * MB, namespace="pipeline.execution_details"
+    )
+    def execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the execution details of a specific pipeline execution.
+
+        Execution ids are unique within a project so details are keyed by the client's
+        scope and the execution id only, which lets every pipeline reference share them.
+        Finished executions are served from the client's store when available. Compact
+        details only validate the graph node fields read by the UI up front, see
+        `M.CompactPipelineExecution`.
+        """
+        payload = self._stored_execution_details(plan_execution_id)
+        if payload is None:
+            payload = self._request(
+                **self._execution_details_request(plan_execution_id)
+            )["data"]
+            self._store_execution_details(plan_execution_id, payload)
+        return _execution_model(compact).model_validate(payload)
+
+    @ttl_cache(
+        15, maxsize=64, max_bytes=64 * MB, namespace="pipeline.execution_details"
+    )
+    async def aexecution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the execution details of a specific pipeline execution asynchronously.
+
+        The store is read and written in a thread so that decompressing and writing
+        large payloads doesn't block the event loop.
+        """
+        payload = await asyncio.to_thread(
+            self._stored_execution_details, plan_execution_id
+        )
+        if payload is None:
+            payload = (
+                await self._arequest(
+                    **self._execution_details_request(plan_execution_id)
+                )
+            )["data"]
+            await asyncio.to_thread(
+                self._store_execution_details, plan_execution_id, payload
+            )
+        return _execution_model(compact).model_validate(payload)
+
+    def refresh_execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the latest execution details, bypassing the cache."""
+        PipelineClient.execution_details.cache_invalidate(self, plan_execution_id)
+        return self.execution_details(plan_execution_id, compact)
+
+    async def arefresh_execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the latest execution details asynchronously, bypassing the cache."""
+        PipelineClient.aexecution_details.cache_invalidate(self, plan_execution_id)
+        return await self.aexecution_details(plan_execution_id, compact)
 
     def reference(self, pipeline_identifier: str) -> "PipelineReference":
         """Get a reference to a specific pipeline."""
@@ -93,6 +621,9 @@ class PipelineReference:
     ) -> None:
         """A wrapper around a Harness pipeline.
 
+        Every request method has an async counterpart prefixed with `a` which uses the
+        client's async session.
+
         Args:
             client (PipelineClient): The client to use for API requests.
             pipeline_identifier (str): The identifier of the pipeline.
@@ -100,7 +631,40 @@ class PipelineReference:
         self.client = client
         self.pipeline_identifier = pipeline_identifier
 
-    @ttl_cache(60)
+    @property
+    def cache_key(self) -> t.Tuple[str, ...]:
+        """Identifies the pipeline in cache keys."""
+        return (*self.client.cache_key, self.pipeline_identifier)
+
+    def invalidate(self) -> None:
+        """Drop cached responses which an update to the pipeline makes outdated."""
+        PipelineReference.get.cache_invalidate(self)
+        PipelineReference.summary.cache_invalidate(self)
+        PipelineClient.list_page.cache_invalidate(self.client)
+
+    def _summary_request(
+        self,
+        branch: t.Optional[str],
+        repo_identifier: t.Optional[str],
+        get_default_from_other_repo: bool,
+        load_from_fallback_branch: bool,
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "method": "GET",
+            "path": f"pipelines/summary/{self.pipeline_identifier}",
+            "headers": {"Load-From-Cache": "false"},
+            "params": _strip_unset(
+                {
+                    **self.client.scope,
+                    "branch": branch,
+                    "repoIdentifier": repo_identifier,
+                    "getDefaultFromOtherRepo": get_default_from_other_repo,
+                    "loadFromFallbackBranch": load_from_fallback_branch,
+                }
+            ),
+        }
+
+    @ttl_cache(60, stale=120, namespace="pipeline.summary")
     def summary(
         self,
         branch: t.Optional[str] = None,
@@ -111,24 +675,60 @@ class PipelineReference:
         """Get a summary of the pipeline."""
         return M.PipelineSummary.model_validate(
             self.client._request(
-                "GET",
-                f"pipelines/summary/{self.pipeline_identifier}",
-                headers={"Load-From-Cache": "false"},
-                params=_strip_unset(
-                    {
-                        "accountIdentifier": self.client.account,
-                        "orgIdentifier": self.client.org,
-                        "projectIdentifier": self.client.project,
-                        "branch": branch,
-                        "repoIdentifier": repo_identifier,
-                        "getDefaultFromOtherRepo": get_default_from_other_repo,
-                        "loadFromFallbackBranch": load_from_fallback_branch,
-                    }
-                ),
+                **self._summary_request(
+                    branch,
+                    repo_identifier,
+                    get_default_from_other_repo,
+                    load_from_fallback_branch,
+                )
+            )["data"]
+        )
+
+    @ttl_cache(60, stale=120, namespace="pipeline.summary")
+    async def asummary(
+        self,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        load_from_fallback_branch: bool = False,
+    ) -> M.PipelineSummary:
+        """Get a summary of the pipeline asynchronously."""
+        return M.PipelineSummary.model_validate(
+            (
+                await self.client._arequest(
+                    **self._summary_request(
+                        branch,
+                        repo_identifier,
+                        get_default_from_other_repo,
+                        load_from_fallback_branch,
+                    )
+                )
             )["data"]
         )
 
-    @ttl_cache(60)
+    def _get_request(
+        self,
+        branch: t.Optional[str],
+        repo_identifier: t.Optional[str],
+        get_default_from_other_repo: bool,
+        load_from_fallback_branch: bool,
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "method": "GET",
+            "path": f"pipelines/{self.pipeline_identifier}",
+            "headers": {"Load-From-Cache": "false"},
+            "params": _strip_unset(
+                {
+                    **self.client.scope,
+                    "branch": branch,
+                    "repoIdentifier": repo_identifier,
+                    "getDefaultFromOtherRepo": get_default_from_other_repo,
+                    "loadFromFallbackBranch": load_from_fallback_branch,
+                }
+            ),
+        }
+
+    @ttl_cache(60, maxsize=64, namespace="pipeline.get")
     def get(
         self,
         branch: t.Optional[str] = None,
@@ -139,43 +739,105 @@ class PipelineReference:
         """Get the pipeline."""
         return M.Pipeline.model_validate(
             self.client._request(
-                "GET",
-                f"pipelines/{self.pipeline_identifier}",
-                headers={"Load-From-Cache": "false"},
-                params=_strip_unset(
-                    {
-                        "accountIdentifier": self.client.account,
-                        "orgIdentifier": self.client.org,
-                        "projectIdentifier": self.client.project,
-                        "branch": branch,
-                        "repoIdentifier": repo_identifier,
-                        "getDefaultFromOtherRepo": get_default_from_other_repo,
-                        "loadFromFallbackBranch": load_from_fallback_branch,
-                    }
-                ),
+                **self._get_request(
+                    branch,
+                    repo_identifier,
+                    get_default_from_other_repo,
+                    load_from_fallback_branch,
+                )
+            )["data"]
+        )
+
+    @ttl_cache(60, maxsize=64, namespace="pipeline.get")
+    async def aget(
+        self,
+        branch: t.Optional[str] = None,
+        repo_identifier: t.Optional[str] = None,
+        get_default_from_other_repo: bool = False,
+        load_from_fallback_branch: bool = False,
+    ) -> M.Pipeline:
+        """Get the pipeline asynchronously."""
+        return M.Pipeline.model_validate(
+            (
+                await self.client._arequest(
+                    **self._get_request(
+                        branch,
+                        repo_identifier,
+                        get_default_from_other_repo,
+                        load_from_fallback_branch,
+                    )
+                )
             )["data"]
         )
 
     def definition(self, **kwargs: t.Any) -> t.Dict[str, t.Any]:
-        info = self.get(**kwargs)
-        return info.resolved_template_pipeline_dict or info.pipeline_dict
+        """Get the parsed pipeline, with its templates resolved when available.
+
+        The result is a copy so it can be modified without affecting the cached
+        pipeline.
+        """
+        return _definition(self.get(**kwargs))
+
+    async def adefinition(self, **kwargs: t.Any) -> t.Dict[str, t.Any]:
+        """Get the parsed pipeline asynchronously."""
+        return _definition(await self.aget(**kwargs))
+
+    def _update_request(self, pipeline_yaml: str) -> t.Dict[str, t.Any]:
+        return {
+            "method": "PUT",
+            "path": f"pipelines/v2/{self.pipeline_identifier}",
+            "params": self.client.scope,
+            "headers": {"Content-Type": "application/yaml"},
+            "data": pipeline_yaml,
+        }
 
     def update(
         self,
         pipeline_yaml: str,
     ):
         """Update the pipeline."""
-        return self.client._request(
-            "PUT",
-            f"pipelines/v2/{self.pipeline_identifier}",
-            params={
-                "accountIdentifier": self.client.account,
-                "orgIdentifier": self.client.org,
-                "projectIdentifier": self.client.project,
-            },
-            headers={"Content-Type": "application/yaml"},
-            data=pipeline_yaml,
-        )
+        try:
+            return self.client._request(**self._update_request(pipeline_yaml))
+        finally:
+            self.invalidate()
+
+    async def aupdate(
+        self,
+        pipeline_yaml: str,
+    ):
+        """Update the pipeline asynchronously."""
+        try:
+            return await self.client._arequest(**self._update_request(pipeline_yaml))
+        finally:
+            self.invalidate()
+
+    def _execute_request(
+        self,
+        inputs_yaml: t.Optional[str],
+        module: t.Optional[str],
+        use_fqn_if_error_response: bool,
+        notify_only_user: bool,
+        notes: t.Optional[str],
+        branch_name: t.Optional[str],
+        connector_ref: t.Optional[str],
+        repo_name: t.Optional[str],
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "method": "POST",
+            "path": f"https://app.harness.io/v1/orgs/{self.client.org}/projects/{self.client.project}/pipelines/{self.pipeline_identifier}/execute",
+            "json": _strip_unset(
+                {
+                    "inputs_yaml": inputs_yaml,
+                    "module": module,
+                    "use_fqn_if_error_response": use_fqn_if_error_response,
+                    "notify_only_user": notify_only_user,
+                    "notes": notes,
+                    "branch_name": branch_name,
+                    "connector_ref": connector_ref,
+                    "repo_name": repo_name,
+                }
+            ),
+        }
 
     def execute(
         self,
@@ -190,55 +852,216 @@ class PipelineReference:
     ):
         """Execute the pipeline."""
         return self.client._request(
-            "POST",
-            f"https://app.harness.io/v1/orgs/{self.client.org}/projects/{self.client.project}/pipelines/{self.pipeline_identifier}/execute",
-            json=_strip_unset(
+            **self._execute_request(
+                inputs_yaml,
+                module,
+                use_fqn_if_error_response,
+                notify_only_user,
+                notes,
+                branch_name,
+                connector_ref,
+                repo_name,
+            )
+        )
+
+    async def aexecute(
+        self,
+        inputs_yaml: t.Optional[str] = None,
+        module: t.Optional[str] = None,
+        use_fqn_if_error_response: bool = False,
+        notify_only_user: bool = False,
+        notes: t.Optional[str] = None,
+        branch_name: t.Optional[str] = None,
+        connector_ref: t.Optional[str] = None,
+        repo_name: t.Optional[str] = None,
+    ):
+        """Execute the pipeline asynchronously."""
+        return await self.client._arequest(
+            **self._execute_request(
+                inputs_yaml,
+                module,
+                use_fqn_if_error_response,
+                notify_only_user,
+                notes,
+                branch_name,
+                connector_ref,
+                repo_name,
+            )
+        )
+
+    def history(self, status: t.Optional[t.Sequence[str]] = None) -> "ExecutionHistory":
+        """Get the locally held execution history for the pipeline and status filter."""
+        return self.client.history(self.pipeline_identifier, status)
+
+    def _executions_request(
+        self, page: int, size: int, status: t.Optional[t.Sequence[str]]
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "method": "POST",
+            "path": "pipelines/execution/summary",
+            "params": _strip_unset(
                 {
-                    "inputs_yaml": inputs_yaml,
-                    "module": module,
-                    "use_fqn_if_error_response": use_fqn_if_error_response,
-                    "notify_only_user": notify_only_user,
-                    "notes": notes,
-                    "branch_name": branch_name,
-                    "connector_ref": connector_ref,
-                    "repo_name": repo_name,
+                    **self.client.scope,
+                    "pipelineIdentifier": self.pipeline_identifier,
+                    "page": page,
+                    "size": size,
+                    "status": list(status) if status else None,
                 }
             ),
+        }
+
+    @ttl_cache(15, maxsize=128, max_bytes=32 * MB, namespace="pipeline.executions.data")
+    def executions_data(
+        self, page: int = 0, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.Dict[str, t.Any]:
+        """Get the unvalidated `data` of a page of the execution history.
+
+        Shared by `executions_page` and the execution history so that concurrent
+        requests for the same page are made once.
+        """
+        return self.client._request(**self._executions_request(page, size, status))[
+            "data"
+        ]
+
+    @ttl_cache(15, maxsize=128, max_bytes=32 * MB, namespace="pipeline.executions.data")
+    async def aexecutions_data(
+        self, page: int = 0, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.Dict[str, t.Any]:
+        """Get the unvalidated `data` of a page of the execution history asynchronously."""
+        return (
+            await self.client._arequest(**self._executions_request(page, size, status))
+        )["data"]
+
+    @ttl_cache(15, maxsize=128, max_bytes=32 * MB, namespace="pipeline.executions")
+    def executions_page(
+        self, page: int = 0, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> Page[M.PipelineExecutionSummary]:
+        """Get a page of the execution history, newest first.
+
+        Args:
+            page (int): The page to fetch.
+            size (int): The number of executions per page.
+            status (t.Sequence[str]): Only return executions with one of these statuses.
+        """
+        return Page.from_response(
+            self.executions_data(page, size, status),
+            M.PipelineExecutionSummary,
+            page,
         )
 
-    @ttl_cache(15)
-    def executions(self, size: int = 25):
+    @ttl_cache(15, maxsize=128, max_bytes=32 * MB, namespace="pipeline.executions")
+    async def aexecutions_page(
+        self, page: int = 0, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> Page[M.PipelineExecutionSummary]:
+        """Get a page of the execution history asynchronously, newest first."""
+        return Page.from_response(
+            await self.aexecutions_data(page, size, status),
+            M.PipelineExecutionSummary,
+            page,
+        )
+
+    def executions(
+        self, size: int = 25, page: int = 0, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[M.PipelineExecutionSummary]:
         """Get the execution history of the pipeline."""
-        # TODO(Alex): Implement pagination
-        return list(
-            map(
-                M.PipelineExecutionSummary.model_validate,
-                self.client._request(
-                    "POST",
-                    "pipelines/execution/summary",
-                    params={
-                        "accountIdentifier": self.client.account,
-                        "orgIdentifier": self.client.org,
-                        "projectIdentifier": self.client.project,
-                        "pipelineIdentifier": self.pipeline_identifier,
-                        "size": size,
-                    },
-                )["data"]["content"],
+        return self.executions_page(page, size, status).content
+
+    async def aexecutions(
+        self, size: int = 25, page: int = 0, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Get the execution history of the pipeline asynchronously."""
+        return (await self.aexecutions_page(page, size, status)).content
+
+    def refresh_executions(
+        self,
+        size: int = 25,
+        status: t.Optional[t.Sequence[str]] = None,
+        force: bool = False,
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Incrementally refresh the local execution history and return it.
+
+        The first call loads the newest `size` executions. Later calls only walk pages
+        until they reach executions which are already held and finished, so only new
+        executions and ones which were still running are fetched and validated. Refreshes
+        within `HISTORY_TTL` seconds of the previous one are served locally unless forced.
+        """
+        history = self.history(status)
+        if force:
+            PipelineReference.executions_data.cache_invalidate(self)
+        if force or history.needs_refresh():
+            size, page = history.refresh_page_size(size), 0
+            while history.ingest(self.executions_data(page, size, status), page):
+                page += 1
+        return history.executions
+
+    async def arefresh_executions(
+        self,
+        size: int = 25,
+        status: t.Optional[t.Sequence[str]] = None,
+        force: bool = False,
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Incrementally refresh the local execution history asynchronously."""
+        history = self.history(status)
+        if force:
+            PipelineReference.aexecutions_data.cache_invalidate(self)
+        if force or history.needs_refresh():
+            size, page = history.refresh_page_size(size), 0
+            while history.ingest(await self.aexecutions_data(page, size, status), page):
+                page += 1
+        return history.executions
+
+    def load_more_executions(
+        self, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Extend the local execution history with older executions.
+
+        Returns:
+            The executions which were added to the history.
+        """
+        history = self.history(status)
+        page, older = len(history) // size, []
+        while not history.exhausted and not older:
+            older = history.ingest_older(self.executions_data(page, size, status), page)
+            page += 1
+        return older
+
+    async def aload_more_executions(
+        self, size: int = 25, status: t.Optional[t.Sequence[str]] = None
+    ) -> t.List[M.PipelineExecutionSummary]:
+        """Extend the local execution history with older executions asynchronously."""
+        history = self.history(status)
+        page, older = len(history) // size, []
+        while not history.exhausted and not older:
+            older = history.ingest_older(
+                await self.aexecutions_data(page, size, status), page
             )
-        )
+            page += 1
+        return older
 
-    @ttl_cache(15)
-    def execution_details(self, plan_execution_id: str):
-        """Get the execution details of a specific pipeline execution."""
-        return M.PipelineExecution.model_validate(
-            self.client._request(
-                "GET",
-                f"pipelines/execution/v2/{plan_execution_id}",
-                params={
-                    "accountIdentifier": self.client.account,
-                    "orgIdentifier": self.client.org,
-                    "projectIdentifier": self.client.project,
-                    "renderFullBottomGraph": True,
-                },
-            )["data"]
-        )
+    def execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the execution details of a specific pipeline execution.
+
+        See `PipelineClient.execution_details`, which caches and coalesces the request
+        for every reference of the client.
+        """
+        return self.client.execution_details(plan_execution_id, compact)
+
+    async def aexecution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the execution details of a specific pipeline execution asynchronously."""
+        return await self.client.aexecution_details(plan_execution_id, compact)
+
+    def refresh_execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the latest execution details, bypassing the cache."""
+        return self.client.refresh_execution_details(plan_execution_id, compact)
+
+    async def arefresh_execution_details(
+        self, plan_execution_id: str, compact: bool = True
+    ) -> M.PipelineExecution:
+        """Get the latest execution details asynchronously, bypassing the cache."""
+        return await self.client.arefresh_execution_details(plan_execution_id, compact)
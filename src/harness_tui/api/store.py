@@ -0,0 +1,124 @@
+"""A persistent on-disk store for execution details which can no longer change."""
+
+import gzip
+import json
+import os
+import re
+import threading
+import typing as t
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from harness_tui.api import decoder
+
+MB = 1024 * 1024
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+@dataclass
+class StoreStats:
+    """Counters describing the effectiveness of the store."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class ExecutionStore:
+    """A size capped, least recently used store of raw execution detail payloads.
+
+    Payloads are written as gzipped JSON files named after the `plan_execution_id`. Reads
+    bump the file's modification time which is used as the recency for eviction.
+    """
+
+    def __init__(self, directory: t.Union[str, Path], max_bytes: int = 256 * MB):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = StoreStats()
+        self._index: t.Optional[t.Dict[Path, t.Tuple[float, int]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of the stored payloads."""
+        with self._lock:
+            return sum(size for _, size in self._load_index().values())
+
+    def _path(self, plan_execution_id: str) -> t.Optional[Path]:
+        if not _SAFE_ID.match(plan_execution_id):
+            return None
+        return self.directory / f"{plan_execution_id}.json.gz"
+
+    def _load_index(self) -> t.Dict[Path, t.Tuple[float, int]]:
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index = {}
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json.gz"):
+                    stat = entry.stat()
+                    self._index[Path(entry.path)] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def get(self, plan_execution_id: str) -> t.Optional[t.Dict[str, t.Any]]:
+        """Get a stored payload, or None if it is not stored."""
+        path = self._path(plan_execution_id)
+        with self._lock:
+            index = self._load_index()
+            if path is None or path not in index:
+                self.stats.misses += 1
+                return None
+            try:
+                with gzip.open(path, "rb") as f:
+                    payload = decoder.loads(f.read())
+                os.utime(path)
+            except (OSError, ValueError):
+                index.pop(path, None)
+                path.unlink(missing_ok=True)
+                self.stats.misses += 1
+                return None
+            index[path] = (path.stat().st_mtime, index[path][1])
+            self.stats.hits += 1
+            return payload
+
+    def put(self, plan_execution_id: str, payload: t.Dict[str, t.Any]) -> None:
+        """Store a payload, evicting the least recently used payloads over the cap."""
+        path = self._path(plan_execution_id)
+        if path is None:
+            return
+        data = gzip.compress(json.dumps(payload).encode("utf-8"), compresslevel=5)
+        with self._lock:
+            index = self._load_index()
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            index[path] = (path.stat().st_mtime, len(data))
+            self.stats.writes += 1
+            total = sum(size for _, size in index.values())
+            for victim, (_, size) in sorted(index.items(), key=lambda kv: kv[1][0]):
+                if total <= self.max_bytes:
+                    break
+                victim.unlink(missing_ok=True)
+                del index[victim]
+                total -= size
+                self.stats.evictions += 1
+
+    def discard(self, plan_execution_id: str) -> None:
+        """Remove a stored payload if present."""
+        path = self._path(plan_execution_id)
+        if path is None:
+            return
+        with self._lock:
+            self._load_index().pop(path, None)
+            path.unlink(missing_ok=True)
+
+    def info(self) -> t.Dict[str, t.Any]:
+        """Summarize the store state and counters."""
+        with self._lock:
+            index = self._load_index()
+            return {
+                **asdict(self.stats),
+                "entries": len(index),
+                "bytes": sum(size for _, size in index.values()),
+            }
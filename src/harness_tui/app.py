@@ -13,14 +13,19 @@ import itertools
 import os
 import time
 import typing as t
+from collections import Counter
+from contextlib import contextmanager
+from functools import cached_property, partial
 from pathlib import Path, PurePath
 
+import httpx
 from dotenv import load_dotenv
 from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container
 from textual.coordinate import Coordinate
 from textual.driver import Driver
+from textual.timer import Timer
 from textual.widgets import (
     DataTable,
     Footer,
@@ -31,19 +36,44 @@ from textual.widgets import (
     TabPane,
     TextArea,
 )
+from textual.worker import get_current_worker
 
 import harness_tui.models as M
 from harness_tui.api import HarnessClient
 from harness_tui.components import (
+    BufferedLogWriter,
     ExecutionsView,
+    LogTailer,
     LogView,
     PipelineCard,
     PipelineList,
     YamlEditor,
 )
+from harness_tui.log_index import LogIndex
+from harness_tui.log_store import LogStore
+from harness_tui.scraper import (
+    SCRAPE_INTERVAL,
+    LogScraper,
+    ScrapeManifest,
+    remove_legacy_logs,
+)
+from harness_tui.utils import cache_report, data_dir
+
+
+EXECUTIONS_PAGE_SIZE = 35
+"""The number of executions loaded at once into the executions view."""
 
+HIGHLIGHT_DELAY = float(os.getenv("HARNESS_TUI_HIGHLIGHT_DELAY", "0.25"))
+"""Seconds the pipeline highlight must settle before its details are fetched."""
 
-DATA_DIR = os.path.expanduser("~/.harness-tui")
+EXECUTIONS_REFRESH_INTERVAL = float(os.getenv("HARNESS_TUI_EXECUTIONS_REFRESH", "15"))
+"""Seconds between refreshes of the selected pipeline's executions."""
+
+WATCH_MIN_INTERVAL = float(os.getenv("HARNESS_TUI_WATCH_INTERVAL", "2"))
+"""Seconds between polls of a running execution right after it changed."""
+
+WATCH_MAX_INTERVAL = 30.0
+"""The longest wait between polls of a running execution which isn't changing."""
 
 
 class HarnessTui(App):
@@ -58,6 +88,7 @@ class HarnessTui(App):
         ("y", "focus_yaml", "Focus YAML"),
         ("l", "focus_logs", "Focus logs"),
         ("d", "dark_mode", "Toggle Dark Mode"),
+        ("i", "show_stats", "Stats"),
     ]
 
     def __init__(
@@ -69,7 +100,12 @@ class HarnessTui(App):
         super().__init__(driver_class, css_path, watch_css)
         self.api_client = HarnessClient.default()
         self.scraper_task = None
+        self.scraper: t.Optional[LogScraper] = None
         self.db = None
+        self.selected_pipeline: t.Optional[str] = None
+        self.request_stats: t.Counter[str] = Counter()
+        self._highlight_timer: t.Optional[Timer] = None
+        self.log_writer: t.Optional[BufferedLogWriter] = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -88,6 +124,19 @@ class HarnessTui(App):
         self.query_one("#pipeline-search").focus()
         self.update_pipeline_list_loop()
         self.build_vectordb()
+        self.set_interval(EXECUTIONS_REFRESH_INTERVAL, self.refresh_execution_history)
+
+    async def on_unmount(self) -> None:
+        # The scrape threads write to the stores closed below
+        if self.scraper is not None:
+            await asyncio.to_thread(self.scraper.cancel)
+        await self.api_client.aclose()
+        if "log_index" in self.__dict__:
+            self.log_index.close()
+        if "scrape_manifest" in self.__dict__:
+            self.scrape_manifest.close()
+        if "log_store" in self.__dict__:
+            self.log_store.close()
 
     # Custom actions (these define custom actions that can be triggered by keybindings or cmd menu)
 
@@ -110,13 +159,29 @@ class HarnessTui(App):
     def action_dark_mode(self) -> None:
         self.dark = not self.dark
 
+    def action_show_stats(self) -> None:
+        caches = cache_report()
+        coalesced = sum(c["coalesced"] for c in caches.values())
+        hits = sum(c["hits"] + c["stale_hits"] for c in caches.values())
+        misses = sum(c["misses"] for c in caches.values())
+        self.notify(
+            f"Highlights debounced: {self.request_stats['debounced']} "
+            f"({self.request_stats['avoided']} requests avoided)\n"
+            f"In-flight requests cancelled: {self.request_stats['cancelled']}\n"
+            f"Requests coalesced: {coalesced}\n"
+            f"Cache hits/misses: {hits}/{misses}"
+            + (f"\nLog scraper: {self.scraper.stats}" if self.scraper else ""),
+            title="Request stats",
+        )
+        self.log(request_stats=dict(self.request_stats), caches=caches)
+
     # Event handlers (these allow component level interaction to be handled at the app level as needed)
 
     async def on_pipeline_card_run_pipeline_request(
         self, event: PipelineCard.RunPipelineRequest
     ):
         ref = self.api_client.pipelines.reference(event.pipeline.identifier)
-        resp = ref.execute()
+        resp = await ref.aexecute()
         self.notify(f"Pipeline {event.pipeline.name} started with execution {resp}")
 
     async def on_log_view_fetch_logs_request(self, event: LogView.FetchLogsRequest):
@@ -134,10 +199,38 @@ class HarnessTui(App):
             return
 
         card = event.item.query_one(PipelineCard)
-        self.update_execution_history(card.pipeline.identifier)
-        self.update_yaml_buffer(card.pipeline.identifier)
-        self.query_one(LogView).execution = None
+        self.selected_pipeline = card.pipeline.identifier
         self.sub_title = str(card.pipeline.name)
+        # Fetches are deferred until the highlight settles so scrolling through the
+        # list doesn't fire requests for every pipeline passed on the way
+        if self._highlight_timer is not None:
+            self._highlight_timer.stop()
+            self.request_stats["debounced"] += 1
+            self.request_stats["avoided"] += 2
+        self._highlight_timer = self.set_timer(
+            HIGHLIGHT_DELAY, partial(self.fetch_pipeline_details, card.pipeline)
+        )
+
+    def fetch_pipeline_details(self, pipeline: M.PipelineSummary) -> None:
+        self._highlight_timer = None
+        self.query_one(ExecutionsView).reset()
+        self.workers.cancel_group(self, "execution_ui_more")
+        self.update_execution_history(pipeline.identifier)
+        self.update_yaml_buffer(pipeline.identifier)
+        self.workers.cancel_group(self, "log_tree_ui")
+        self.query_one(LogView).execution = None
+
+    def refresh_execution_history(self) -> None:
+        """Add executions started since the selected pipeline's were last fetched."""
+        # A pending highlight fetches the details of another pipeline anyway
+        if self.selected_pipeline and self._highlight_timer is None:
+            self.poll_execution_history(self.selected_pipeline)
+
+    def on_executions_view_load_more_request(
+        self, event: ExecutionsView.LoadMoreRequest
+    ) -> None:
+        if self.selected_pipeline:
+            self.load_more_executions(self.selected_pipeline)
 
     def on_data_table_cell_selected(self, event: DataTable.CellSelected) -> None:
         plan_id = str(event.data_table.get_cell_at(Coordinate(event.coordinate.row, 4)))
@@ -145,13 +238,13 @@ class HarnessTui(App):
         self.notify(f"Selected execution {plan_id}")
         self.query_one(TabbedContent).active = "logs-tab"
 
-    def on_yaml_editor_save_pipeline_request(
+    async def on_yaml_editor_save_pipeline_request(
         self, event: YamlEditor.SavePipelineRequest
     ):
         self.notify("Saving pipeline...")
         pipe = event.obj["pipeline"]["identifier"]
         try:
-            resp = self.api_client.pipelines.reference(pipe).update(event.yaml)
+            resp = await self.api_client.pipelines.reference(pipe).aupdate(event.yaml)
             self.query_one(YamlEditor).base_content = event.yaml
             self.notify(f"Pipeline saved. {resp}")
         except Exception as e:
@@ -160,9 +253,10 @@ class HarnessTui(App):
     async def on_log_view_vector_search_request(
         self, event: LogView.VectorSearchRequest
     ):
-        if self.db:
-            container = self.query_one(LogView).query_one("#vector-result", Log)
-            container.clear()
+        container = self.query_one(LogView).query_one("#vector-result", Log)
+        container.clear()
+        if self.db and event.query.rstrip().endswith("?"):
+            # Questions go to the LLM agent when it is set up
             container.set_loading(True)
             try:
                 container.write(await asyncio.to_thread(self.db.answer, event.query))
@@ -170,8 +264,16 @@ class HarnessTui(App):
                 self.notify(f"Could not generate a response: {e}", severity="error")
             finally:
                 container.set_loading(False)
-        else:
-            self.notify("VectorDB not setup. Logs not indexed.", severity="warning")
+            return
+        try:
+            matches = await asyncio.to_thread(self.log_index.search, event.query)
+        except ValueError as e:
+            self.notify(f"Invalid log search: {e}", severity="warning")
+            return
+        if not matches:
+            container.write("No cached logs match the search.")
+        for match in matches:
+            container.write_lines([str(match), f"  {match.snippet}"])
 
     # Work methods (these update reactive attributes to lazily update the UI)
 
@@ -180,12 +282,38 @@ class HarnessTui(App):
         """Fetch execution history for a specific pipeline."""
         execution_ui = self.query_one("#executions-view", ExecutionsView)
         await execution_ui.set_loading(True)
-        executions = await asyncio.to_thread(
-            self.api_client.pipelines.reference(pipeline_identifier).executions, size=35
-        )
+        ref = self.api_client.pipelines.reference(pipeline_identifier)
+        with self.track_cancellation():
+            executions = await ref.arefresh_executions(size=EXECUTIONS_PAGE_SIZE)
+        execution_ui.exhausted = ref.history().exhausted
         execution_ui.executions = executions
         await execution_ui.set_loading(False)
 
+    @work(group="execution_ui_refresh", exclusive=True)
+    async def poll_execution_history(self, pipeline_identifier: str):
+        """Refresh the displayed execution history, which prepends new executions."""
+        execution_ui = self.query_one("#executions-view", ExecutionsView)
+        ref = self.api_client.pipelines.reference(pipeline_identifier)
+        try:
+            executions = await ref.arefresh_executions(size=EXECUTIONS_PAGE_SIZE)
+        except httpx.HTTPError:
+            return
+        if pipeline_identifier == self.selected_pipeline:
+            execution_ui.exhausted = ref.history().exhausted
+            execution_ui.executions = executions
+
+    @work(group="execution_ui_more", exclusive=True)
+    async def load_more_executions(self, pipeline_identifier: str):
+        """Extend the displayed execution history with older executions."""
+        execution_ui = self.query_one("#executions-view", ExecutionsView)
+        ref = self.api_client.pipelines.reference(pipeline_identifier)
+        await ref.aload_more_executions(size=EXECUTIONS_PAGE_SIZE)
+        # The user may have moved on to another pipeline in the meantime
+        if pipeline_identifier != self.selected_pipeline:
+            return
+        execution_ui.exhausted = ref.history().exhausted
+        execution_ui.executions = ref.history().executions
+
     @work(group="setup_vectordb", exclusive=True, thread=True)
     async def build_vectordb(self) -> None:
         """Setup the VectorDB instance."""
@@ -194,7 +322,7 @@ class HarnessTui(App):
 
         try:
             self.notify("Building VectorDB index...")
-            self.db = LogAgent(self.data_dir)
+            self.db = LogAgent(self.log_store)
             self.db.load()
             self.notify("VectorDB index built.")
         except Exception as e:
@@ -205,11 +333,10 @@ class HarnessTui(App):
         """Fetch pipeline YAML and update the buffer."""
         yaml_ui = self.query_one("#yaml-view", YamlEditor)
         await yaml_ui.set_loading(True)
-        content = (
-            await asyncio.to_thread(
-                self.api_client.pipelines.reference(pipeline_identifier).get
-            )
-        ).pipeline_yaml
+        with self.track_cancellation():
+            content = (
+                await self.api_client.pipelines.reference(pipeline_identifier).aget()
+            ).pipeline_yaml
         yaml_ui.base_content = content
         editor = yaml_ui.query_one(TextArea)
         editor.scroll_home(animate=False)
@@ -217,119 +344,169 @@ class HarnessTui(App):
 
     @work(group="pipeline_ui", exclusive=True)
     async def update_pipeline_list_loop(self) -> None:
-        """Fetch pipeline data every 15 seconds."""
+        """Fetch pipeline data every 15 seconds.
+
+        Every page is fetched concurrently. On the first load the list is rendered as soon
+        as the first page arrives and filled in as the remaining pages come in.
+        """
         pipeline_ui = self.query_one("#pipeline-view", PipelineList)
         while True:
-            pipeline_list = await asyncio.to_thread(self.api_client.pipelines.list)
+            pipeline_list: t.List[M.PipelineSummary] = []
+            initial_load = not pipeline_ui.pipeline_list
+            async for page in self.api_client.pipelines.aiter_pages():
+                pipeline_list.extend(page.content)
+                if initial_load:
+                    pipeline_ui.pipeline_list = list(pipeline_list)
             pipeline_ui.pipeline_list = pipeline_list
             await asyncio.sleep(15.0)
-            if self.scraper_task is None:
+            if self.scraper_task is None or self.scraper_task.is_finished:
                 self.scraper_task = self.scrape_logs_background_job(pipeline_list)
 
     @work(group="log_tree_ui", exclusive=True)
     async def update_log_tree(self, plan_execution_identifier: str):
         log_ui = self.query_one("#logs-view", LogView)
         await log_ui.set_loading(True)
-        details = await asyncio.to_thread(
-            self.api_client.pipelines.reference("<none>").execution_details,
-            plan_execution_identifier,
-        )
+        pipelines = self.api_client.pipelines
+        details = await pipelines.aexecution_details(plan_execution_identifier)
         log_ui.execution = details
         await log_ui.set_loading(False)
+        # Running executions are watched until they finish, polling less often the
+        # longer nothing changes. Selecting another execution cancels the watch
+        interval, watched = WATCH_MIN_INTERVAL, False
+        while not details.pipeline_execution_summary.is_terminal:
+            watched = True
+            await asyncio.sleep(interval)
+            try:
+                latest = await pipelines.arefresh_execution_details(
+                    plan_execution_identifier
+                )
+            except httpx.HTTPError:
+                interval = min(interval * 2, WATCH_MAX_INTERVAL)
+                continue
+            if latest.node_statuses == details.node_statuses and (
+                latest.pipeline_execution_summary.status
+                == details.pipeline_execution_summary.status
+            ):
+                interval = min(interval * 2, WATCH_MAX_INTERVAL)
+            else:
+                interval = WATCH_MIN_INTERVAL
+                log_ui.execution = latest
+            details = latest
+        if watched:
+            self.notify(
+                f"Execution {plan_execution_identifier} finished: "
+                f"{details.pipeline_execution_summary.status}"
+            )
 
     @work(group="log_view_ui", exclusive=True, thread=True)
     def update_log_view(self, log_key: str):
-        log_handle = self.query_one("#logs-view", LogView).query_one("#log-tailer", Log)
-        log_handle.clear()
+        log_handle = self.query_one("#logs-view", LogView).query_one(
+            "#log-tailer", LogTailer
+        )
+        worker = get_current_worker()
+        # The superseded worker may still be feeding the log from its thread
+        if self.log_writer is not None:
+            self.log_writer.cancel()
+        self.call_from_thread(log_handle.clear)
         # Its cheaper to just try both sources than deal with race conditions otherwise
         log_source_chain = itertools.chain(
             self.api_client.logs.stream(log_key),
             self.api_client.logs.blob(log_key),
         )
 
-        def _write(payload: dict) -> None:
+        seen = next(log_source_chain, None)
+        if not seen:
+            self.call_from_thread(
+                log_handle.write, "\nNo logs to display for the given key."
+            )
+            return
+        with BufferedLogWriter(log_handle) as writer:
+            self.log_writer = writer
             # {'level': 'info', 'pos': 0, 'out': '1.6.14: Pulling from plugins/cache\n', 'time': '2024-05-28T20:00:37.637136016Z', 'args': None}
-            line = payload["out"]
-            log_handle.write_line(line.rstrip())
-
-        seen = next(log_source_chain)
-        if seen:
-            _write(seen)
-            for payload in log_source_chain:
-                _write(payload)
-        else:
-            log_handle.write("\nNo logs to display for the given key.")
+            for payload in itertools.chain([seen], log_source_chain):
+                if worker.is_cancelled:
+                    writer.cancel()
+                    break
+                writer.write(payload["out"].rstrip(), payload)
+        self.log(log_writer=writer.stats)
 
     @work(group="log_scraper", exclusive=True, thread=True)
     def scrape_logs_background_job(self, pipeline_list: t.List[M.PipelineSummary]):
         """Scrape logs for all pipelines in the pipeline list.
 
-        This function is run in a separate process to avoid blocking the main event loop and is a best-effort attempt to
-        scrape logs for all pipelines in the pipeline list. The cache is used to drive semantic search capabilities.
+        This function is run in a separate thread to avoid blocking the main event loop and is a best-effort attempt to
+        scrape logs for all pipelines in the pipeline list. Executions, execution details and logs are fetched by
+        separate bounded thread pools, see `LogScraper`. The cache is indexed for full-text search as it is written.
+
+        It is started again by the pipeline list loop and runs at most every `SCRAPE_INTERVAL` seconds. Executions and
+        logs which had finished when they were scraped are recorded in a manifest and skipped by later runs.
         """
-        start = time.time()
         base_dir = self.data_dir
         stamp = base_dir.joinpath("last_update")
         mtime = stamp.stat().st_mtime if stamp.exists() else 0
-        if mtime + (60 * 60) > time.time():
-            self.notify("Skipping log scraper background job. Cache is valid.")
+        if mtime + SCRAPE_INTERVAL > time.time():
             return
-        else:
-            self.notify("Running log scraper background job.")
-        for pipeline in pipeline_list:
-            ref = self.api_client.pipelines.reference(pipeline.identifier)
-            try:
-                executions = ref.executions(size=1)
-            except Exception:
-                continue
-            for execution in executions:
-                try:
-                    details = ref.execution_details(execution.plan_execution_id)
-                except Exception:
-                    continue
-                for node in details.execution_graph.node_map.values():
-                    if not node.log_base_key:
-                        continue
-                    if node.identifier in (
-                        "liteEngineTask",
-                        "save-cache-harness",
-                        "restore-cache-harness",
-                    ):
-                        continue
-                    try:
-                        lines = list(self.api_client.logs.blob(node.log_base_key))
-                    except Exception:
-                        continue
-                    if not lines:
-                        continue
-                    if len(lines) > 500:
-                        lines = [*lines[:249], {"out": "..."}, *lines[-250:]]
-                    content = "\n".join(line["out"].rstrip() for line in lines)
-                    parts = node.log_base_key.split("/")
-                    file_key = "__".join(map(lambda v: v.split(":", 1)[-1], parts[3:]))
-                    log_path = base_dir / f"{file_key}.log"
-                    log_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(log_path, "w") as f:
-                        f.write(content)
-        self.notify(
-            f"Finished log scraper background job in {(time.time() - start):.2f}s."
+        self.log("Running log scraper background job.")
+        removed = remove_legacy_logs(base_dir)
+        if removed:
+            self.log(legacy_logs_removed=removed)
+            self.notify(
+                f"Removed {len(removed)} logs cached by an earlier version from"
+                f" {base_dir}, they are downloaded again into the log store."
+            )
+        self.scraper = LogScraper(
+            self.api_client,
+            self.log_store,
+            self.log_index,
+            self.scrape_manifest,
+            on_progress=lambda stats: self.log(scraper=str(stats)),
         )
+        stats = self.scraper.run(pipeline_list)
+        if self.scraper.cancelled:
+            return
+        self.log(scraper=str(stats), log_store=str(self.log_store.stats))
+        if stats.logs or stats.errors:
+            self.notify(
+                f"Finished log scraper background job in {stats.elapsed:.2f}s.\n{stats}"
+                + (f"\nLast error: {stats.last_error}" if stats.last_error else ""),
+                severity="warning" if stats.errors else "information",
+            )
         stamp.touch()
         stamp.write_text(str(time.time()))
         self.build_vectordb()
 
     # Auxiliary methods (these are helper methods that are called by other methods)
 
+    @contextmanager
+    def track_cancellation(self) -> t.Iterator[None]:
+        """Count requests cancelled because a newer exclusive worker superseded them."""
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.request_stats["cancelled"] += 1
+            self.request_stats["avoided"] += 1
+            raise
+
     @property
     def data_dir(self) -> Path:
-        d = (
-            Path(DATA_DIR)
-            / self.api_client.account
-            / self.api_client.org
-            / self.api_client.project
+        return data_dir(
+            self.api_client.account, self.api_client.org, self.api_client.project
         )
-        d.mkdir(parents=True, exist_ok=True)
-        return d
+
+    @cached_property
+    def log_index(self) -> LogIndex:
+        """The full-text index of the scraped logs."""
+        return LogIndex(self.data_dir / "logs.db")
+
+    @cached_property
+    def log_store(self) -> LogStore:
+        """The compressed and deduplicated cache of scraped logs."""
+        return LogStore(self.data_dir / "log_store")
+
+    @cached_property
+    def scrape_manifest(self) -> ScrapeManifest:
+        """The record of the executions and logs scraped by earlier runs."""
+        return ScrapeManifest(self.data_dir / "scrape_manifest.db")
 
 
 if __name__ == "__main__":
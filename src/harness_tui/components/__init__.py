@@ -1,11 +1,13 @@
 from harness_tui.components.execution_history import ExecutionGraph, ExecutionsView
-from harness_tui.components.log_view import LogView
+from harness_tui.components.log_view import BufferedLogWriter, LogTailer, LogView
 from harness_tui.components.pipeline_list import PipelineCard, PipelineList
 from harness_tui.components.yaml_editor import YamlEditor
 
 __all__ = [
+    "BufferedLogWriter",
     "ExecutionsView",
     "ExecutionGraph",
+    "LogTailer",
     "LogView",
     "PipelineCard",
     "PipelineList",
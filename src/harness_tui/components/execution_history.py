@@ -8,6 +8,7 @@ import typing as t
 
 from rich.text import Text
 from textual.app import ComposeResult
+from textual.message import Message
 from textual.reactive import reactive
 from textual.widgets import DataTable, Label, Sparkline, Static
 
@@ -22,6 +23,9 @@ STATUS_STYLE_MAP = {
 }
 """Map of execution statuses to Rich styles."""
 
+LOAD_MORE_THRESHOLD = 5
+"""Request older executions once the cursor is this many rows from the bottom."""
+
 
 class ExecutionGraph(Static):
     """Graph that displays the execution history of a specific pipeline."""
@@ -44,11 +48,20 @@ class ExecutionGraph(Static):
 
 
 class ExecutionsView(Static):
-    """Table that displays the execution history of a specific pipeline."""
+    """Table that displays the execution history of a specific pipeline.
 
-    executions: reactive[t.List[M.PipelineExecutionSummary]] = reactive(
-        list, recompose=True
-    )
+    Rows are keyed by `plan_execution_id`. Assigning `executions` only adds the rows of
+    new executions, in order, and updates the status cell of executions whose status
+    changed so the cursor stays on the same execution across refreshes.
+    """
+
+    executions: reactive[t.List[M.PipelineExecutionSummary]] = reactive(list)
+
+    exhausted: reactive[bool] = reactive(False)
+    """Whether the oldest execution is already displayed."""
+
+    class LoadMoreRequest(Message):
+        """A message that indicates older executions should be loaded."""
 
     def __init__(
         self,
@@ -56,46 +69,110 @@ class ExecutionsView(Static):
         **kwargs: t.Any,
     ) -> None:
         super().__init__(*args, **kwargs)
-        self.execution_urls = {}
+        self.account = os.getenv("HARNESS_ACCOUNT")
+        self._rows: t.Dict[str, M.PipelineExecutionSummary] = {}
+        self._loading_more = False
 
     def compose(self) -> ComposeResult:
         data_table = DataTable(header_height=2, cell_padding=2, cursor_type="cell")
-        data_table.add_columns(
-            "Start Time", "Started By", "Trigger Type", "Status", "Link"
-        )
-        for execution in self.executions:
-            exec_time = execution.start_ts.strftime("%m/%d/%Y, %H:%M:%S")
-            data_table.add_row(
-                Text(exec_time, style="bold", justify="left"),
-                Text(
-                    execution.execution_trigger_info.triggered_by.identifier,
-                    style="bold",
-                    justify="left",
-                ),
-                Text(
-                    execution.execution_trigger_info.trigger_type,
-                    style="bold",
-                    justify="left",
-                ),
-                Text(
-                    execution.status,
-                    style=STATUS_STYLE_MAP.get(execution.status, ""),
-                ),
-                Text(execution.plan_execution_id, style="blue"),
-            )
-            account = os.getenv("HARNESS_ACCOUNT")
-            if account:
-                self.execution_urls[execution.plan_execution_id] = (
-                    f"https://app.harness.io/ng/account/{account}/module/ci/orgs/"
-                    f"{execution.org_identifier}/projects/{execution.project_identifier}/pipelines/"
-                    f"{execution.pipeline_identifier}/executions/{execution.plan_execution_id}/pipeline"
-                )
+        data_table.add_column("Start Time", key="start")
+        data_table.add_column("Started By", key="user")
+        data_table.add_column("Trigger Type", key="trigger")
+        data_table.add_column("Status", key="status")
+        data_table.add_column("Link", key="link")
         yield data_table
 
+    def watch_executions(self, executions: t.List[M.PipelineExecutionSummary]) -> None:
+        self._loading_more = False
+        data_table = self.query_one(DataTable)
+        anchor = None
+        if data_table.row_count:
+            anchor = data_table.coordinate_to_cell_key(
+                data_table.cursor_coordinate
+            ).row_key
+        wanted = {execution.plan_execution_id for execution in executions}
+        for plan_execution_id in self._rows.keys() - wanted:
+            data_table.remove_row(plan_execution_id)
+            del self._rows[plan_execution_id]
+
+        order = [row.key.value for row in data_table.ordered_rows]
+        for execution in executions:
+            key = execution.plan_execution_id
+            displayed = self._rows.get(key)
+            if displayed is None:
+                data_table.add_row(*_cells(execution), key=key)
+                order.append(key)
+            elif displayed.status != execution.status:
+                data_table.update_cell(key, "status", _status_cell(execution))
+            self._rows[key] = execution
+
+        position = {
+            execution.plan_execution_id: i for i, execution in enumerate(executions)
+        }
+        if order != list(position):
+            # New executions were appended so the table is sorted to move them to top
+            data_table.sort("link", key=lambda link: position[link.plain])
+        if anchor is not None and anchor.value in self._rows:
+            data_table.move_cursor(
+                row=data_table.get_row_index(anchor),
+                column=data_table.cursor_coordinate.column,
+                animate=False,
+            )
+
     def on_mount(self) -> None:
         self.set_loading(True)
 
+    def reset(self) -> None:
+        """Clear the table, used when switching to another pipeline."""
+        self.query_one(DataTable).clear()
+        self._rows.clear()
+        self.set_reactive(ExecutionsView.executions, [])
+        self.exhausted = False
+
+    def execution_url(self, execution: M.PipelineExecutionSummary) -> t.Optional[str]:
+        """The link to an execution in the Harness UI."""
+        if not self.account:
+            return None
+        return (
+            f"https://app.harness.io/ng/account/{self.account}/module/ci/orgs/"
+            f"{execution.org_identifier}/projects/{execution.project_identifier}/pipelines/"
+            f"{execution.pipeline_identifier}/executions/{execution.plan_execution_id}/pipeline"
+        )
+
+    def on_data_table_cell_highlighted(self, event: DataTable.CellHighlighted):
+        near_bottom = event.coordinate.row >= len(self.executions) - LOAD_MORE_THRESHOLD
+        if near_bottom and self.executions and not self.exhausted:
+            if not self._loading_more:
+                self._loading_more = True
+                self.post_message(self.LoadMoreRequest())
+
     def on_data_table_cell_selected(self, event: DataTable.CellSelected):
         if event.coordinate.column == 4:
-            link = self.execution_urls[str(event.value)]
-            subprocess.run(["open", link])
+            link = self.execution_url(self._rows[str(event.value)])
+            if link:
+                subprocess.run(["open", link])
+
+
+def _status_cell(execution: M.PipelineExecutionSummary) -> Text:
+    """The status cell of an execution row."""
+    return Text(execution.status, style=STATUS_STYLE_MAP.get(execution.status, ""))
+
+
+def _cells(execution: M.PipelineExecutionSummary) -> t.Tuple[Text, ...]:
+    """The cells of an execution row."""
+    exec_time = execution.start_ts.strftime("%m/%d/%Y, %H:%M:%S")
+    return (
+        Text(exec_time, style="bold", justify="left"),
+        Text(
+            execution.execution_trigger_info.triggered_by.identifier,
+            style="bold",
+            justify="left",
+        ),
+        Text(
+            execution.execution_trigger_info.trigger_type,
+            style="bold",
+            justify="left",
+        ),
+        _status_cell(execution),
+        Text(execution.plan_execution_id, style="blue"),
+    )
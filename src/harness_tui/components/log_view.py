@@ -2,17 +2,34 @@
 
 from __future__ import annotations
 
+import bisect
+import os
+import threading
+import time
 import typing as t
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
 
+from rich.segment import Segment
+from textual import work
 from textual.app import ComposeResult
+from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
 from textual.message import Message
 from textual.reactive import reactive
+from textual.strip import Strip
 from textual.widgets import Input, Label, Log, Static, Tree
+from textual.worker import get_current_worker
 
 import harness_tui.models as M
+from harness_tui.log_search import LogColumns, LogQuery
+from harness_tui.scrollback import Scrollback
+from harness_tui.utils import DATA_DIR
 
 if t.TYPE_CHECKING:
+    from textual.timer import Timer
     from textual.widgets.tree import TreeNode
 
 
@@ -25,13 +42,130 @@ EMOJI_STATUS_MAP = {
     "Not Started": "⚪ ",
 }
 
+SCROLLBACK_LINES = int(os.getenv("HARNESS_TUI_SCROLLBACK_LINES", "100000"))
+"""The number of recent step log lines kept in memory, older lines spill to disk."""
+
+
+class LogTailer(Log):
+    """A `Log` whose lines are stored in a `Scrollback`.
+
+    Memory use is bounded by `memory_lines` whatever the size of the log, while
+    scrolling back still has random access to every line. Like `Log`, lines are only
+    highlighted when they are rendered.
+
+    Lines written with `write_records` keep the level, time and position of their log
+    line in `columns`, which searches filter on.
+    """
+
+    COMPONENT_CLASSES: t.ClassVar[t.Set[str]] = {"log-tailer--match"}
+
+    DEFAULT_CSS = """
+    LogTailer > .log-tailer--match {
+        background: $accent 50%;
+    }
+    """
+
+    match_line: reactive[t.Optional[int]] = reactive(None)
+    """The line of the current search match, which is highlighted."""
+
+    def __init__(
+        self,
+        *args: t.Any,
+        memory_lines: int = SCROLLBACK_LINES,
+        spill_directory: t.Optional[t.Union[str, os.PathLike]] = None,
+        **kwargs: t.Any,
+    ) -> None:
+        """Create a log with a bounded scrollback.
+
+        Args:
+            memory_lines (int): The number of recent lines to keep in memory.
+            spill_directory (Path): Where older lines are spilled, a `scrollback`
+                directory in `DATA_DIR` by default.
+        """
+        super().__init__(*args, **kwargs)
+        self._lines = Scrollback(  # type: ignore[assignment]
+            spill_directory or os.path.join(DATA_DIR, "scrollback"),
+            memory_lines=memory_lines,
+        )
+        self.columns = LogColumns()
+        self.generation = 0
+        """Incremented whenever the log is cleared, which invalidates line numbers."""
+        self.writer: t.Optional[BufferedLogWriter] = None
+        """The writer feeding the log, if any."""
+
+    def on_unmount(self) -> None:
+        # The writer's timer goes with the log, stop its producer from waiting on it
+        if self.writer is not None:
+            self.writer.cancel()
+        self.app.workers.cancel_group(self.app, "log_view_ui")
+        t.cast(Scrollback, self._lines).close()
+
+    def write_records(
+        self, records: t.Iterable[t.Tuple[str, t.Tuple[int, float, int]]]
+    ) -> LogTailer:
+        """Write lines along with the encoded values of their log line.
+
+        Args:
+            records: Pairs of text and the values from `LogColumns.encode`. Text
+                spanning several lines stores the values for each of them.
+        """
+        columns = self.columns
+        # Lines written with `write` have no values
+        columns.pad(len(self._lines))
+        lines = []
+        for text, values in records:
+            for line in text.splitlines():
+                lines.append(line)
+                columns.append(*values)
+        self.write_lines(lines)
+        return self
+
+    def clear(self) -> LogTailer:
+        self.generation += 1
+        self.match_line = None
+        self.columns.clear()
+        return super().clear()
+
+    def jump_to(self, line: int) -> None:
+        """Highlight a line and scroll it into the middle of the view."""
+        self.match_line = line
+        self.scroll_to(
+            y=max(line - self.scrollable_content_region.height // 2, 0), animate=False
+        )
+
+    def watch_match_line(self) -> None:
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        strip = super().render_line(y)
+        if self.match_line is not None and self.scroll_offset.y + y == self.match_line:
+            style = self.get_component_rich_style("log-tailer--match")
+            strip = Strip(
+                Segment.apply_style(strip, post_style=style), strip.cell_length
+            )
+        return strip
+
 
 class LogView(Static):
-    """Component that displays the log view of a specific pipeline."""
+    """Component that displays the log view of a specific pipeline.
+
+    Assigning a newer version of the displayed execution patches the tree in place.
+    Nodes are matched by uuid so only changed labels are updated, new nodes are added
+    and the expansion and cursor of the tree are kept.
+    """
+
+    BINDINGS = [
+        Binding("ctrl+n", "next_match", "Next match", show=False),
+        Binding("ctrl+p", "previous_match", "Previous match", show=False),
+    ]
+
+    SEARCH_DELAY: t.ClassVar[float] = 0.2
+    """Seconds to wait after the last keystroke before searching the log."""
+
+    SEARCH_CHUNK: t.ClassVar[int] = 20_000
+    """Lines scanned between checks for cancellation while searching the log."""
 
-    execution: reactive[t.Optional[M.PipelineExecution]] = reactive(
-        None, recompose=True
-    )
+    execution: reactive[t.Optional[M.PipelineExecution]] = reactive(None)
 
     class FetchLogsRequest(Message):
         def __init__(self, node: M.ExecutionGraphNode) -> None:
@@ -45,6 +179,10 @@ class LogView(Static):
 
     def __init__(self, *args: t.Any, **kwargs: t.Any):
         super().__init__(*args, **kwargs)
+        self._tree_nodes: t.Dict[str, TreeNode] = {}
+        self._groups: t.Dict[str, TreeNode] = {}
+        self._matches = array("q")
+        self._search_timer: t.Optional[Timer] = None
 
     def compose(self) -> ComposeResult:
         if not self.execution:
@@ -52,23 +190,10 @@ class LogView(Static):
             return
 
         tree = Tree("pipeline")
-        nodes = {}
+        self._tree_nodes.clear()
+        self._groups.clear()
         for node in self.execution.execution_graph.node_map.values():
-            if node.base_fqn == "pipeline":
-                tree.root.data = node
-                continue
-
-            parts = node.base_fqn.split(".")[1:]
-            current = tree.root
-
-            for part in parts:
-                if part not in nodes:
-                    if current is tree.root:
-                        nodes[part] = current.add(part)
-                    else:
-                        nodes[part] = current.add(part)
-                current = nodes[part]
-            current.add_leaf(EMOJI_STATUS_MAP.get(node.status, "") + node.name, node)
+            self._add_node(tree, node)
 
         def _depth(parent: "TreeNode", score: int = 0):
             yield parent, score
@@ -82,7 +207,10 @@ class LogView(Static):
         with Horizontal(id="log-view-top"):
             yield tree
             with Vertical(id="vector-result-container"):
-                yield Input(placeholder="Vector search log cache")
+                yield Input(
+                    placeholder="Search log cache, e.g. status:failed timeout",
+                    id="vector-search",
+                )
                 yield Log(highlight=True, id="vector-result")
 
         def _open_logs():
@@ -92,19 +220,344 @@ class LogView(Static):
 
         self.call_after_refresh(_open_logs)
 
-        log = Log(highlight=True, id="log-tailer")
+        log = LogTailer(highlight=True, id="log-tailer")
         log.border_title = (
             t.cast(M.ExecutionGraphNode, node_to_expand.data).name + ".log"
         )
         log.write("Select a node in the tree to view logs")
+        with Horizontal(id="log-search-bar"):
+            yield Input(
+                placeholder="Find in log, e.g. level:warn after:20:05 timeout",
+                id="log-search",
+            )
+            yield Label(id="log-search-status")
         yield log
 
+    async def watch_execution(
+        self,
+        old: t.Optional[M.PipelineExecution],
+        new: t.Optional[M.PipelineExecution],
+    ) -> None:
+        if old is None and new is None:
+            return
+        elif (
+            old is not None
+            and new is not None
+            and self._tree_nodes
+            and old.pipeline_execution_summary.plan_execution_id
+            == new.pipeline_execution_summary.plan_execution_id
+        ):
+            self._patch(new)
+        else:
+            await self.recompose()
+
+    def _add_node(
+        self, tree: Tree, node: M.ExecutionGraphNode, expand: bool = False
+    ) -> None:
+        """Add a node of the execution graph to the tree."""
+        if node.base_fqn == "pipeline":
+            tree.root.data = node
+            self._tree_nodes[node.uuid] = tree.root
+            return
+
+        parts = node.base_fqn.split(".")[1:]
+        current = tree.root
+
+        for part in parts:
+            if part not in self._groups:
+                self._groups[part] = current.add(part, expand=expand)
+            current = self._groups[part]
+        self._tree_nodes[node.uuid] = current.add_leaf(_label(node), node)
+
+    def _patch(self, execution: M.PipelineExecution) -> None:
+        """Update the tree to a newer version of the displayed execution."""
+        tree = self.query_one(Tree)
+        node_map = execution.execution_graph.node_map
+        for uuid in self._tree_nodes.keys() - node_map.keys():
+            tree_node = self._tree_nodes.pop(uuid)
+            if tree_node is not tree.root:
+                tree_node.remove()
+        for node in node_map.values():
+            tree_node = self._tree_nodes.get(node.uuid)
+            if tree_node is None:
+                self._add_node(tree, node, expand=True)
+                continue
+            previous = t.cast(M.ExecutionGraphNode, tree_node.data)
+            tree_node.data = node
+            if tree_node is not tree.root and (
+                previous.status != node.status or previous.name != node.name
+            ):
+                tree_node.set_label(_label(node))
+
     def on_tree_node_selected(self, event: Tree.NodeSelected):
         if event.node.data:
             self.post_message(self.FetchLogsRequest(event.node.data))
-            self.query_one("#log-tailer", Log).border_title = (
+            self.query_one("#log-tailer", LogTailer).border_title = (
                 t.cast(M.ExecutionGraphNode, event.node.data).name + ".log"
             )
 
     def on_input_submitted(self, event: Input.Submitted):
-        self.post_message(self.VectorSearchRequest(event.value))
+        if event.input.id == "log-search":
+            self.action_next_match()
+        else:
+            self.post_message(self.VectorSearchRequest(event.value))
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id != "log-search":
+            return
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        self._search_timer = self.set_timer(
+            self.SEARCH_DELAY, partial(self.search_log, event.value)
+        )
+
+    @work(group="log_search", exclusive=True, thread=True)
+    def search_log(self, text: str) -> None:
+        """Find the lines of the displayed log which match a query.
+
+        The length of the log and the scroll position are read on the UI thread, the
+        lines are then scanned in the worker so a search of a large log doesn't block
+        the UI. Lines streaming in after the search started aren't searched. The first
+        match after the top of the view is jumped to as soon as it is found.
+        """
+        worker = get_current_worker()
+        log = self.query_one("#log-tailer", LogTailer)
+        generation, total, top, first_time = self.app.call_from_thread(
+            lambda: (
+                log.generation,
+                len(log.lines),
+                log.scroll_offset.y,
+                log.columns.first_time(),
+            )
+        )
+        try:
+            query = LogQuery.parse(text, first_time)
+        except ValueError as e:
+            self.app.call_from_thread(
+                self._show_matches, generation, array("q"), str(e)
+            )
+            return
+        if query.empty:
+            self.app.call_from_thread(self._show_matches, generation, array("q"), "")
+            return
+
+        matches = array("q")
+        jumped = False
+        for start in range(0, total, self.SEARCH_CHUNK):
+            if worker.is_cancelled:
+                return
+            stop = min(start + self.SEARCH_CHUNK, total)
+            try:
+                found = list(query.matches(log.lines, log.columns, start, stop))
+            except IndexError:
+                # The log was cleared while it was searched
+                return
+            matches.extend(found)
+            if not jumped:
+                line = next((line for line in found if line >= top), None)
+                if line is not None:
+                    jumped = True
+                    self.app.call_from_thread(self._jump_to_match, generation, line)
+        if not worker.is_cancelled:
+            if matches and not jumped:
+                self.app.call_from_thread(self._jump_to_match, generation, matches[0])
+            self.app.call_from_thread(self._show_matches, generation, matches)
+
+    def _jump_to_match(self, generation: int, line: int) -> None:
+        log = self.query_one("#log-tailer", LogTailer)
+        if log.generation == generation:
+            log.jump_to(line)
+
+    def _show_matches(
+        self, generation: int, matches: array, message: t.Optional[str] = None
+    ) -> None:
+        log = self.query_one("#log-tailer", LogTailer)
+        if log.generation != generation:
+            # The results are for lines which were cleared
+            return
+        self._matches = matches
+        if not matches:
+            log.match_line = None
+        status = self.query_one("#log-search-status", Label)
+        if message is None:
+            message = f"{len(matches):,} matches" if matches else "No matches"
+        status.update(message)
+
+    def _step(self, forward: bool) -> None:
+        """Jump to the next or previous match, wrapping around the log."""
+        if not self._matches:
+            return
+        log = self.query_one("#log-tailer", LogTailer)
+        current = log.match_line if log.match_line is not None else -1
+        if forward:
+            index = bisect.bisect_right(self._matches, current)
+        else:
+            index = bisect.bisect_left(self._matches, current) - 1
+        index %= len(self._matches)
+        log.jump_to(self._matches[index])
+        self.query_one("#log-search-status", Label).update(
+            f"{index + 1:,} of {len(self._matches):,} matches"
+        )
+
+    def action_next_match(self) -> None:
+        self._step(forward=True)
+
+    def action_previous_match(self) -> None:
+        self._step(forward=False)
+
+
+@dataclass
+class LogWriterStats:
+    """Throughput and latency of a `BufferedLogWriter`."""
+
+    lines: int = 0
+    """The number of lines written to the log."""
+    batches: int = 0
+    """The number of `write_lines` calls used to write them."""
+    lag: float = 0.0
+    """Seconds the oldest line of the last batch waited to be written."""
+    max_lag: float = 0.0
+    """The longest a line waited to be written."""
+    blocked: float = 0.0
+    """Seconds the producer spent waiting for the log to catch up."""
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def lines_per_second(self) -> float:
+        """The average write rate since the writer started."""
+        return self.lines / max(time.monotonic() - self.started, 1e-9)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.lines:,} lines · {self.lines_per_second:,.0f} lines/s"
+            f" · lag {self.lag * 1000:.0f}ms"
+        )
+
+
+class BufferedLogWriter:
+    """Feeds lines from a worker thread to a `Log` widget in batches.
+
+    `write` queues lines and a timer on the widget drains the queue once per frame with
+    a single `write_lines` call, so the UI updates at a fixed rate however fast lines
+    arrive. When `max_pending` lines are queued, `write` blocks until the log catches
+    up. The writer's stats are shown in the log's subtitle.
+
+    Use it as a context manager from the producing thread. Leaving the block waits for
+    the queued lines to be written, unless `cancel` was called or the log was removed.
+    """
+
+    def __init__(
+        self,
+        log: Log,
+        *,
+        fps: float = 30.0,
+        max_batch: int = 20_000,
+        max_pending: int = 100_000,
+    ) -> None:
+        """Create a writer for a log.
+
+        Args:
+            log (Log): The log widget to write to.
+            fps (float): How many times per second queued lines are written.
+            max_batch (int): The most lines written in a single frame.
+            max_pending (int): The most lines queued before `write` blocks.
+        """
+        self.log = log
+        self.fps = fps
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.stats = LogWriterStats()
+        self._lines: t.Deque[t.Tuple[str, t.Tuple[int, float, int]]] = deque()
+        self._queued_at: t.Optional[float] = None
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._timer: t.Optional[Timer] = None
+
+    def __enter__(self) -> BufferedLogWriter:
+        self.log.app.call_from_thread(self._start)
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    def _start(self) -> None:
+        self.stats = LogWriterStats()
+        self._timer = self.log.set_interval(1 / self.fps, self._flush)
+        if isinstance(self.log, LogTailer):
+            self.log.writer = self
+
+    @property
+    def _stopped(self) -> bool:
+        """Whether queued lines will never be written, under the condition."""
+        return self._cancelled or not self.log.is_attached
+
+    def write(
+        self, line: str, record: t.Optional[t.Mapping[str, t.Any]] = None
+    ) -> None:
+        """Queue a line, blocking while the log is `max_pending` lines behind.
+
+        The level, time and position of the decoded log line `record` are encoded here,
+        on the producing thread, and stored alongside the line in a `LogTailer`.
+        """
+        values = LogColumns.encode(record)
+        with self._cond:
+            if len(self._lines) >= self.max_pending:
+                waited = time.monotonic()
+                while len(self._lines) >= self.max_pending and not self._stopped:
+                    self._cond.wait(0.1)
+                self.stats.blocked += time.monotonic() - waited
+            if self._stopped:
+                return
+            if not self._lines:
+                self._queued_at = time.monotonic()
+            self._lines.append((line, values))
+
+    def cancel(self) -> None:
+        """Drop the queued lines and stop accepting new ones."""
+        with self._cond:
+            self._cancelled = True
+            self._lines.clear()
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Wait until every queued line is written, then stop the timer."""
+        with self._cond:
+            while self._lines and not self._stopped:
+                self._cond.wait(0.1)
+        self.log.app.call_from_thread(self._stop)
+
+    def _stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if isinstance(self.log, LogTailer) and self.log.writer is self:
+            self.log.writer = None
+        if self.log.is_attached:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write a batch of queued lines to the log."""
+        with self._cond:
+            if not self._lines:
+                return
+            count = min(len(self._lines), self.max_batch)
+            batch = [self._lines.popleft() for _ in range(count)]
+            now = time.monotonic()
+            lag = now - t.cast(float, self._queued_at)
+            # Lines left for the next frame are treated as queued now
+            self._queued_at = now if self._lines else None
+            self._cond.notify_all()
+        if isinstance(self.log, LogTailer):
+            self.log.write_records(batch)
+        else:
+            self.log.write_lines([line for line, _ in batch])
+        self.stats.lines += count
+        self.stats.batches += 1
+        self.stats.lag = lag
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+        self.log.border_subtitle = str(self.stats)
+
+
+def _label(node: M.ExecutionGraphNode) -> str:
+    """The tree label of a node, prefixed by its status."""
+    return EMOJI_STATUS_MAP.get(node.status, "") + node.name
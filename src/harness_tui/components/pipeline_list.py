@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import typing as t
+from functools import partial
 
 from textual import events
 from textual.app import ComposeResult
 from textual.message import Message
 from textual.reactive import reactive
+from textual.timer import Timer
 from textual.widgets import (
     Button,
     Input,
@@ -19,6 +22,7 @@ from textual.widgets import (
 )
 
 import harness_tui.models as M
+from harness_tui.search import PIPELINE_FIELDS, SearchIndex, pipeline_fields
 
 
 class PipelineCard(Static):
@@ -76,39 +80,253 @@ class PipelineCard(Static):
 
 
 class PipelineList(Static):
-    """This component displays a list of pipeline cards."""
+    """This component displays a list of pipeline cards.
 
-    pipeline_list = reactive(list, recompose=True)
+    Assigning `pipeline_list` reconciles the displayed cards by pipeline identifier
+    instead of rebuilding them. Only cards whose pipeline changed are re-rendered,
+    inserts and removals are applied in place and the cursor and filter are kept.
 
-    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
-        """A list of pipelines."""
+    Long lists are virtualized. Only a window of cards covering the visible region
+    plus `OVERSCAN` cards on either side is mounted, and the window slides along with
+    the cursor or the mouse wheel so widget count and layout time stay constant no
+    matter how many pipelines the project has.
+
+    The filter searches a `SearchIndex` over the name, identifier, tags, stages and
+    description of each pipeline and lists the matches best first. The index is kept
+    up to date as pipelines change and searches run once typing settles.
+    """
+
+    VIRTUAL_THRESHOLD: t.ClassVar[int] = 100
+    """Lists with more pipelines than this are virtualized when `virtual` is unset."""
+
+    OVERSCAN: t.ClassVar[int] = 5
+    """The number of cards mounted above and below the visible region."""
+
+    ITEM_HEIGHT: t.ClassVar[int] = 4
+    """The minimum height of a card, used to size the window."""
+
+    SCROLL_STEP: t.ClassVar[int] = 3
+    """The number of cards the window slides per mouse wheel tick."""
+
+    SEARCH_DELAY: t.ClassVar[float] = 0.15
+    """Seconds without typing after which the filter is applied."""
+
+    pipeline_list: reactive[t.List[M.PipelineSummary]] = reactive(list)
+
+    def __init__(
+        self, *args: t.Any, virtual: t.Optional[bool] = None, **kwargs: t.Any
+    ) -> None:
+        """A list of pipelines.
+
+        Args:
+            virtual (bool): Whether to only mount the visible window of cards. By
+                default lists longer than `VIRTUAL_THRESHOLD` are virtualized.
+        """
         super().__init__(*args, **kwargs)
+        self.virtual = virtual
+        self.filter_value = ""
+        self._visible: t.List[M.PipelineSummary] = []
+        self._start = 0
+        self._loaded = False
+        self._reconcile_lock = asyncio.Lock()
+        self._index = SearchIndex(PIPELINE_FIELDS)
+        self._indexed: t.Dict[str, M.PipelineSummary] = {}
+        self._search_timer: t.Optional[Timer] = None
 
     def compose(self) -> ComposeResult:
         """Compose the pipeline list."""
         yield Static(id="list-place-holder")
         yield Input(placeholder="Filter", id="pipeline-search")
-        yield ListView(
-            *[
-                ListItem(
-                    PipelineCard(pipeline=pipeline),
-                    id=f"pipeline-list-item-{pipeline.identifier}",
+        yield Label(id="pipeline-position")
+        yield ListView(id="pipeline-list")
+
+    @property
+    def virtualized(self) -> bool:
+        """Whether only a window of the matching pipelines is mounted."""
+        if self.virtual is None:
+            return len(self._visible) > self.VIRTUAL_THRESHOLD
+        return self.virtual
+
+    @property
+    def window_size(self) -> int:
+        """The number of cards mounted when the list is virtualized."""
+        height = self.query_one(ListView).size.height or self.app.size.height
+        return height // self.ITEM_HEIGHT + 1 + 2 * self.OVERSCAN
+
+    async def watch_pipeline_list(self) -> None:
+        """Reconcile the list items with the new pipeline list."""
+        list_view = self.query_one(ListView)
+        highlighted = list_view.highlighted_child
+        self._update_index()
+        self._visible = self._search()
+        if self.virtualized and highlighted is not None:
+            # Keep the highlighted card at the same place in the window when
+            # pipelines are added or removed above it
+            position = next(
+                (
+                    i
+                    for i, pipeline in enumerate(self._visible)
+                    if _item_id(pipeline) == highlighted.id
+                ),
+                None,
+            )
+            if position is not None:
+                self._start = position - t.cast(int, list_view.index)
+        await self._refresh_window()
+
+    async def _refresh_window(self, scroll: bool = False) -> None:
+        """Reconcile the mounted cards with the current window of pipelines."""
+        # Reconciliation awaits DOM updates so overlapping refreshes are serialized,
+        # each pass works from the latest state
+        async with self._reconcile_lock:
+            if self.virtualized:
+                size = self.window_size
+                self._start = max(0, min(self._start, len(self._visible) - size))
+                window = self._visible[self._start : self._start + size]
+            else:
+                self._start, window = 0, self._visible
+            await self._reconcile(window, scroll)
+            position = self.query_one("#pipeline-position", Label)
+            position.display = self.virtualized and bool(window)
+            if position.display:
+                position.update(
+                    f"{self._start + 1}-{self._start + len(window)}"
+                    f" of {len(self._visible)}"
                 )
-                for pipeline in self.pipeline_list
-            ],
-            id="pipeline-list",
+
+    async def _reconcile(
+        self, pipelines: t.List[M.PipelineSummary], scroll: bool = False
+    ) -> None:
+        list_view = self.query_one(ListView)
+        items = {
+            t.cast(str, item.id): t.cast(ListItem, item) for item in list_view.children
+        }
+        wanted = {_item_id(pipeline) for pipeline in pipelines}
+        highlighted = list_view.highlighted_child
+
+        with self.app.batch_update():
+            removed = [
+                index
+                for index, item in enumerate(list_view.children)
+                if item.id not in wanted
+            ]
+            if removed:
+                await list_view.remove_items(removed)
+            appended = []
+            for index, pipeline in enumerate(pipelines):
+                item = items.get(_item_id(pipeline))
+                if item is None:
+                    item = ListItem(
+                        PipelineCard(pipeline=pipeline), id=_item_id(pipeline)
+                    )
+                    if index >= len(list_view.children):
+                        appended.append(item)
+                    else:
+                        await list_view.mount(item, before=index)
+                    continue
+                # Cards are only re-rendered when the pipeline itself changed
+                card = item.query_one(PipelineCard)
+                changed = _card_changed(card.pipeline, pipeline)
+                card.pipeline = pipeline
+                if changed:
+                    card.refresh(recompose=True)
+                if list_view.children[index] is not item:
+                    list_view.move_child(item, before=index)
+            if appended:
+                await list_view.mount_all(appended)
+
+        if highlighted is not None and highlighted in list_view.children:
+            # The highlighted item object is unchanged so only the index is realigned
+            list_view.set_reactive(
+                ListView.index, list_view.children.index(highlighted)
+            )
+            if scroll:
+                list_view.call_after_refresh(
+                    list_view.scroll_to_widget, highlighted, animate=False
+                )
+        elif highlighted is not None:
+            list_view.index = None
+        elif not self._loaded and pipelines:
+            self._loaded = True
+            list_view.index = 0
+
+    async def _slide(self, start: int) -> None:
+        """Move the window of mounted cards so it begins at `start`."""
+        if start != self._start:
+            self._start = start
+            await self._refresh_window(scroll=True)
+
+    def _update_index(self) -> None:
+        """Index new and changed pipelines and drop the removed ones."""
+        pipelines = {pipeline.identifier: pipeline for pipeline in self.pipeline_list}
+        for identifier in self._indexed.keys() - pipelines.keys():
+            self._index.discard(identifier)
+            del self._indexed[identifier]
+        for identifier, pipeline in pipelines.items():
+            indexed = self._indexed.get(identifier)
+            if indexed is None or indexed.last_updated_at != pipeline.last_updated_at:
+                self._index.add(identifier, pipeline_fields(pipeline))
+                self._indexed[identifier] = pipeline
+
+    def _search(self) -> t.List[M.PipelineSummary]:
+        """The pipelines matching the filter, best matches first."""
+        if not self.filter_value.strip():
+            return list(self.pipeline_list)
+        scores = dict(self._index.search(self.filter_value))
+        return sorted(
+            (p for p in self.pipeline_list if p.identifier in scores),
+            key=lambda p: -scores[p.identifier],
         )
 
+    async def _apply_filter(self) -> None:
+        """Show the pipelines matching the filter."""
+        if self._search_timer is not None:
+            self._search_timer.stop()
+            self._search_timer = None
+        self._visible = self._search()
+        self._start = 0
+        await self._refresh_window()
+
+    async def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:
+        """Slide the window when the cursor nears one of its edges."""
+        if not self.virtualized or event.item is None:
+            return
+        index = event.list_view.index
+        count = len(event.list_view.children)
+        if index is None:
+            return
+        elif (index < self.OVERSCAN and self._start > 0) or (
+            index >= count - self.OVERSCAN and self._start + count < len(self._visible)
+        ):
+            await self._slide(self._start + index - self.window_size // 2)
+
+    async def on_mouse_scroll_down(self, event: events.MouseScrollDown) -> None:
+        """Slide the window down once the mounted cards are scrolled to the end."""
+        list_view = self.query_one(ListView)
+        if self.virtualized and list_view.scroll_y >= list_view.max_scroll_y:
+            await self._slide(self._start + self.SCROLL_STEP)
+
+    async def on_mouse_scroll_up(self, event: events.MouseScrollUp) -> None:
+        """Slide the window up once the mounted cards are scrolled to the start."""
+        list_view = self.query_one(ListView)
+        if self.virtualized and list_view.scroll_y <= 0:
+            await self._slide(max(0, self._start - self.SCROLL_STEP))
+
+    async def on_resize(self, event: events.Resize) -> None:
+        """Resize the window to the new visible region."""
+        if self.virtualized:
+            await self._refresh_window()
+
     def on_input_changed(self, event: Input.Changed):
-        """Filter the pipeline list based on the search input."""
+        """Filter the pipeline list based on the search input once typing settles."""
         event.stop()
-        for card in self.query(PipelineCard):
-            wrapper = t.cast(ListItem, card.parent)
-            wrapper.disabled = event.value.lower() not in card.pipeline.name.lower()
-            if wrapper.disabled:
-                wrapper.add_class("filtered")
-            else:
-                wrapper.remove_class("filtered")
+        self.filter_value = event.value
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        # The timer only queues the search so typing never cancels a reconciliation
+        self._search_timer = self.set_timer(
+            self.SEARCH_DELAY, partial(self.call_later, self._apply_filter)
+        )
 
     def on_key(self, event: events.Key) -> None:
         """Allow the user to navigate the pipeline list with j/k."""
@@ -119,13 +337,28 @@ class PipelineList(Static):
         elif event.key == "escape":
             self.blur()
 
-    def on_input_submitted(self, event: Input.Submitted):
+    async def on_input_submitted(self, event: Input.Submitted):
         """Focus the pipeline list when the search input is submitted."""
         event.stop()
-        if any(not item.disabled for item in self.query(ListItem)):
+        if self._search_timer is not None:
+            await self._apply_filter()
+        if self._visible:
             self.query_one(ListView).focus()
             self.query_one(ListView).action_cursor_down()
         else:
             self.notify(
                 f"No pipelines found matching `{event.value}`.", severity="error"
             )
+
+
+def _item_id(pipeline: M.PipelineSummary) -> str:
+    """The list item id used to key a pipeline."""
+    return f"pipeline-list-item-{pipeline.identifier}"
+
+
+def _card_changed(old: M.PipelineSummary, new: M.PipelineSummary) -> bool:
+    """Whether a pipeline changed in a way that requires its card to be re-rendered."""
+    return (
+        old.last_updated_at != new.last_updated_at
+        or old.execution_summary != new.execution_summary
+    )
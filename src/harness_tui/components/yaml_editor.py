@@ -3,26 +3,93 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import math
 import typing as t
+from dataclasses import dataclass
+from functools import partial
 
-import jsonschema
-import referencing
-import requests
 import yaml
-from referencing.jsonschema import DRAFT202012
+from rich.text import Text
 from textual import work
 from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.message import Message
 from textual.reactive import reactive
-from textual.widgets import Button, Static, TextArea
+from textual.timer import Timer
+from textual.widgets import Button, Label, Static, TextArea
+from textual.worker import get_current_worker
+
+from harness_tui.schema import pipeline_validator
+from harness_tui.utils import TTLCache, YamlLoader, load_yaml
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """The outcome of validating a YAML document."""
+
+    obj: t.Any = None
+    """The parsed document."""
+    error: t.Optional[str] = None
+    """Why the document is invalid, None if it is valid."""
+    line: t.Optional[int] = None
+    """The zero based line of the error, if it could be located."""
+    column: t.Optional[int] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def summary(self) -> str:
+        if self.valid:
+            return "YAML is valid"
+        elif self.line is None:
+            return self.error or ""
+        return f"Line {self.line + 1}, column {(self.column or 0) + 1}: {self.error}"
+
+
+def _locate(text: str, path: t.Iterable[t.Any]) -> t.Optional[yaml.Mark]:
+    """Find where the value at a JSON path of a document starts."""
+    node = yaml.compose(text, Loader=YamlLoader)
+    if node is None:
+        return None
+    for part in path:
+        if isinstance(node, yaml.MappingNode):
+            node = next((v for k, v in node.value if k.value == part), node)
+        elif isinstance(node, yaml.SequenceNode) and isinstance(part, int):
+            node = node.value[part] if part < len(node.value) else node
+        else:
+            break
+    return node.start_mark
+
+
+class YamlTextArea(TextArea):
+    """A code editor which underlines the line of a validation error."""
+
+    error_line: reactive[t.Optional[int]] = reactive(None)
 
-REGISTRY = "https://raw.githubusercontent.com/harness/harness-schema/main/v0"
-PIPELINE_SCHEMA = f"{REGISTRY}/pipeline.json"
+    def on_mount(self) -> None:
+        # The initial text counts as a change so it is validated too
+        self.post_message(self.Changed(self))
+
+    def get_line(self, line_index: int) -> Text:
+        line = super().get_line(line_index)
+        if line_index == self.error_line:
+            line.stylize("underline red")
+        return line
 
 
 class YamlEditor(Static):
-    """Component that displays the YAML editor for a specific pipeline."""
+    """Component that displays the YAML editor for a specific pipeline.
+
+    The text is validated in a background thread once typing pauses for
+    `VALIDATE_DELAY` seconds. Results are cached by a hash of the text so undoing an
+    edit or saving right after a validation doesn't validate again.
+    """
+
+    VALIDATE_DELAY: t.ClassVar[float] = 0.3
+    """Seconds without typing after which the text is validated."""
 
     class SavePipelineRequest(Message):
         def __init__(self, yaml: str, obj: dict) -> None:
@@ -35,9 +102,11 @@ class YamlEditor(Static):
     def __init__(self, *args: t.Any, **kwargs: t.Any):
         super().__init__(*args, **kwargs)
         self.validator = None
+        self._results = TTLCache(math.inf, maxsize=16)
+        self._validate_timer: t.Optional[Timer] = None
 
     def compose(self) -> ComposeResult:
-        yield TextArea.code_editor(
+        yield YamlTextArea.code_editor(
             self.base_content,
             id="yaml-editor",
             theme="css",
@@ -45,8 +114,9 @@ class YamlEditor(Static):
             soft_wrap=False,
             show_line_numbers=True,
             tab_behavior="indent",
-        )  # TODO: set the border to red if the yaml is invalid
+        )
         with Horizontal():
+            yield Label(id="yaml-status")
             yield Button("Save", id="save-button", variant="success")
             yield Button("Validate", id="validate-button", variant="default")
             yield Button("Reset", id="reset-button", variant="error")
@@ -59,56 +129,105 @@ class YamlEditor(Static):
     async def on_button_pressed(self, event: Button.Pressed):
         """Handle button presses."""
         if event.button.id == "validate-button":
-            valid = self.validate_yaml()
-            self.query_one("#save-button", Button).disabled = not valid
+            self._cancel_timer()
+            self.validate_in_background(
+                self.query_one("#yaml-editor", TextArea).text, notify=True
+            )
         elif event.button.id == "save-button":
             text = self.query_one("#yaml-editor", TextArea).text
-            obj = yaml.safe_load(text)
-            if self.validator:
-                self.validator.validate(obj)
-            self.post_message(self.SavePipelineRequest(text, obj))
+            result = self.check(text)
+            if not result.valid:
+                self.notify(result.summary, severity="error")
+                return
+            self.post_message(self.SavePipelineRequest(text, result.obj))
         elif event.button.id == "reset-button":
             await self.recompose()
             self.notify("YAML reset to original state", severity="information")
 
     @work(group="fetch_schema", exclusive=True)
     async def get_schema(self) -> None:
-        """Get the schema for the pipeline."""
+        """Get the shared validator for the pipeline schema."""
         try:
-            schema = (await asyncio.to_thread(requests.get, PIPELINE_SCHEMA)).json()
-            resource = referencing.Resource(contents=schema, specification=DRAFT202012)
-            registry = referencing.Registry().with_resource(
-                "https://raw.githubusercontent.com/harness/harness-schema/main/v0",
-                resource,
-            )
-            self.validator = jsonschema.Draft202012Validator(
-                schema=schema, registry=registry
-            )
+            self.validator = await asyncio.to_thread(pipeline_validator)
         except Exception as e:
             self.notify(
                 f"Could not fetch jsonschema for pipeline YAML: {e}", severity="warning"
             )
+            return
+        # Earlier results only checked the syntax
+        self._results.clear()
+        self.validate_in_background(self.query_one("#yaml-editor", TextArea).text)
 
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
+        """Validate the text once typing settles."""
         self.query_one("#save-button", Button).disabled = True
-
-    def validate_yaml(self) -> bool:
-        """Update the text area with the new text."""
-        text = self.query_one("#yaml-editor", TextArea).text
+        self._cancel_timer()
+        self._validate_timer = self.set_timer(
+            self.VALIDATE_DELAY, partial(self.call_later, self._validate_current)
+        )
+
+    def _cancel_timer(self) -> None:
+        if self._validate_timer is not None:
+            self._validate_timer.stop()
+            self._validate_timer = None
+
+    def _validate_current(self) -> None:
+        self._validate_timer = None
+        self.validate_in_background(self.query_one("#yaml-editor", TextArea).text)
+
+    @work(group="validate_yaml", exclusive=True, thread=True)
+    def validate_in_background(self, text: str, notify: bool = False) -> None:
+        """Validate the text in a thread, superseding any validation still running."""
+        result = self.check(text)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._show_result, text, result, notify)
+
+    def check(self, text: str) -> ValidationResult:
+        """Parse and validate a document against the pipeline schema if it is loaded."""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        result = self._results.get(key)
+        if result is not None:
+            return result
         try:
-            obj = yaml.safe_load(text)
+            obj = load_yaml(text)
         except yaml.YAMLError as e:
-            self.notify(f"YAML error: {e}", severity="error")
-            return False
-
-        if self.validator:
-            try:
-                self.validator.validate(obj)
-            except jsonschema.ValidationError as e:
-                self.notify(
-                    f"Validation error at {e.json_path}: {e.message}", severity="error"
+            mark = getattr(e, "problem_mark", None)
+            result = ValidationResult(
+                error=getattr(e, "problem", None) or str(e),
+                line=mark.line if mark else None,
+                column=mark.column if mark else None,
+            )
+        else:
+            error = (
+                next(iter(self.validator.iter_errors(obj)), None)
+                if self.validator
+                else None
+            )
+            if error is None:
+                result = ValidationResult(obj)
+            else:
+                mark = _locate(text, error.absolute_path)
+                result = ValidationResult(
+                    obj,
+                    f"{error.message} at {error.json_path}",
+                    mark.line if mark else None,
+                    mark.column if mark else None,
                 )
-                return False
-
-        self.notify("YAML is valid!", severity="information")
-        return True
+        self._results.set(key, result)
+        return result
+
+    def _show_result(self, text: str, result: ValidationResult, notify: bool) -> None:
+        """Mark the error of the text if it is still the text being edited."""
+        editor = self.query_one("#yaml-editor", YamlTextArea)
+        if editor.text != text:
+            return
+        editor.error_line = result.line
+        editor.set_class(not result.valid, "-invalid")
+        status = self.query_one("#yaml-status", Label)
+        status.update(result.summary)
+        status.set_class(not result.valid, "-invalid")
+        self.query_one("#save-button", Button).disabled = not result.valid
+        if notify:
+            self.notify(
+                result.summary, severity="information" if result.valid else "error"
+            )
@@ -0,0 +1,220 @@
+"""A local full-text index of scraped step logs backed by SQLite FTS5."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import typing as t
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+FILTERS = ("pipeline", "execution", "stage", "step", "status")
+"""Fields a query can be narrowed by with a `field:value` term."""
+
+_FILTER = re.compile(rf"^({'|'.join(FILTERS)}):(.+)$", re.IGNORECASE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    log_key TEXT NOT NULL UNIQUE,
+    pipeline TEXT NOT NULL,
+    execution TEXT NOT NULL,
+    run_sequence INTEGER,
+    stage TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT,
+    started_at REAL,
+    path TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_pipeline ON documents (pipeline, started_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS logs USING fts5(
+    pipeline, stage, step, content
+);
+"""
+
+
+@dataclass
+class LogMatch:
+    """A step log matching a query."""
+
+    log_key: str
+    pipeline: str
+    execution: str
+    run_sequence: t.Optional[int]
+    stage: str
+    step: str
+    status: t.Optional[str]
+    started_at: t.Optional[datetime]
+    path: t.Optional[str]
+    snippet: str
+    """The best matching fragment of the log with the matched terms marked."""
+    score: float
+    """How well the log matches, higher is better."""
+
+    def __str__(self) -> str:
+        run = f" #{self.run_sequence}" if self.run_sequence is not None else ""
+        started = (
+            f" {self.started_at.astimezone():%Y-%m-%d %H:%M}" if self.started_at else ""
+        )
+        status = f" [{self.status}]" if self.status else ""
+        return f"{self.pipeline}{run} {self.stage}/{self.step}{status}{started}"
+
+
+def _fts_query(terms: t.Iterable[str]) -> str:
+    """Quote terms so punctuation in error messages isn't parsed as FTS5 syntax.
+
+    A trailing `*` is kept as a prefix search.
+    """
+    quoted = []
+    for term in terms:
+        prefix = term.endswith("*") and len(term) > 1
+        term = term.rstrip("*") if prefix else term
+        quoted.append('"{}"'.format(term.replace('"', '""')) + ("*" if prefix else ""))
+    return " ".join(quoted)
+
+
+class LogIndex:
+    """A full-text index of step logs and the pipeline, execution, stage and step
+    they belong to.
+
+    Logs are added one at a time as they are scraped, replacing any earlier version of
+    the same log key. Queries match every term, ranked by BM25, and can be narrowed
+    with `field:value` terms for the fields in `FILTERS`, for example
+    `status:failed connection refused`. The index can be shared between threads.
+    """
+
+    def __init__(self, path: t.Union[str, Path]) -> None:
+        """Open or create an index.
+
+        Args:
+            path (Path): The database file, or `:memory:`.
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+    def __contains__(self, log_key: object) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM documents WHERE log_key = ?", (log_key,)
+                ).fetchone()
+                is not None
+            )
+
+    def add(
+        self,
+        log_key: str,
+        content: str,
+        *,
+        pipeline: str,
+        execution: str,
+        stage: str,
+        step: str,
+        run_sequence: t.Optional[int] = None,
+        status: t.Optional[str] = None,
+        started_at: t.Optional[datetime] = None,
+        path: t.Optional[t.Union[str, Path]] = None,
+    ) -> None:
+        """Index a step log, replacing any log indexed under the same key."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM documents WHERE log_key = ?", (log_key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM logs WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+            cursor = self._conn.execute(
+                "INSERT INTO documents (log_key, pipeline, execution, run_sequence,"
+                " stage, step, status, started_at, path)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    log_key,
+                    pipeline,
+                    execution,
+                    run_sequence,
+                    stage,
+                    step,
+                    status,
+                    started_at.timestamp() if started_at else None,
+                    str(path) if path is not None else None,
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO logs (rowid, pipeline, stage, step, content)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (cursor.lastrowid, pipeline, stage, step, content),
+            )
+
+    def discard(self, log_key: str) -> None:
+        """Remove a log from the index if it is present."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM documents WHERE log_key = ?", (log_key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM logs WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def search(self, query: str, limit: int = 20) -> t.List[LogMatch]:
+        """Find the logs matching a query, best matches first.
+
+        Ties are broken by recency so the last execution which hit an error comes
+        first.
+
+        Raises:
+            ValueError: If the query has no search terms.
+        """
+        terms, filters = [], []
+        for term in query.split():
+            match = _FILTER.match(term)
+            if match:
+                filters.append((match.group(1).lower(), match.group(2)))
+            else:
+                terms.append(term)
+        if not terms:
+            raise ValueError("The query has no search terms.")
+        sql = (
+            "SELECT d.log_key, d.pipeline, d.execution, d.run_sequence, d.stage,"
+            " d.step, d.status, d.started_at, d.path,"
+            " snippet(logs, 3, '»', '«', '…', 16), bm25(logs)"
+            " FROM logs JOIN documents d ON d.id = logs.rowid WHERE logs MATCH ?"
+        )
+        params: t.List[t.Any] = [_fts_query(terms)]
+        for field, value in filters:
+            sql += f" AND d.{field} = ? COLLATE NOCASE"
+            params.append(value)
+        sql += " ORDER BY bm25(logs), d.started_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            LogMatch(
+                *row[:7],
+                started_at=(
+                    datetime.fromtimestamp(row[7], tz=timezone.utc)
+                    if row[7] is not None
+                    else None
+                ),
+                path=row[8],
+                snippet=" ".join(row[9].split()),
+                score=-row[10],
+            )
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,216 @@
+"""Structured fields and search for the lines of a step log."""
+
+from __future__ import annotations
+
+import calendar
+import math
+import re
+import time
+import typing as t
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+LEVELS = ("", "trace", "debug", "info", "warn", "error", "fatal")
+"""Log levels from least to most severe, the empty level is unknown."""
+
+_LEVEL_CODES = {
+    **{level: code for code, level in enumerate(LEVELS)},
+    "warning": LEVELS.index("warn"),
+    "err": LEVELS.index("error"),
+    "critical": LEVELS.index("fatal"),
+    "panic": LEVELS.index("fatal"),
+}
+
+_TIMESTAMP = re.compile(
+    r"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:?\d\d)?$"
+)
+
+_CLOCK = re.compile(r"^(\d{1,2}):(\d\d)(?::(\d\d))?$")
+
+
+def level_code(level: t.Optional[str]) -> int:
+    """The position of a level in `LEVELS`, 0 if it is unknown."""
+    return _LEVEL_CODES.get(level.lower(), 0) if level else 0
+
+
+@lru_cache(maxsize=4096)
+def _epoch_seconds(prefix: str, zone: str = "Z") -> float:
+    try:
+        seconds = calendar.timegm(time.strptime(prefix, "%Y-%m-%dT%H:%M:%S"))
+    except ValueError:
+        return math.nan
+    if zone != "Z":
+        sign = -1 if zone[0] == "+" else 1
+        zone = zone[1:].replace(":", "")
+        seconds += sign * (int(zone[:2]) * 3600 + int(zone[2:]) * 60)
+    return float(seconds)
+
+
+def parse_time(value: t.Optional[str]) -> float:
+    """Convert an RFC 3339 timestamp to epoch seconds, NaN if it can't be parsed.
+
+    Nanosecond fractions, as written by the log service, are supported. Lines of a
+    log share a handful of distinct seconds so the expensive part is cached.
+    """
+    # The log service writes UTC times with a fraction, which skip the regex
+    if value and value[-1] == "Z" and value[19:20] == ".":
+        try:
+            return _epoch_seconds(value[:19]) + float(value[19:-1])
+        except ValueError:
+            pass
+    match = _TIMESTAMP.match(value) if value else None
+    if match is None:
+        return math.nan
+    prefix, fraction, zone = match.groups()
+    seconds = _epoch_seconds(prefix, zone or "Z")
+    return seconds + float(f"0.{fraction}") if fraction else seconds
+
+
+class LogColumns:
+    """The level, time and position of every line of a log, stored in arrays.
+
+    A million lines take about 17 MB. Lines written without a record, such as
+    messages of the UI, have an unknown level, a NaN time and a position of -1.
+    """
+
+    def __init__(self) -> None:
+        self.levels = bytearray()
+        self.times = array("d")
+        self.positions = array("q")
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    @staticmethod
+    def encode(record: t.Optional[t.Mapping[str, t.Any]]) -> t.Tuple[int, float, int]:
+        """Convert a decoded log line to the values stored for it."""
+        if not record:
+            return 0, math.nan, -1
+        pos = record.get("pos")
+        return (
+            level_code(record.get("level")),
+            parse_time(record.get("time")),
+            pos if isinstance(pos, int) else -1,
+        )
+
+    def append(self, level: int, time: float, pos: int) -> None:
+        """Add the values of a line."""
+        self.levels.append(level)
+        self.times.append(time)
+        self.positions.append(pos)
+
+    def pad(self, length: int) -> None:
+        """Add unknown values until there are values for `length` lines."""
+        missing = length - len(self.levels)
+        if missing > 0:
+            self.levels.extend(bytes(missing))
+            self.times.extend([math.nan] * missing)
+            self.positions.extend([-1] * missing)
+
+    def clear(self) -> None:
+        """Remove the values of every line."""
+        self.levels = bytearray()
+        self.times = array("d")
+        self.positions = array("q")
+
+    def first_time(self) -> t.Optional[float]:
+        """The time of the first line which has one."""
+        return next((ts for ts in self.times if not math.isnan(ts)), None)
+
+
+def _clock(value: str, reference: t.Optional[float]) -> float:
+    """Convert a local `HH:MM[:SS]` time on the day of the reference to epoch seconds."""
+    match = _CLOCK.match(value)
+    if match is None:
+        raise ValueError(f"Expected a time like 20:05 or 20:05:30, not {value!r}.")
+    day = datetime.fromtimestamp(reference) if reference is not None else datetime.now()
+    hour, minute, second = (int(part or 0) for part in match.groups())
+    return day.replace(
+        hour=hour, minute=minute, second=second, microsecond=0
+    ).timestamp()
+
+
+@dataclass
+class LogQuery:
+    """A regular expression and filters on the level and time of log lines.
+
+    Written as text, `level:LEVEL` keeps lines at least that severe and `after:HH:MM`
+    and `before:HH:MM` keep lines within a window, in local time on the day the log
+    starts. The remaining text is the pattern, which ignores case unless it contains
+    capitals. Text which isn't a valid expression is searched for literally so a query
+    can be typed incrementally.
+    """
+
+    pattern: t.Optional[t.Pattern[str]] = None
+    min_level: int = 0
+    after: t.Optional[float] = None
+    before: t.Optional[float] = None
+
+    @classmethod
+    def parse(cls, text: str, reference: t.Optional[float] = None) -> LogQuery:
+        """Parse a query.
+
+        Args:
+            text (str): The query text.
+            reference (float): The epoch time of the start of the log, which dates
+                the `after` and `before` filters.
+
+        Raises:
+            ValueError: If a filter is malformed.
+        """
+        query = cls()
+        words = []
+        for word in text.split(" "):
+            field, _, value = word.partition(":")
+            if field == "level" and value:
+                query.min_level = level_code(value)
+                if not query.min_level:
+                    raise ValueError(f"Unknown level {value!r}.")
+            elif field in ("after", "before") and value:
+                setattr(query, field, _clock(value, reference))
+            else:
+                words.append(word)
+        pattern = " ".join(words).strip()
+        if pattern:
+            flags = 0 if any(char.isupper() for char in pattern) else re.IGNORECASE
+            try:
+                query.pattern = re.compile(pattern, flags)
+            except re.error:
+                query.pattern = re.compile(re.escape(pattern), flags)
+        return query
+
+    @property
+    def empty(self) -> bool:
+        """Whether the query matches every line."""
+        return (
+            self.pattern is None
+            and not self.min_level
+            and self.after is None
+            and self.before is None
+        )
+
+    def matches(
+        self,
+        lines: t.Sequence[str],
+        columns: LogColumns,
+        start: int = 0,
+        stop: t.Optional[int] = None,
+    ) -> t.Iterator[int]:
+        """The indices of the matching lines between `start` and `stop`."""
+        stop = len(lines) if stop is None else min(stop, len(lines))
+        levels, times = columns.levels, columns.times
+        known = len(columns)
+        search = self.pattern.search if self.pattern is not None else None
+        after = self.after if self.after is not None else -math.inf
+        before = self.before if self.before is not None else math.inf
+        timed = self.after is not None or self.before is not None
+        for index in range(start, stop):
+            if self.min_level and (index >= known or levels[index] < self.min_level):
+                continue
+            if timed and not (index < known and after <= times[index] <= before):
+                continue
+            if search is not None and search(lines[index]) is None:
+                continue
+            yield index
@@ -0,0 +1,406 @@
+"""A compressed, deduplicated store for the scraped step logs."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+MB = 1024 * 1024
+
+MAX_BYTES = int(float(os.getenv("HARNESS_TUI_LOG_CACHE_MB", "512")) * MB)
+"""The disk budget of the compressed chunks, older logs are evicted beyond it.
+
+The full-text index in `logs.db` keeps its own uncompressed copy of every log for
+snippets, which this budget doesn't cover.
+"""
+
+CHUNK_MIN = 2 * 1024
+CHUNK_MAX = 64 * 1024
+_BOUNDARY_BITS = 5
+"""A line whose hash is zero in this many bits ends a chunk, one in 32 on average."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    log_key TEXT PRIMARY KEY,
+    chunks TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_age ON logs (stored_at);
+"""
+
+
+@dataclass(frozen=True)
+class Codec:
+    """A compression format for chunks."""
+
+    name: str
+    compress: t.Callable[[bytes], bytes]
+    decompress: t.Callable[[bytes], bytes]
+
+
+def _gzip() -> Codec:
+    return Codec(
+        "gzip",
+        lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+        gzip.decompress,
+    )
+
+
+def _zstd() -> Codec:
+    import zstandard
+
+    # Compressors aren't thread safe, the module functions create one per call
+    return Codec(
+        "zstd",
+        lambda data: zstandard.compress(data, 9),
+        zstandard.decompress,
+    )
+
+
+CODECS: t.Dict[str, t.Callable[[], Codec]] = {"zstd": _zstd, "gzip": _gzip}
+"""Codec factories by name in order of preference."""
+
+
+def get_codec(name: t.Optional[str] = None) -> Codec:
+    """Get a codec by name or the best one installed.
+
+    Raises:
+        ImportError: If the named codec isn't installed.
+        KeyError: If there is no codec with that name.
+    """
+    if name:
+        return CODECS[name]()
+    for factory in CODECS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return _gzip()
+
+
+def _line_hash(line: bytes) -> int:
+    """The top bits of a line's CRC, mixed by a multiplicative hash.
+
+    The bits of a plain CRC are too regular for lines which differ in a few digits.
+    """
+    return ((zlib.crc32(line) * 2654435761) & 0xFFFFFFFF) >> (32 - _BOUNDARY_BITS)
+
+
+def split_chunks(data: bytes) -> t.List[bytes]:
+    """Split text at line boundaries chosen by the content of the lines.
+
+    Unlike fixed size blocks, the same run of lines produces the same chunks wherever
+    it appears in a log, so output repeated between executions, such as dependency
+    installs, is only stored once.
+    """
+    chunks, start, size = [], 0, 0
+    for line in data.splitlines(keepends=True):
+        size += len(line)
+        if size >= CHUNK_MAX or (size >= CHUNK_MIN and not _line_hash(line)):
+            chunks.append(data[start : start + size])
+            start, size = start + size, 0
+    if size:
+        chunks.append(data[start:])
+    return chunks
+
+
+@dataclass
+class LogStoreStats:
+    """The size of a `LogStore` before and after deduplication and compression."""
+
+    logs: int = 0
+    chunks: int = 0
+    size: int = 0
+    """The total size of the stored logs as text."""
+    unique: int = 0
+    """The size of the distinct chunks."""
+    stored: int = 0
+    """The size of the compressed chunks on disk."""
+    evictions: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """How many times smaller the logs are on disk."""
+        return self.size / self.stored if self.stored else 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.logs:,} logs · {self.size / MB:,.1f} MB"
+            f" → {self.stored / MB:,.1f} MB on disk ({self.ratio:,.1f}x)"
+        )
+
+
+class LogStore:
+    """Step logs split into content addressed chunks which are compressed on disk.
+
+    Each chunk is named after its hash and written once, however many logs contain it.
+    A log is the list of its chunks, kept in a SQLite database with the reference
+    count of every chunk. When the chunks outgrow `max_bytes` the logs stored longest
+    ago are evicted, along with the chunks no other log uses.
+
+    Chunks are compressed with zstd when `zstandard` is installed and gzip otherwise.
+    The codec of every chunk is recorded so a store can be read whatever is installed.
+    The store can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        directory: t.Union[str, Path],
+        *,
+        max_bytes: int = MAX_BYTES,
+        codec: t.Optional[str] = None,
+    ) -> None:
+        """Open or create a store.
+
+        Args:
+            directory (Path): Where the database and chunks are kept.
+            max_bytes (int): The disk budget of the chunks.
+            codec (str): The codec new chunks are compressed with, see `CODECS`.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.codec = get_codec(codec)
+        self._codecs: t.Dict[str, Codec] = {self.codec.name: self.codec}
+        self._conn = sqlite3.connect(
+            str(self.directory / "store.db"), check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._evictions = 0
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+            self._stored = self._conn.execute(
+                "SELECT coalesce(sum(stored), 0) FROM chunks"
+            ).fetchone()[0]
+
+    def _path(self, chunk_id: str) -> Path:
+        return self.directory / "chunks" / chunk_id[:2] / chunk_id
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM logs").fetchone()[0]
+
+    def __contains__(self, log_key: object) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM logs WHERE log_key = ?", (log_key,)
+                ).fetchone()
+                is not None
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the compressed chunks on disk."""
+        with self._lock:
+            return self._stored
+
+    def put(
+        self, log_key: str, content: str, stored_at: t.Optional[float] = None
+    ) -> t.List[str]:
+        """Store a log, replacing any log stored under the same key.
+
+        Args:
+            log_key (str): The key the log is read back with.
+            content (str): The text of the log.
+            stored_at (float): The epoch time the log is aged from, now by default.
+
+        Returns:
+            The keys of the logs which were evicted to stay within the budget.
+        """
+        data = content.encode("utf-8")
+        chunks: t.Dict[str, bytes] = {}
+        order = []
+        for chunk in split_chunks(data):
+            chunk_id = hashlib.blake2b(chunk, digest_size=16).hexdigest()
+            chunks[chunk_id] = chunk
+            order.append(chunk_id)
+        known = self._known(chunks)
+        # Compression happens outside of the lock, chunks stored by another thread
+        # in the meantime are compressed again under it
+        compressed = {
+            chunk_id: self.codec.compress(chunk)
+            for chunk_id, chunk in chunks.items()
+            if chunk_id not in known
+        }
+        with self._lock, self._conn:
+            # The new version is referenced before the old one is released, so the
+            # chunks they share, usually all but the last of a growing log, are kept
+            for chunk_id, chunk in chunks.items():
+                updated = self._conn.execute(
+                    "UPDATE chunks SET refs = refs + 1 WHERE id = ?", (chunk_id,)
+                ).rowcount
+                if updated:
+                    continue
+                blob = compressed.get(chunk_id) or self.codec.compress(chunk)
+                path = self._path(chunk_id)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(blob)
+                tmp.replace(path)
+                self._conn.execute(
+                    "INSERT INTO chunks VALUES (?, ?, ?, ?, 1)",
+                    (chunk_id, self.codec.name, len(chunk), len(blob)),
+                )
+                self._stored += len(blob)
+            self._release(log_key)
+            self._conn.execute(
+                "INSERT INTO logs VALUES (?, ?, ?, ?)",
+                (
+                    log_key,
+                    " ".join(order),
+                    len(data),
+                    stored_at if stored_at is not None else time.time(),
+                ),
+            )
+            return self._evict(keep=log_key)
+
+    def _known(self, chunks: t.Iterable[str]) -> t.Set[str]:
+        """The ids of the chunks which are already stored."""
+        ids = list(chunks)
+        with self._lock:
+            return {
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT id FROM chunks WHERE id IN ({','.join('?' * len(ids))})",
+                    ids,
+                )
+            }
+
+    def _release(self, log_key: str) -> bool:
+        """Remove a log and the chunks only it used, under the lock."""
+        row = self._conn.execute(
+            "SELECT chunks FROM logs WHERE log_key = ?", (log_key,)
+        ).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM logs WHERE log_key = ?", (log_key,))
+        ids = list(set(row[0].split()))
+        for chunk_id in ids:
+            self._conn.execute(
+                "UPDATE chunks SET refs = refs - 1 WHERE id = ?", (chunk_id,)
+            )
+        for chunk_id, stored in self._conn.execute(
+            f"SELECT id, stored FROM chunks WHERE refs <= 0"
+            f" AND id IN ({','.join('?' * len(ids))})",
+            ids,
+        ).fetchall():
+            self._conn.execute("DELETE FROM chunks WHERE id = ?", (chunk_id,))
+            self._path(chunk_id).unlink(missing_ok=True)
+            self._stored -= stored
+        return True
+
+    def _evict(self, keep: t.Optional[str] = None) -> t.List[str]:
+        """Remove the oldest logs until the chunks fit the budget, under the lock."""
+        evicted: t.List[str] = []
+        if self._stored <= self.max_bytes:
+            return evicted
+        for (log_key,) in self._conn.execute(
+            "SELECT log_key FROM logs ORDER BY stored_at"
+        ).fetchall():
+            if self._stored <= self.max_bytes:
+                break
+            if log_key != keep and self._release(log_key):
+                evicted.append(log_key)
+        self._evictions += len(evicted)
+        return evicted
+
+    def discard(self, log_key: str) -> bool:
+        """Remove a log, returning whether it was stored."""
+        with self._lock, self._conn:
+            return self._release(log_key)
+
+    def read(self, log_key: str) -> t.Optional[str]:
+        """Read a log back, or None if it isn't stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks FROM logs WHERE log_key = ?", (log_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            order = row[0].split()
+            codecs = dict(
+                self._conn.execute(
+                    f"SELECT id, codec FROM chunks WHERE id IN"
+                    f" ({','.join('?' * len(order))})",
+                    order,
+                ).fetchall()
+            )
+        parts = []
+        for chunk_id in order:
+            try:
+                blob = self._path(chunk_id).read_bytes()
+            except FileNotFoundError:  # Evicted while it was being read
+                return None
+            parts.append(self._codec(codecs[chunk_id]).decompress(blob))
+        return b"".join(parts).decode("utf-8")
+
+    def _codec(self, name: str) -> Codec:
+        if name not in self._codecs:
+            self._codecs[name] = get_codec(name)
+        return self._codecs[name]
+
+    def open(self, log_key: str) -> t.TextIO:
+        """Open a log as a text file.
+
+        Raises:
+            KeyError: If the log isn't stored.
+        """
+        content = self.read(log_key)
+        if content is None:
+            raise KeyError(log_key)
+        return io.StringIO(content)
+
+    def keys(self) -> t.List[str]:
+        """The keys of the stored logs, most recent first."""
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT log_key FROM logs ORDER BY stored_at DESC"
+                )
+            ]
+
+    def items(
+        self, keys: t.Optional[t.Iterable[str]] = None
+    ) -> t.Iterator[t.Tuple[str, str]]:
+        """Read logs lazily, every log by default, skipping any evicted meanwhile."""
+        for log_key in self.keys() if keys is None else keys:
+            content = self.read(log_key)
+            if content is not None:
+                yield log_key, content
+
+    @property
+    def stats(self) -> LogStoreStats:
+        with self._lock:
+            logs, size = self._conn.execute(
+                "SELECT count(*), coalesce(sum(size), 0) FROM logs"
+            ).fetchone()
+            chunks, unique, stored = self._conn.execute(
+                "SELECT count(*), coalesce(sum(size), 0), coalesce(sum(stored), 0)"
+                " FROM chunks"
+            ).fetchone()
+        return LogStoreStats(logs, chunks, size, unique, stored, self._evictions)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
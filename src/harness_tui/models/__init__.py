@@ -1,15 +1,23 @@
 from harness_tui.models.pipeline import (
+    TERMINAL_STATUSES,
+    CompactExecutionGraphNode,
+    CompactPipelineExecution,
     ExecutionGraphNode,
     Pipeline,
     PipelineExecution,
     PipelineExecutionSummary,
     PipelineSummary,
+    is_terminal_status,
 )
 
 __all__ = [
+    "TERMINAL_STATUSES",
+    "CompactExecutionGraphNode",
+    "CompactPipelineExecution",
     "ExecutionGraphNode",
     "Pipeline",
     "PipelineExecution",
     "PipelineExecutionSummary",
     "PipelineSummary",
+    "is_terminal_status",
 ]
@@ -1,11 +1,43 @@
 """Defines the Pydantic model for a pipeline."""
 
-import io
 import typing as t
 from datetime import datetime, timezone
-
-import yaml
-from pydantic import BaseModel, Field, field_validator
+from functools import cached_property
+
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+    GetCoreSchemaHandler,
+    TypeAdapter,
+    field_validator,
+)
+from pydantic_core import core_schema
+from typing_extensions import Required, TypedDict
+
+from harness_tui.utils import load_yaml
+
+TERMINAL_STATUSES = frozenset(
+    {
+        "success",
+        "succeeded",
+        "failed",
+        "errored",
+        "aborted",
+        "abortedbyfreeze",
+        "expired",
+        "ignorefailed",
+        "skipped",
+        "approvalrejected",
+        "approval_rejected",
+    }
+)
+"""Lower-cased execution statuses which will not change anymore."""
+
+
+def is_terminal_status(status: t.Optional[str]) -> bool:
+    """Check whether an execution status is final."""
+    return bool(status) and t.cast(str, status).lower() in TERMINAL_STATUSES
 
 
 class ExecutionSummaryInfo(BaseModel):
@@ -108,15 +140,15 @@ class Pipeline(BaseModel):
         t.Optional[PublicAccess], Field(alias="publicAccessResponse")
     ] = None
 
-    @property
+    @cached_property
     def pipeline_dict(self) -> t.Dict[str, t.Any]:
-        return yaml.safe_load(io.StringIO(self.pipeline_yaml))
+        return load_yaml(self.pipeline_yaml)
 
-    @property
+    @cached_property
     def resolved_template_pipeline_dict(self) -> t.Dict[str, t.Any]:
         if self.resolved_template_pipeline_yaml is None:
             return {}
-        return yaml.safe_load(io.StringIO(self.resolved_template_pipeline_yaml))
+        return load_yaml(self.resolved_template_pipeline_yaml)
 
 
 class ExtraInfo(BaseModel):
@@ -320,6 +352,11 @@ class PipelineExecutionSummary(BaseModel):
     ] = False
     stages_execution: t.Annotated[bool, Field(alias="stagesExecution")] = False
 
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the execution has finished and its details will not change."""
+        return is_terminal_status(self.status)
+
 
 class ExecutionGraphNode(BaseModel):
     uuid: t.Annotated[str, Field(alias="uuid")]
@@ -385,6 +422,104 @@ class ExecutionGraphNode(BaseModel):
     log_base_key: t.Annotated[t.Optional[str], Field(alias="logBaseKey")]
 
 
+def _epoch_to_datetime(ts: t.Any) -> t.Any:
+    if isinstance(ts, (float, int)):
+        return datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
+    return ts
+
+
+_Timestamp = t.Annotated[t.Optional[datetime], BeforeValidator(_epoch_to_datetime)]
+
+
+class _CompactNodeFields(TypedDict, total=False):
+    uuid: Required[str]
+    setupId: Required[str]
+    name: Required[str]
+    identifier: Required[str]
+    baseFqn: Required[str]
+    stepType: Required[str]
+    status: Required[str]
+    startTs: _Timestamp
+    endTs: _Timestamp
+    logBaseKey: Required[t.Optional[str]]
+
+
+_compact_node_fields = TypeAdapter(_CompactNodeFields)
+
+
+class CompactExecutionGraphNode:
+    """An execution graph node which only validates the fields the UI reads.
+
+    The other fields of `ExecutionGraphNode` are validated from the raw payload when
+    one of them is first accessed, so the large outcomes, step parameters and
+    responses of thousands of matrix nodes are not built unless they are used.
+    Serializing a node returns its raw payload.
+    """
+
+    __slots__ = (
+        "uuid",
+        "setup_id",
+        "name",
+        "identifier",
+        "base_fqn",
+        "step_type",
+        "status",
+        "start_ts",
+        "end_ts",
+        "log_base_key",
+        "_payload",
+        "_full",
+    )
+
+    def __init__(self, payload: t.Dict[str, t.Any]) -> None:
+        fields = _compact_node_fields.validate_python(payload)
+        self.uuid = fields["uuid"]
+        self.setup_id = fields["setupId"]
+        self.name = fields["name"]
+        self.identifier = fields["identifier"]
+        self.base_fqn = fields["baseFqn"]
+        self.step_type = fields["stepType"]
+        self.status = fields["status"]
+        self.start_ts = fields.get("startTs")
+        self.end_ts = fields.get("endTs")
+        self.log_base_key = fields["logBaseKey"]
+        self._payload = payload
+        self._full: t.Optional[ExecutionGraphNode] = None
+
+    @property
+    def full(self) -> "ExecutionGraphNode":
+        """The fully validated node."""
+        if self._full is None:
+            self._full = ExecutionGraphNode.model_validate(self._payload)
+        return self._full
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name in ExecutionGraphNode.model_fields:
+            return getattr(self.full, name)
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactExecutionGraphNode):
+            return self._payload == other._payload
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(uuid={self.uuid!r}, name={self.name!r}, status={self.status!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: t.Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            lambda value: value if isinstance(value, cls) else cls(value),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda node: node._payload
+            ),
+        )
+
+
 class ExecutionGraph(BaseModel):
     root_node_id: t.Annotated[str, Field(alias="rootNodeId")]
     node_map: t.Annotated[t.Dict[str, ExecutionGraphNode], Field(alias="nodeMap")] = {}
@@ -393,6 +528,12 @@ class ExecutionGraph(BaseModel):
     ] = {}
 
 
+class CompactExecutionGraph(ExecutionGraph):
+    node_map: t.Annotated[  # type: ignore[assignment]
+        t.Dict[str, CompactExecutionGraphNode], Field(alias="nodeMap")
+    ] = {}
+
+
 class ExecutionMetadata(BaseModel):
     account_id: t.Annotated[str, Field(alias="accountId")]
     pipeline_identifier: t.Annotated[str, Field(alias="pipelineIdentifier")]
@@ -412,3 +553,21 @@ class PipelineExecution(BaseModel):
     representation_strategy: t.Annotated[str, Field(alias="representationStrategy")] = (
         "camelCase"
     )
+
+    @property
+    def node_statuses(self) -> t.Dict[str, str]:
+        """The status of each node in the execution graph keyed by uuid."""
+        return {
+            uuid: node.status for uuid, node in self.execution_graph.node_map.items()
+        }
+
+
+class CompactPipelineExecution(PipelineExecution):
+    """A pipeline execution whose graph nodes are validated lazily.
+
+    See `CompactExecutionGraphNode`.
+    """
+
+    execution_graph: t.Annotated[  # type: ignore[assignment]
+        CompactExecutionGraph, Field(alias="executionGraph")
+    ]
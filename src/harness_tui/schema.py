@@ -0,0 +1,160 @@
+"""An on-disk cache of the Harness pipeline JSON schema and a shared validator."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import jsonschema
+import referencing
+import requests
+from referencing.jsonschema import DRAFT202012
+
+from harness_tui.api import decoder
+from harness_tui.utils import DATA_DIR
+
+REGISTRY = "https://raw.githubusercontent.com/harness/harness-schema/main/v0"
+PIPELINE_SCHEMA = f"{REGISTRY}/pipeline.json"
+
+SCHEMA_TTL = float(os.getenv("HARNESS_TUI_SCHEMA_TTL", str(24 * 60 * 60)))
+"""Seconds a cached schema is used before it is revalidated with the server."""
+
+OFFLINE = os.getenv("HARNESS_TUI_OFFLINE", "").lower() in ("1", "true", "yes")
+"""Never fetch schemas, only use the ones which are cached already."""
+
+FETCH_TIMEOUT = 10.0
+
+RETRY_DELAY = 60.0
+"""Seconds to wait before trying to load the schema again after it failed."""
+
+
+class SchemaCache:
+    """JSON schemas fetched over HTTP and kept on disk.
+
+    A cached schema is used as is for `ttl` seconds. After that it is revalidated with
+    its ETag or modification date so an unchanged schema isn't downloaded again. When
+    the server can't be reached a cached schema is used however old it is, and in
+    `offline` mode the server is never contacted.
+    """
+
+    def __init__(
+        self,
+        directory: t.Union[str, Path],
+        *,
+        ttl: float = SCHEMA_TTL,
+        offline: bool = OFFLINE,
+        timeout: float = FETCH_TIMEOUT,
+        session: t.Optional[requests.Session] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.offline = offline
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def _path(self, uri: str) -> Path:
+        name = hashlib.sha256(uri.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{name}.json"
+
+    def get(self, uri: str) -> t.Any:
+        """Get the schema at a URI.
+
+        Raises:
+            LookupError: If the schema isn't cached in offline mode.
+            requests.RequestException: If the schema isn't cached and can't be fetched.
+        """
+        path = self._path(uri)
+        meta_path = path.with_suffix(".meta")
+        cached = path.exists()
+        if cached and (self.offline or time.time() - path.stat().st_mtime < self.ttl):
+            return decoder.loads(path.read_bytes())
+        if self.offline:
+            raise LookupError(f"The schema {uri} is not cached and offline mode is on.")
+
+        headers = {}
+        if cached and meta_path.exists():
+            meta = decoder.loads(meta_path.read_bytes())
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = self.session.get(uri, headers=headers, timeout=self.timeout)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException:
+            if cached:
+                return decoder.loads(path.read_bytes())
+            raise
+
+        if response.status_code == 304:
+            os.utime(path)
+            return decoder.loads(path.read_bytes())
+        schema = decoder.loads(response.content)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for target, data in (
+            (path, response.content),
+            (
+                meta_path,
+                json.dumps(
+                    {
+                        "uri": uri,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                ).encode("utf-8"),
+            ),
+        ):
+            tmp = target.with_suffix(f"{target.suffix}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(target)
+        return schema
+
+    def retrieve(self, uri: str) -> referencing.Resource:
+        """Resolve a schema referenced by another one, for a `referencing.Registry`."""
+        return referencing.Resource.from_contents(
+            self.get(uri), default_specification=DRAFT202012
+        )
+
+    def validator(self) -> jsonschema.Draft202012Validator:
+        """Build a validator for pipelines which resolves references through the cache."""
+        schema = self.get(PIPELINE_SCHEMA)
+        registry = referencing.Registry(retrieve=self.retrieve).with_resource(
+            REGISTRY,
+            referencing.Resource(contents=schema, specification=DRAFT202012),
+        )
+        return jsonschema.Draft202012Validator(schema=schema, registry=registry)
+
+
+_validator: t.Optional[jsonschema.Draft202012Validator] = None
+_error: t.Optional[Exception] = None
+_failed_at = 0.0
+_lock = threading.Lock()
+
+
+def pipeline_validator() -> jsonschema.Draft202012Validator:
+    """The pipeline schema validator shared by every editor, built on first use.
+
+    Raises:
+        Exception: Why the schema could not be loaded. The error is raised again for
+            `RETRY_DELAY` seconds so an unreachable server costs one timeout per
+            attempt, after which loading the schema is tried again.
+    """
+    global _validator, _error, _failed_at
+    with _lock:
+        if _validator is None and (
+            _error is None or time.monotonic() - _failed_at >= RETRY_DELAY
+        ):
+            try:
+                _validator = SchemaCache(Path(DATA_DIR) / "schema").validator()
+                _error = None
+            except Exception as e:
+                _error, _failed_at = e, time.monotonic()
+        if _validator is None:
+            raise t.cast(Exception, _error)
+        return _validator
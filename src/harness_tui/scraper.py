@@ -0,0 +1,479 @@
+"""Scrapes the latest step logs of every pipeline into the local cache."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import harness_tui.models as M
+
+if t.TYPE_CHECKING:
+    from harness_tui.api import HarnessClient
+    from harness_tui.log_index import LogIndex
+    from harness_tui.log_store import LogStore
+
+SKIPPED_STEPS = ("liteEngineTask", "save-cache-harness", "restore-cache-harness")
+"""Steps whose logs are never worth caching."""
+
+MAX_LINES = 500
+"""Logs longer than this keep only their head and tail."""
+
+EXECUTION_CONCURRENCY = int(os.getenv("HARNESS_TUI_SCRAPE_EXECUTIONS", "4"))
+DETAILS_CONCURRENCY = int(os.getenv("HARNESS_TUI_SCRAPE_DETAILS", "8"))
+BLOB_CONCURRENCY = int(os.getenv("HARNESS_TUI_SCRAPE_BLOBS", "16"))
+
+SCRAPE_INTERVAL = float(os.getenv("HARNESS_TUI_SCRAPE_INTERVAL", "300"))
+"""Seconds between incremental scrapes while the app runs."""
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    plan_execution_id TEXT PRIMARY KEY,
+    pipeline TEXT NOT NULL,
+    status TEXT,
+    terminal INTEGER NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    log_key TEXT PRIMARY KEY,
+    plan_execution_id TEXT NOT NULL,
+    status TEXT,
+    terminal INTEGER NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_execution ON logs (plan_execution_id);
+"""
+
+
+def _stage_of(base_fqn: str) -> str:
+    """The identifier of the stage a node belongs to, from its fully qualified name."""
+    parts = base_fqn.split(".")
+    if "stages" in parts and parts.index("stages") + 1 < len(parts):
+        return parts[parts.index("stages") + 1]
+    return ""
+
+
+LEGACY_LOGS_MARKER = "legacy_logs_removed"
+"""The file recording that a data directory's plain text logs were removed."""
+
+
+def remove_legacy_logs(directory: Path) -> t.List[str]:
+    """Remove the plain text logs cached before the `LogStore`, once per directory.
+
+    They were named after the end of their log key, without the account, org and
+    project, so they can't be keyed in the store and are scraped again instead.
+    A marker file records the removal so logs saved there later are left alone.
+
+    Returns:
+        The names of the removed files.
+    """
+    marker = directory / LEGACY_LOGS_MARKER
+    if marker.exists():
+        return []
+    removed = []
+    for path in sorted(directory.glob("*.log")):
+        path.unlink(missing_ok=True)
+        removed.append(path.name)
+    marker.write_text(str(time.time()))
+    return removed
+
+
+class ScrapeManifest:
+    """A record of the executions and step logs which were scraped.
+
+    Each execution and log is stored with its status at the time and whether that
+    status was terminal. An execution is only recorded once its logs were all scraped,
+    so a terminal execution in the manifest never needs to be scraped again. The
+    manifest can be shared between threads.
+    """
+
+    def __init__(self, path: t.Union[str, Path]) -> None:
+        """Open or create a manifest.
+
+        Args:
+            path (Path): The database file, or `:memory:`.
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_MANIFEST_SCHEMA)
+
+    def _terminal(self, table: str, column: str, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT terminal FROM {table} WHERE {column} = ?", (key,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def execution_done(self, plan_execution_id: str) -> bool:
+        """Whether an execution had finished when all of its logs were scraped."""
+        return self._terminal("executions", "plan_execution_id", plan_execution_id)
+
+    def log_done(self, log_key: str) -> bool:
+        """Whether a step had finished when its log was scraped."""
+        return self._terminal("logs", "log_key", log_key)
+
+    def record_execution(
+        self, plan_execution_id: str, pipeline: str, status: t.Optional[str]
+    ) -> None:
+        """Record that every log of an execution was scraped."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?)",
+                (
+                    plan_execution_id,
+                    pipeline,
+                    status,
+                    M.is_terminal_status(status),
+                    time.time(),
+                ),
+            )
+
+    def record_log(
+        self, log_key: str, plan_execution_id: str, status: t.Optional[str]
+    ) -> None:
+        """Record that the log of a step was scraped."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?)",
+                (
+                    log_key,
+                    plan_execution_id,
+                    status,
+                    M.is_terminal_status(status),
+                    time.time(),
+                ),
+            )
+
+    def unfinished(self) -> t.List[t.Tuple[str, str]]:
+        """The pipeline and id of executions which were running when last scraped."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT pipeline, plan_execution_id FROM executions WHERE NOT terminal"
+            ).fetchall()
+
+    def __len__(self) -> int:
+        """The number of logs recorded."""
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM logs").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class ScrapeStats:
+    """Progress, throughput and errors of a `LogScraper`."""
+
+    pipelines: int = 0
+    """The number of pipelines whose executions were listed."""
+    executions: int = 0
+    """The number of executions whose details were fetched."""
+    logs: int = 0
+    """The number of step logs written to the cache."""
+    skipped: int = 0
+    """Finished executions and logs which were scraped by an earlier run."""
+    bytes: int = 0
+    """The size of the logs written to the cache."""
+    queued: t.Counter[str] = field(default_factory=Counter)
+    """Tasks submitted to each stage."""
+    errors: t.Counter[str] = field(default_factory=Counter)
+    """Failed tasks of each stage."""
+    last_error: t.Optional[str] = None
+    started: float = field(default_factory=time.monotonic)
+    finished: t.Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the scrape started, until it finished."""
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def logs_per_second(self) -> float:
+        """The average rate logs were written at."""
+        return self.logs / max(self.elapsed, 1e-9)
+
+    def __str__(self) -> str:
+        errors = sum(self.errors.values())
+        return (
+            f"{self.pipelines:,}/{self.queued['executions']:,} pipelines"
+            f" · {self.executions:,}/{self.queued['details']:,} executions"
+            f" · {self.logs:,}/{self.queued['blobs']:,} logs"
+            f" · {self.skipped:,} unchanged"
+            f" · {self.logs_per_second:,.1f} logs/s"
+            f" · {self.bytes / 1024 / 1024:,.1f} MB"
+            + (f" · {errors:,} errors" if errors else "")
+        )
+
+
+class LogScraper:
+    """Downloads the step logs of the latest executions of many pipelines.
+
+    The work runs as three stages, each in a thread pool with its own concurrency
+    limit: listing the executions of a pipeline, fetching the details of an execution
+    and downloading the log of a step. A task hands its results to the next stage as
+    soon as it finishes, so logs are downloaded while other pipelines are still being
+    listed. Failed tasks are counted in `stats` and skipped.
+
+    Logs are written to `store` and added to `index` if one is given, logs the store
+    evicts to stay within its budget are removed from the index. With a
+    `manifest`, executions and logs which had finished when an earlier run scraped
+    them are skipped, so only new and running executions are fetched.
+    """
+
+    def __init__(
+        self,
+        client: HarnessClient,
+        store: LogStore,
+        index: t.Optional[LogIndex] = None,
+        manifest: t.Optional[ScrapeManifest] = None,
+        *,
+        executions: int = EXECUTION_CONCURRENCY,
+        details: int = DETAILS_CONCURRENCY,
+        blobs: int = BLOB_CONCURRENCY,
+        executions_per_pipeline: int = 1,
+        on_progress: t.Optional[t.Callable[[ScrapeStats], t.Any]] = None,
+        progress_interval: float = 1.0,
+    ) -> None:
+        """Create a scraper.
+
+        Args:
+            client (HarnessClient): The client to fetch executions and logs with.
+            store (LogStore): Where logs are written.
+            index (LogIndex): The full-text index logs are added to.
+            manifest (ScrapeManifest): The record of earlier runs.
+            executions (int): The most pipelines whose executions are listed at once.
+            details (int): The most execution details fetched at once.
+            blobs (int): The most logs downloaded at once.
+            executions_per_pipeline (int): How many recent executions of each pipeline
+                are scraped.
+            on_progress (Callable): Called with the stats from worker threads at most
+                once per `progress_interval` seconds, and when the scrape ends.
+        """
+        self.client = client
+        self.store = store
+        self.index = index
+        self.manifest = manifest
+        self.executions_per_pipeline = executions_per_pipeline
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.stats = ScrapeStats()
+        self._pools = {
+            "executions": ThreadPoolExecutor(executions, "scrape-executions"),
+            "details": ThreadPoolExecutor(details, "scrape-details"),
+            "blobs": ThreadPoolExecutor(blobs, "scrape-blobs"),
+        }
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._cancelled = threading.Event()
+        self._reported = 0.0
+        # Logs left to download and whether one failed, by execution
+        self._remaining: t.Dict[str, t.List[t.Any]] = {}
+        self._submitted: t.Set[str] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self, pipelines: t.Iterable[M.PipelineSummary]) -> ScrapeStats:
+        """Scrape the logs of pipelines, blocking until done or cancelled.
+
+        Executions which were still running when an earlier run scraped them are
+        scraped again, even once newer executions have pushed them out of the latest
+        `executions_per_pipeline`.
+        """
+        self.stats = ScrapeStats()
+        self._submitted.clear()
+        try:
+            for pipeline in pipelines:
+                self._submit("executions", self._list_executions, pipeline.identifier)
+            if self.manifest is not None:
+                for pipeline_id, plan_execution_id in self.manifest.unfinished():
+                    self._submit_details(pipeline_id, plan_execution_id)
+            with self._cond:
+                while self._pending and not self.cancelled:
+                    self._cond.wait(0.5)
+        finally:
+            for pool in self._pools.values():
+                pool.shutdown(wait=not self.cancelled, cancel_futures=True)
+            self.stats.finished = time.monotonic()
+            self._report(force=True)
+        return self.stats
+
+    def cancel(self) -> None:
+        """Stop scraping, returning once the tasks in flight have finished.
+
+        Queued tasks are dropped, so the store, index and manifest can be closed as
+        soon as this returns.
+        """
+        self._cancelled.set()
+        with self._cond:
+            self._cond.notify_all()
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, stage: str, fn: t.Callable[..., t.Any], *args: t.Any) -> None:
+        if self.cancelled:
+            return
+        with self._cond:
+            self._pending += 1
+            self.stats.queued[stage] += 1
+        try:
+            future = self._pools[stage].submit(self._guard, stage, fn, *args)
+        except RuntimeError:  # The pool was shut down by `cancel`
+            self._done(None)
+        else:
+            future.add_done_callback(self._done)
+
+    def _done(self, _: t.Optional[Future]) -> None:
+        with self._cond:
+            self._pending -= 1
+            if not self._pending:
+                self._cond.notify_all()
+
+    def _guard(self, stage: str, fn: t.Callable[..., t.Any], *args: t.Any) -> None:
+        """Run a task, counting its failure instead of raising it."""
+        if self.cancelled:
+            return
+        try:
+            fn(*args)
+        except Exception as e:
+            with self._cond:
+                self.stats.errors[stage] += 1
+                self.stats.last_error = f"{stage}: {e}"
+        self._report()
+
+    def _report(self, force: bool = False) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        with self._cond:
+            if not force and now - self._reported < self.progress_interval:
+                return
+            self._reported = now
+        self.on_progress(self.stats)
+
+    def _list_executions(self, pipeline: str) -> None:
+        ref = self.client.pipelines.reference(pipeline)
+        executions = ref.executions(size=self.executions_per_pipeline)
+        with self._cond:
+            self.stats.pipelines += 1
+        for execution in executions:
+            if self.manifest is not None and self.manifest.execution_done(
+                execution.plan_execution_id
+            ):
+                with self._cond:
+                    self.stats.skipped += 1
+                continue
+            self._submit_details(pipeline, execution.plan_execution_id)
+
+    def _submit_details(self, pipeline: str, plan_execution_id: str) -> None:
+        """Fetch the details of an execution unless this run already has."""
+        with self._cond:
+            if plan_execution_id in self._submitted:
+                return
+            self._submitted.add(plan_execution_id)
+        self._submit("details", self._fetch_details, pipeline, plan_execution_id)
+
+    def _fetch_details(self, pipeline: str, plan_execution_id: str) -> None:
+        ref = self.client.pipelines.reference(pipeline)
+        details = ref.execution_details(plan_execution_id)
+        # The summary of the details is more recent than the one which was listed
+        execution = details.pipeline_execution_summary
+        nodes = []
+        for node in details.execution_graph.node_map.values():
+            if not node.log_base_key or node.identifier in SKIPPED_STEPS:
+                continue
+            if self.manifest is not None and self.manifest.log_done(node.log_base_key):
+                with self._cond:
+                    self.stats.skipped += 1
+                continue
+            nodes.append(node)
+        with self._cond:
+            self.stats.executions += 1
+            self._remaining[plan_execution_id] = [len(nodes), False]
+        for node in nodes:
+            self._submit("blobs", self._download, pipeline, execution, node)
+        if not nodes:
+            self._finish(pipeline, execution)
+
+    def _finish(
+        self,
+        pipeline: str,
+        execution: M.PipelineExecutionSummary,
+        log_key: t.Optional[str] = None,
+        failed: bool = False,
+    ) -> None:
+        """Count a log of an execution as done, recording the execution after its last."""
+        with self._cond:
+            remaining = self._remaining[execution.plan_execution_id]
+            if log_key is not None:
+                remaining[0] -= 1
+                remaining[1] = remaining[1] or failed
+            if remaining[0] > 0:
+                return
+            del self._remaining[execution.plan_execution_id]
+        if self.manifest is not None and not remaining[1] and not self.cancelled:
+            self.manifest.record_execution(
+                execution.plan_execution_id, pipeline, execution.status
+            )
+
+    def _download(
+        self,
+        pipeline: str,
+        execution: M.PipelineExecutionSummary,
+        node: M.ExecutionGraphNode,
+    ) -> None:
+        failed = True
+        try:
+            self._write(pipeline, execution, node)
+            failed = False
+        finally:
+            self._finish(pipeline, execution, node.log_base_key, failed)
+
+    def _write(
+        self,
+        pipeline: str,
+        execution: M.PipelineExecutionSummary,
+        node: M.ExecutionGraphNode,
+    ) -> None:
+        lines = list(self.client.logs.blob(node.log_base_key))
+        if lines:
+            if len(lines) > MAX_LINES:
+                half = MAX_LINES // 2
+                lines = [*lines[: half - 1], {"out": "..."}, *lines[-half:]]
+            content = "\n".join(line["out"].rstrip() for line in lines)
+            evicted = self.store.put(node.log_base_key, content)
+            if self.index is not None:
+                for log_key in evicted:
+                    self.index.discard(log_key)
+                self.index.add(
+                    node.log_base_key,
+                    content,
+                    pipeline=pipeline,
+                    execution=execution.plan_execution_id,
+                    run_sequence=execution.run_sequence,
+                    stage=_stage_of(node.base_fqn),
+                    step=node.identifier,
+                    status=node.status,
+                    started_at=node.start_ts or execution.start_ts,
+                )
+            with self._cond:
+                self.stats.logs += 1
+                self.stats.bytes += len(content)
+        if self.manifest is not None:
+            self.manifest.record_log(
+                node.log_base_key, execution.plan_execution_id, node.status
+            )
@@ -0,0 +1,161 @@
+"""A line store which keeps recent lines in memory and spills older ones to disk."""
+
+from __future__ import annotations
+
+import mmap
+import tempfile
+import threading
+import typing as t
+from array import array
+from pathlib import Path
+
+
+class Scrollback(t.Sequence[str]):
+    """A random access sequence of lines with bounded memory usage.
+
+    The most recent `memory_lines` lines are kept in a list. Once it overflows, the
+    oldest lines are appended to an anonymous temporary file in `directory` and read
+    back through a memory map. An index of line offsets keeps access to spilled lines
+    O(1), so scrolling back through a log of several hundred MB only touches the
+    pages which are displayed.
+
+    Only the in-memory lines can be modified, which is enough for a log where just
+    the last line is ever extended. Lines can be read from another thread while the
+    owning thread appends to the scrollback.
+    """
+
+    def __init__(
+        self,
+        directory: t.Optional[t.Union[str, Path]] = None,
+        *,
+        memory_lines: int = 100_000,
+    ) -> None:
+        """Create an empty scrollback.
+
+        Args:
+            directory (Path): Where to create the spill file, the system temporary
+                directory by default.
+            memory_lines (int): The number of recent lines to keep in memory.
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.memory_lines = max(memory_lines, 1)
+        self._recent: t.List[str] = []
+        self._spilled = 0
+        self._offsets = array("Q", [0])
+        self._file: t.Optional[t.IO[bytes]] = None
+        self._map: t.Optional[mmap.mmap] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    @t.overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> t.List[str]: ...
+
+    def __getitem__(self, index: t.Union[int, slice]) -> t.Union[str, t.List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        with self._lock:
+            index = self._normalize(index)
+            if index >= self._spilled:
+                return self._recent[index - self._spilled]
+            return self._read(index)
+
+    def __setitem__(self, index: int, line: str) -> None:
+        with self._lock:
+            index = self._normalize(index)
+            if index < self._spilled:
+                raise IndexError("Lines which were spilled to disk are read only.")
+            self._recent[index - self._spilled] = line
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Scrollback index out of range.")
+        return index
+
+    @property
+    def spilled(self) -> int:
+        """The number of lines which were moved to disk."""
+        return self._spilled
+
+    @property
+    def spilled_bytes(self) -> int:
+        """The size of the spill file."""
+        return self._offsets[-1]
+
+    def append(self, line: str) -> None:
+        """Add a line to the end."""
+        with self._lock:
+            self._recent.append(line)
+            if len(self._recent) > self.memory_lines:
+                self._spill()
+
+    def extend(self, lines: t.Iterable[str]) -> None:
+        """Add lines to the end."""
+        with self._lock:
+            self._recent.extend(lines)
+            if len(self._recent) > self.memory_lines:
+                self._spill()
+
+    def _spill(self) -> None:
+        """Move the oldest in-memory lines to disk, leaving 3/4 of the budget used."""
+        count = len(self._recent) - self.memory_lines * 3 // 4
+        count = min(count, len(self._recent) - 1)
+        if count <= 0:
+            return
+        if self._file is None:
+            if self.directory is not None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            self._file = tempfile.TemporaryFile(
+                dir=self.directory, prefix="scrollback-"
+            )
+        chunk = [
+            line.encode("utf-8", "replace") + b"\n" for line in self._recent[:count]
+        ]
+        offset = self._offsets[-1]
+        for data in chunk:
+            offset += len(data)
+            self._offsets.append(offset)
+        self._file.seek(0, 2)
+        self._file.write(b"".join(chunk))
+        self._file.flush()
+        del self._recent[:count]
+        self._spilled += count
+
+    def _read(self, index: int) -> str:
+        """Read a spilled line through the memory map."""
+        start, end = self._offsets[index], self._offsets[index + 1]
+        if self._map is None or len(self._map) < end:
+            # The file grew since it was mapped
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(
+                t.cast(t.IO[bytes], self._file).fileno(), 0, access=mmap.ACCESS_READ
+            )
+        return self._map[start : end - 1].decode("utf-8", "replace")
+
+    def clear(self) -> None:
+        """Remove every line, truncating the spill file."""
+        with self._lock:
+            self._recent.clear()
+            self._spilled = 0
+            self._offsets = array("Q", [0])
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.seek(0)
+                self._file.truncate()
+
+    def close(self) -> None:
+        """Remove every line and delete the spill file."""
+        with self._lock:
+            self.clear()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
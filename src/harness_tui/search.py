@@ -0,0 +1,228 @@
+"""An in-memory fuzzy search index used to filter pipelines."""
+
+from __future__ import annotations
+
+import math
+import re
+import typing as t
+from collections import defaultdict
+from dataclasses import dataclass
+
+import harness_tui.models as M
+
+PIPELINE_FIELDS: t.Dict[str, float] = {
+    "name": 1.0,
+    "identifier": 0.9,
+    "tags": 0.7,
+    "stages": 0.6,
+    "description": 0.4,
+}
+"""The searchable pipeline fields and the weight of a match in each of them."""
+
+FUZZY_RATIO = 0.5
+"""The share of a term's trigrams a value must contain to count as a fuzzy match."""
+
+_SEPARATORS = re.compile(r"[\s\-_./:,]+")
+
+
+def trigrams(text: str) -> t.Set[str]:
+    """The set of 3 character substrings of a string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def is_subsequence(term: str, text: str) -> bool:
+    """Whether all characters of term appear in text in the same order."""
+    chars = iter(text)
+    return all(char in chars for char in term)
+
+
+@dataclass
+class _Value:
+    """A normalized field value of a document."""
+
+    text: str
+    tokens: t.List[str]
+    weight: float
+
+
+class SearchIndex:
+    """A character and trigram index over weighted document fields.
+
+    Documents are added by key with a mapping of field names to values. A query is
+    split into terms and a document matches when every term matches one of its
+    values, either exactly, as a prefix of a word, as a substring, as an ordered
+    subsequence of characters (so `bld-prd` finds `build-prod-deploy`). A term
+    without any such match is treated as a typo and matches the values sharing at
+    least `FUZZY_RATIO` of its trigrams instead. Matches are ranked by the kind of
+    match and the weight of the field.
+
+    The postings narrow each term down to candidate documents before anything is
+    scored so a keystroke only touches documents which can possibly match.
+    """
+
+    def __init__(self, fields: t.Mapping[str, float]) -> None:
+        """Create an empty index.
+
+        Args:
+            fields (dict): The searchable field names and their weights.
+        """
+        self.fields = dict(fields)
+        self._documents: t.Dict[str, t.List[_Value]] = {}
+        self._chars: t.DefaultDict[str, t.Set[str]] = defaultdict(set)
+        self._trigrams: t.DefaultDict[str, t.Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._documents
+
+    def add(self, key: str, fields: t.Mapping[str, t.Iterable[str]]) -> None:
+        """Add a document to the index, replacing any document with the same key."""
+        self.discard(key)
+        values = []
+        for field, texts in fields.items():
+            weight = self.fields.get(field)
+            if weight is None:
+                raise ValueError(f"Unknown search field {field!r}.")
+            for text in texts:
+                text = text.lower().strip()
+                if text:
+                    values.append(_Value(text, _SEPARATORS.split(text), weight))
+        values.sort(key=lambda value: -value.weight)
+        self._documents[key] = values
+        for char in {char for value in values for char in value.text}:
+            self._chars[char].add(key)
+        for trigram in set().union(*(trigrams(value.text) for value in values)):
+            self._trigrams[trigram].add(key)
+
+    def discard(self, key: str) -> None:
+        """Remove a document from the index if it is present."""
+        values = self._documents.pop(key, None)
+        if values is None:
+            return
+        for char in {char for value in values for char in value.text}:
+            self._chars[char].discard(key)
+        for trigram in set().union(*(trigrams(value.text) for value in values)):
+            self._trigrams[trigram].discard(key)
+
+    def clear(self) -> None:
+        """Remove all documents from the index."""
+        self._documents.clear()
+        self._chars.clear()
+        self._trigrams.clear()
+
+    def _candidates(self, term: str) -> t.Set[str]:
+        """Documents containing every character of a term, ignoring separators."""
+        chars = sorted(
+            (self._chars.get(char, set()) for char in set(_SEPARATORS.sub("", term))),
+            key=len,
+        )
+        return set.intersection(*chars) if chars else set()
+
+    def _fuzzy_candidates(self, term: str) -> t.Set[str]:
+        """Documents sharing enough trigrams with a term to be a typo of it."""
+        grams = trigrams(term)
+        hits: t.DefaultDict[str, int] = defaultdict(int)
+        for gram in grams:
+            for key in self._trigrams.get(gram, ()):
+                hits[key] += 1
+        required = math.ceil(len(grams) * FUZZY_RATIO)
+        return {key for key, n in hits.items() if n >= required}
+
+    def _score(self, term: str, values: t.List[_Value]) -> float:
+        """Score how well a term matches a document, 0 meaning it doesn't."""
+        compact = _SEPARATORS.sub("", term)
+        best = 0.0
+        for value in values:
+            if value.weight <= best:
+                # Values are sorted by weight so no later value can score higher
+                break
+            text = value.text
+            if term in text:
+                if text == term:
+                    score = 1.0
+                elif term in value.tokens:
+                    score = 0.9
+                elif text.startswith(term) or any(
+                    token.startswith(term) for token in value.tokens
+                ):
+                    score = 0.8
+                else:
+                    score = 0.6
+            elif len(compact) > 2 and is_subsequence(compact, text):
+                score = 0.4 * len(compact) / len(text)
+            else:
+                continue
+            best = max(best, score * value.weight)
+        return best
+
+    def _fuzzy_score(self, term: str, values: t.List[_Value]) -> float:
+        """Score how close a term is to a document's values by shared trigrams."""
+        grams = trigrams(term)
+        best = 0.0
+        for value in values:
+            ratio = len(grams & trigrams(value.text)) / len(grams)
+            if ratio >= FUZZY_RATIO:
+                best = max(best, 0.3 * ratio * value.weight)
+        return best
+
+    def search(self, query: str) -> t.List[t.Tuple[str, float]]:
+        """Find the documents matching every term of a query.
+
+        Args:
+            query (str): The search terms separated by whitespace.
+
+        Returns:
+            list: The matching keys and their scores, best matches first.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+        pool: t.Optional[t.Set[str]] = None
+        scores: t.Dict[str, float] = {}
+        for term in terms:
+            matches = self._match(term, self._candidates(term), pool, self._score)
+            if not matches and len(term) > 2:
+                matches = self._match(
+                    term, self._fuzzy_candidates(term), pool, self._fuzzy_score
+                )
+            for key, score in matches.items():
+                scores[key] = scores.get(key, 0.0) + score
+            pool = set(matches)
+        return sorted(
+            ((key, scores[key]) for key in t.cast(t.Set[str], pool)),
+            key=lambda match: -match[1],
+        )
+
+    def _match(
+        self,
+        term: str,
+        candidates: t.Set[str],
+        pool: t.Optional[t.Set[str]],
+        score: t.Callable[[str, t.List[_Value]], float],
+    ) -> t.Dict[str, float]:
+        """Score the candidates still matching the previous terms."""
+        if pool is not None:
+            candidates &= pool
+        matches = {}
+        for key in candidates:
+            value = score(term, self._documents[key])
+            if value > 0:
+                matches[key] = value
+        return matches
+
+
+def pipeline_fields(pipeline: M.PipelineSummary) -> t.Dict[str, t.List[str]]:
+    """The searchable fields of a pipeline."""
+    return {
+        "name": [pipeline.name],
+        "identifier": [pipeline.identifier],
+        "tags": [
+            text
+            for key, value in pipeline.tags.items()
+            for text in (f"{key}:{value}" if value else key, value)
+        ],
+        "stages": list(pipeline.stage_names),
+        "description": [pipeline.description],
+    }
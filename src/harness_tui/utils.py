@@ -1,21 +1,461 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import inspect
+import math
+import os
+import pickle
+import sys
+import threading
 import time
-from functools import lru_cache, wraps
+import typing as t
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
 
+import yaml
+from pydantic import BaseModel
 
-def ttl_cache(seconds: int):
-    """A decorator that caches the result of a function for a given time."""
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
+
+T = t.TypeVar("T")
+
+DATA_DIR = os.path.expanduser("~/.harness-tui")
+"""The root directory for locally cached data."""
+
+CACHES: t.Dict[str, "TTLCache"] = {}
+"""Every cache created by `ttl_cache`, keyed by namespace. Used for reporting."""
+
+FLIGHTS: t.Dict[str, "SingleFlight"] = {}
+"""Every in-flight call coalescer created by `ttl_cache`, keyed by namespace."""
+
+
+def data_dir(account: str, org: str, project: str) -> Path:
+    """Get the directory for locally cached data of a project, creating it if needed."""
+    d = Path(DATA_DIR) / account / org / project
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def approximate_size(obj: t.Any) -> int:
+    """Estimate the memory footprint of a cached value in bytes.
+
+    Pydantic models are measured by their serialized JSON size which is cheap to compute
+    and scales with the payload, containers are measured recursively.
+    """
+    if isinstance(obj, BaseModel):
+        return len(obj.__pydantic_serializer__.to_json(obj))
+    elif isinstance(obj, (str, bytes)):
+        return len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(map(approximate_size, obj)) + sys.getsizeof(obj)
+    elif isinstance(obj, dict):
+        return sum(
+            approximate_size(k) + approximate_size(v) for k, v in obj.items()
+        ) + sys.getsizeof(obj)
+    return sys.getsizeof(obj)
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class _Entry(t.NamedTuple):
+    value: t.Any
+    expires_at: float
+    size: int
+
+
+class TTLCache:
+    """A thread-safe LRU cache with per-entry expiry, an entry limit and a byte budget.
+
+    Entries are fresh for `ttl` seconds. For a further `stale_ttl` seconds they are still
+    returned but flagged as stale so the caller can revalidate them in the background.
+    When either `maxsize` or `max_bytes` is exceeded the least recently used entries are
+    evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        *,
+        maxsize: int = 256,
+        max_bytes: t.Optional[int] = None,
+        stale_ttl: float = 0.0,
+        sizeof: t.Callable[[t.Any], int] = approximate_size,
+        timer: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.sizeof = sizeof
+        self.timer = timer
+        self.stats = CacheStats()
+        self.nbytes = 0
+        self._entries: "OrderedDict[t.Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        return self.lookup(key, record=False)[0]
+
+    def lookup(
+        self, key: t.Hashable, record: bool = True
+    ) -> t.Tuple[bool, t.Any, bool]:
+        """Look up a key.
+
+        Returns:
+            A tuple of (found, value, stale).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record:
+                    self.stats.misses += 1
+                return False, None, False
+            age = self.timer() - entry.expires_at
+            if age > self.stale_ttl:
+                self._remove(key)
+                if record:
+                    self.stats.expirations += 1
+                    self.stats.misses += 1
+                return False, None, False
+            self._entries.move_to_end(key)
+            stale = age > 0
+            if record:
+                if stale:
+                    self.stats.stale_hits += 1
+                else:
+                    self.stats.hits += 1
+            return True, entry.value, stale
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        """Get a value if it is present and fresh."""
+        found, value, stale = self.lookup(key)
+        return value if found and not stale else default
+
+    def set(self, key: t.Hashable, value: t.Any) -> None:
+        """Store a value, evicting least recently used entries as needed."""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = _Entry(value, self.timer() + self.ttl, size)
+            self.nbytes += size
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def discard(self, key: t.Hashable) -> bool:
+        """Remove a key if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self.stats.invalidations += 1
+                return True
+            return False
+
+    def invalidate(
+        self, predicate: t.Optional[t.Callable[[t.Hashable], bool]] = None
+    ) -> int:
+        """Remove every entry whose key matches the predicate, or all entries."""
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._remove(key)
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.invalidate()
+
+    def info(self) -> t.Dict[str, t.Any]:
+        """Summarize the cache state and counters."""
+        return {**asdict(self.stats), "entries": len(self), "bytes": self.nbytes}
+
+    def _remove(self, key: t.Hashable) -> None:
+        self.nbytes -= self._entries.pop(key).size
+
+
+YAML_CACHE = TTLCache(math.inf, maxsize=64, max_bytes=32 * 1024 * 1024, sizeof=len)
+"""Parsed YAML documents, pickled and keyed by a hash of their text."""
+
+
+def load_yaml(text: str) -> t.Any:
+    """Safely parse a YAML document, with libyaml when it is available.
+
+    Results are shared through `YAML_CACHE` so the editor, the pipeline models and the
+    save path parse a given text once. Each call returns a fresh copy which the caller
+    may modify.
+
+    Raises:
+        yaml.YAMLError: If the text isn't valid YAML.
+    """
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    data = YAML_CACHE.get(key)
+    if data is None:
+        data = pickle.dumps(
+            yaml.load(text, Loader=YamlLoader), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        YAML_CACHE.set(key, data)
+    return pickle.loads(data)
+
+
+@dataclass
+class FlightStats:
+    """Counters describing how often calls were coalesced."""
+
+    calls: int = 0
+    """Calls which actually ran."""
+    coalesced: int = 0
+    """Calls which shared the result of a call already in flight."""
+    takeovers: int = 0
+    """Calls which had to run themselves because the call they joined was cancelled."""
+
+
+class _Flight(t.NamedTuple):
+    future: "concurrent.futures.Future[t.Any]"
+    loop_thread: t.Optional[int]
+    """The thread whose event loop runs the call, if it is async."""
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key so they share a single result.
+
+    The first caller for a key runs the function, callers arriving while it is in flight
+    wait for and share its result or exception. Sync and async callers can be mixed. If
+    an async call is cancelled, a waiting caller takes over and runs the function itself.
+    """
+
+    def __init__(self) -> None:
+        self.stats = FlightStats()
+        self._flights: t.Dict[t.Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _join(self, key: t.Hashable, is_async: bool) -> t.Tuple[_Flight, bool]:
+        with self._lock:
+            thread = threading.get_ident()
+            flight = self._flights.get(key)
+            # A sync call on the thread running an async call for the same key would
+            # block the event loop the async call needs, so it runs independently
+            if flight is not None and (is_async or flight.loop_thread != thread):
+                self.stats.coalesced += 1
+                return flight, False
+            flight = _Flight(concurrent.futures.Future(), thread if is_async else None)
+            if key not in self._flights:
+                self._flights[key] = flight
+            self.stats.calls += 1
+            return flight, True
+
+    def _land(self, key: t.Hashable, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def do(self, key: t.Hashable, func: t.Callable[..., T], *args, **kwargs) -> T:
+        """Call `func`, or wait for the call already in flight for `key`."""
+        while True:
+            flight, leader = self._join(key, is_async=False)
+            if leader:
+                try:
+                    value = func(*args, **kwargs)
+                except BaseException as e:
+                    self._land(key, flight)
+                    flight.future.set_exception(e)
+                    raise
+                self._land(key, flight)
+                flight.future.set_result(value)
+                return value
+            try:
+                return flight.future.result()
+            except concurrent.futures.CancelledError:
+                with self._lock:
+                    self.stats.takeovers += 1
+
+    async def ado(
+        self, key: t.Hashable, func: t.Callable[..., t.Awaitable[T]], *args, **kwargs
+    ) -> T:
+        """Await `func`, or wait for the call already in flight for `key`."""
+        while True:
+            flight, leader = self._join(key, is_async=True)
+            if leader:
+                try:
+                    value = await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    self._land(key, flight)
+                    flight.future.cancel()
+                    raise
+                except BaseException as e:
+                    self._land(key, flight)
+                    flight.future.set_exception(e)
+                    raise
+                self._land(key, flight)
+                flight.future.set_result(value)
+                return value
+            try:
+                # Shielded so a cancelled follower doesn't cancel the shared call
+                return await asyncio.shield(asyncio.wrap_future(flight.future))
+            except asyncio.CancelledError:
+                if not flight.future.cancelled():
+                    raise
+                with self._lock:
+                    self.stats.takeovers += 1
+
+    def info(self) -> t.Dict[str, t.Any]:
+        """Summarize the counters and the number of calls in flight."""
+        return {**asdict(self.stats), "in_flight": len(self)}
+
+
+def cache_report() -> t.Dict[str, t.Dict[str, t.Any]]:
+    """Collect the counters of every `ttl_cache` namespace."""
+    return {
+        name: {**cache.info(), **FLIGHTS[name].info()} for name, cache in CACHES.items()
+    }
+
+
+def _cache_key(value: t.Any) -> t.Hashable:
+    """Objects exposing a `cache_key` are keyed by it so entries don't pin instances.
+
+    Lists, sets and dicts are converted to their hashable equivalents.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_cache_key, value))
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(map(_cache_key, value))
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _cache_key(v)) for k, v in value.items()))
+    return getattr(value, "cache_key", value)
+
+
+def ttl_cache(
+    seconds: float,
+    *,
+    maxsize: int = 256,
+    max_bytes: t.Optional[int] = None,
+    stale: float = 0.0,
+    namespace: t.Optional[str] = None,
+):
+    """A decorator that caches the result of a function for a given time.
+
+    The cache is bounded by `maxsize` entries and optionally `max_bytes`. If `stale` is
+    set, expired results are served for that many extra seconds while a refresh runs in
+    the background. Concurrent misses for the same arguments are coalesced so only one
+    call is made. Functions decorated with the same `namespace` share a cache and
+    coalescing, which lets sync and async variants of a method reuse each other's
+    results and in-flight calls. Coroutine functions are supported, in which case the
+    awaited result is cached.
+
+    The wrapper exposes the underlying `cache`, the `flight` used for coalescing and a
+    `cache_invalidate(*args)` function which drops every entry whose arguments start
+    with `args`.
+    """
 
     def decorator(func):
-        @lru_cache(maxsize=None)
-        def cached_func(*args, _ttl_time, **kwargs):
-            _ = _ttl_time
-            return func(*args, **kwargs)
+        name = namespace or f"{func.__module__}.{func.__qualname__}"
+        if name not in CACHES:
+            CACHES[name] = TTLCache(
+                seconds, maxsize=maxsize, max_bytes=max_bytes, stale_ttl=stale
+            )
+            FLIGHTS[name] = SingleFlight()
+        cache, flight = CACHES[name], FLIGHTS[name]
+        signature = inspect.signature(func)
+        refreshing: t.Set[t.Hashable] = set()
+        tasks: t.Set[asyncio.Task] = set()
+
+        def make_key(args, kwargs) -> t.Tuple[t.Hashable, ...]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(map(_cache_key, bound.arguments.values()))
+
+        def cache_invalidate(*args: t.Any) -> int:
+            prefix = tuple(map(_cache_key, args))
+            return cache.invalidate(lambda key: key[: len(prefix)] == prefix)
+
+        if inspect.iscoroutinefunction(func):
+
+            async def aload(key, args, kwargs):
+                value = await func(*args, **kwargs)
+                cache.set(key, value)
+                return value
+
+            async def arefresh(key, args, kwargs):
+                try:
+                    await flight.ado(key, aload, key, args, kwargs)
+                except Exception:
+                    pass
+                finally:
+                    refreshing.discard(key)
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                found, value, is_stale = cache.lookup(key)
+                if found:
+                    if is_stale and key not in refreshing:
+                        refreshing.add(key)
+                        task = asyncio.ensure_future(arefresh(key, args, kwargs))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    return value
+                return await flight.ado(key, aload, key, args, kwargs)
+
+            async_wrapper.cache = cache  # type: ignore
+            async_wrapper.flight = flight  # type: ignore
+            async_wrapper.cache_invalidate = cache_invalidate  # type: ignore
+            return async_wrapper
+
+        def load(key, args, kwargs):
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+
+        def refresh(key, args, kwargs):
+            try:
+                flight.do(key, load, key, args, kwargs)
+            except Exception:
+                pass
+            finally:
+                refreshing.discard(key)
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            _ttl_time = round(time.time() / seconds)
-            return cached_func(*args, _ttl_time=_ttl_time, **kwargs)
+            key = make_key(args, kwargs)
+            found, value, is_stale = cache.lookup(key)
+            if found:
+                if is_stale and key not in refreshing:
+                    refreshing.add(key)
+                    threading.Thread(
+                        target=refresh, args=(key, args, kwargs), daemon=True
+                    ).start()
+                return value
+            return flight.do(key, load, key, args, kwargs)
 
+        wrapper.cache = cache  # type: ignore
+        wrapper.flight = flight  # type: ignore
+        wrapper.cache_invalidate = cache_invalidate  # type: ignore
         return wrapper
 
     return decorator
@@ -3,19 +3,19 @@
 from __future__ import annotations
 
 import random
-import typing as t
-from pathlib import Path
 
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
-from langchain_community.document_loaders import TextLoader
 from langchain_community.embeddings import OllamaEmbeddings
 from langchain_community.llms import Ollama
 from langchain_community.vectorstores import LanceDB
+from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_openai.llms import OpenAI
 
+from harness_tui.log_store import LogStore
+
 try:
     EMBEDDINGS = OpenAIEmbeddings()
 except Exception:
@@ -43,31 +43,28 @@ FILTERED_STEPS = [
 ]
 
 SAMPLE_SIZE = 100
-"""The number of log files to sample when loading the logs."""
+"""The number of logs to sample when loading the logs."""
 
 
-def predicate(path: Path) -> bool:
-    return not any(step.lower() in path.stem.lower() for step in FILTERED_STEPS)
+def predicate(log_key: str) -> bool:
+    return not any(step.lower() in log_key.lower() for step in FILTERED_STEPS)
 
 
 class LogAgent:
     """A simple agent for answering questions based on log files."""
 
-    def __init__(self, directory: t.Union[str, Path]):
-        self.directory = Path(directory)
+    def __init__(self, store: LogStore):
+        self.store = store
         self.responder = None
 
     def load(self):
-        """Load the logs from the provided directory and return a responder."""
-        documents = []
-        paths = list(filter(predicate, Path(self.directory).rglob("*.log")))
-        random.shuffle(paths)
-        sample_size = min(SAMPLE_SIZE, len(paths))
-        if paths:
-            for path in paths[:sample_size]:
-                loader = TextLoader(path)
-                docs = loader.load()
-                documents.extend(docs)
+        """Load the logs from the provided store and return a responder."""
+        keys = list(filter(predicate, self.store.keys()))
+        random.shuffle(keys)
+        documents = [
+            Document(page_content=content, metadata={"source": log_key})
+            for log_key, content in self.store.items(keys[:SAMPLE_SIZE])
+        ]
         vector = LanceDB.from_documents(documents, EMBEDDINGS)
         retriever = vector.as_retriever()
         self.responder = create_retrieval_chain(retriever, CHAIN)
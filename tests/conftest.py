@@ -0,0 +1,102 @@
+"""Builders of the API payloads and models the tests share."""
+
+import harness_tui.models as M
+
+START_TS = 1716926400000
+
+
+def pipeline_payload(i, updated=0):
+    """A pipeline as listed by the API."""
+    return {
+        "name": f"pipeline {i}",
+        "identifier": f"pipeline_{i}",
+        "numOfStages": 1,
+        "createdAt": 0,
+        "lastUpdatedAt": updated,
+        "modules": [],
+        "executionSummaryInfo": {"numOfErrors": [], "deployments": []},
+        "filters": {},
+        "stageNames": [],
+        "entityValidityDetails": {},
+    }
+
+
+def make_pipeline(i, updated=0):
+    return M.PipelineSummary.model_validate(pipeline_payload(i, updated))
+
+
+def summary_payload(run_sequence=1, status="Success", plan_execution_id=None):
+    """An execution of the `build` pipeline as summarized by the API."""
+    return {
+        "pipelineIdentifier": "build",
+        "orgIdentifier": "org",
+        "projectIdentifier": "project",
+        "planExecutionId": plan_execution_id or f"plan-{run_sequence}",
+        "name": "build",
+        "status": status,
+        "executionTriggerInfo": {
+            "triggerType": "MANUAL",
+            "triggeredBy": {
+                "uuid": "user",
+                "identifier": "user",
+                "extraInfo": {},
+                "triggerIdentifier": "",
+                "triggerName": "",
+            },
+            "isRerun": False,
+        },
+        "modules": [],
+        "startingNodeId": "root",
+        "startTs": START_TS + run_sequence * 1000,
+        "createdAt": 0,
+        "runSequence": run_sequence,
+        "executionMode": "NORMAL",
+    }
+
+
+def make_execution_summary(run_sequence=1, status="Success"):
+    return M.PipelineExecutionSummary.model_validate(
+        summary_payload(run_sequence, status)
+    )
+
+
+def node_payload(uuid, base_fqn=None, status="Success", **fields):
+    """A node of an execution graph, a step of the `build` stage by default."""
+    return {
+        "uuid": uuid,
+        "setupId": uuid,
+        "name": uuid,
+        "identifier": uuid,
+        "baseFqn": base_fqn or f"pipeline.stages.build.{uuid}",
+        "stepType": "Run",
+        "status": status,
+        "startTs": START_TS,
+        "logBaseKey": f"acct/{uuid}",
+        **fields,
+    }
+
+
+def execution_payload(
+    statuses=None, plan_execution_id=None, run_sequence=1, status="Running", **fields
+):
+    """The details of an execution with a step per entry of `statuses`.
+
+    Args:
+        statuses (dict): The status of each step by its uuid.
+        fields: Extra fields of every step.
+    """
+    nodes = {"root": node_payload("root", "pipeline", "Running")}
+    for step, step_status in (statuses or {}).items():
+        nodes[step] = node_payload(step, status=step_status, **fields)
+    return {
+        "pipelineExecutionSummary": summary_payload(
+            run_sequence, status, plan_execution_id
+        ),
+        "executionGraph": {"rootNodeId": "root", "nodeMap": nodes},
+    }
+
+
+def make_execution(statuses=None, plan_execution_id="plan"):
+    return M.CompactPipelineExecution.model_validate(
+        execution_payload(statuses, plan_execution_id)
+    )
@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from textual.widgets import ListView
+
+import harness_tui.app as app_module
+from harness_tui.api import HarnessClient
+from harness_tui.api.pipeline import Page
+from harness_tui.app import HarnessTui
+from harness_tui.components import ExecutionsView, yaml_editor
+
+from conftest import make_execution_summary, make_pipeline
+
+
+class FakePipelines:
+    """Serves a single page of pipelines and records the details fetched.
+
+    Loading more executions waits until `more` is set.
+    """
+
+    def __init__(self, count):
+        self.pipelines = [make_pipeline(i) for i in range(count)]
+        self.fetched = []
+        self.executions = {}
+        self.more = asyncio.Event()
+
+    async def aiter_pages(self):
+        yield Page(self.pipelines, 0, 1, len(self.pipelines))
+
+    def reference(self, identifier):
+        def history():
+            executions = self.executions.get(identifier, [])
+            return SimpleNamespace(exhausted=True, executions=list(executions))
+
+        async def arefresh_executions(size):
+            self.fetched.append(("executions", identifier))
+            return history().executions
+
+        async def aload_more_executions(size):
+            self.fetched.append(("more", identifier))
+            await self.more.wait()
+
+        async def aget():
+            self.fetched.append(("yaml", identifier))
+            return SimpleNamespace(pipeline_yaml="pipeline: {}")
+
+        return SimpleNamespace(
+            arefresh_executions=arefresh_executions,
+            aload_more_executions=aload_more_executions,
+            aget=aget,
+            history=history,
+        )
+
+
+class FakeClient:
+    account, org, project = "account", "org", "project"
+
+    def __init__(self, count):
+        self.pipelines = FakePipelines(count)
+
+    async def aclose(self):
+        pass
+
+
+def _offline_validator():
+    raise LookupError("offline")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient(10)
+    monkeypatch.setattr(HarnessClient, "default", classmethod(lambda cls: client))
+    monkeypatch.setattr(yaml_editor, "pipeline_validator", _offline_validator)
+    monkeypatch.setattr(app_module, "HIGHLIGHT_DELAY", 1.0)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_rapid_highlights_fetch_the_settled_pipeline_once(client):
+    app = HarnessTui()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        list_view = app.query_one("#pipeline-list", ListView)
+        assert len(list_view.children) == 10
+        app.action_focus_pipelines()
+        for _ in range(4):
+            await pilot.press("down")
+        await pilot.pause(1.5)
+        assert list_view.index == 4
+        assert client.pipelines.fetched == [
+            ("executions", "pipeline_4"),
+            ("yaml", "pipeline_4"),
+        ]
+        assert app.request_stats["debounced"] == 4
+
+
+def _run_sequences(app):
+    return [e.run_sequence for e in app.query_one(ExecutionsView).executions]
+
+
+@pytest.mark.asyncio
+async def test_new_executions_of_the_selected_pipeline_are_prepended(
+    client, monkeypatch
+):
+    monkeypatch.setattr(app_module, "EXECUTIONS_REFRESH_INTERVAL", 0.2)
+    client.pipelines.executions["pipeline_0"] = [make_execution_summary(1)]
+    app = HarnessTui()
+    async with app.run_test() as pilot:
+        await pilot.pause(1.5)
+        assert app.selected_pipeline == "pipeline_0"
+        assert _run_sequences(app) == [1]
+
+        client.pipelines.executions["pipeline_0"] = [
+            make_execution_summary(2, "Running"),
+            make_execution_summary(1),
+        ]
+        await pilot.pause(0.5)
+        assert _run_sequences(app) == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_switching_pipelines_drops_older_executions_being_loaded(client):
+    client.pipelines.executions["pipeline_0"] = [make_execution_summary(1)]
+    client.pipelines.executions["pipeline_1"] = [make_execution_summary(7)]
+    app = HarnessTui()
+    async with app.run_test() as pilot:
+        await pilot.pause(1.5)
+        worker = app.load_more_executions("pipeline_0")
+        await pilot.pause()
+        assert ("more", "pipeline_0") in client.pipelines.fetched
+
+        app.action_focus_pipelines()
+        await pilot.press("down")
+        await pilot.pause(1.5)
+        assert worker.is_cancelled
+        client.pipelines.more.set()
+        await pilot.pause()
+        assert app.selected_pipeline == "pipeline_1"
+        assert _run_sequences(app) == [7]
@@ -0,0 +1,47 @@
+import pytest
+
+from harness_tui.api.decoder import DECODERS, _configured, get_decoder
+
+LINE = b'{"level":"info","pos":3,"out":"hello\\n","time":"t","args":{"a":1}}'
+
+
+def _installed():
+    decoders = []
+    for name in DECODERS:
+        try:
+            decoders.append(get_decoder(name))
+        except ImportError:
+            continue
+    return decoders
+
+
+@pytest.mark.parametrize("decoder", _installed(), ids=lambda decoder: decoder.name)
+def test_decoders_agree(decoder):
+    assert decoder.loads(b'{"data": [1, "a", null]}') == {"data": [1, "a", None]}
+    assert decoder.loads_log_line(LINE) == {
+        "level": "info",
+        "pos": 3,
+        "out": "hello\n",
+        "time": "t",
+    }
+    assert decoder.loads_log_line(b'{"out": "x"}') == {"out": "x"}
+    with pytest.raises(ValueError):
+        decoder.loads(b"{not json")
+    with pytest.raises(ValueError):
+        decoder.loads_log_line(b"")
+
+
+def test_fastest_decoder_is_default():
+    assert get_decoder().name == _installed()[0].name
+    with pytest.raises(KeyError):
+        get_decoder("simdjson")
+
+
+@pytest.mark.parametrize("name", ["simdjson", "ujson"])
+def test_unusable_configured_decoder_falls_back_to_the_fastest(monkeypatch, name):
+    monkeypatch.setitem(DECODERS, "ujson", lambda: __import__("not_installed"))
+    monkeypatch.setenv("HARNESS_TUI_JSON_DECODER", name)
+    with pytest.warns(RuntimeWarning, match=name):
+        assert _configured().name == get_decoder().name
+    monkeypatch.setenv("HARNESS_TUI_JSON_DECODER", "json")
+    assert _configured().name == "json"
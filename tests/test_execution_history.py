@@ -0,0 +1,65 @@
+import pytest
+from textual.app import App
+from textual.widgets import DataTable
+
+from harness_tui.components import ExecutionsView
+
+from conftest import make_execution_summary
+
+
+class ExecutionsApp(App):
+    def compose(self):
+        yield ExecutionsView()
+
+
+def _keys(table):
+    return [row.key.value for row in table.ordered_rows]
+
+
+@pytest.mark.asyncio
+async def test_refresh_updates_rows_in_place_and_keeps_the_cursor():
+    app = ExecutionsApp()
+    async with app.run_test() as pilot:
+        view = app.query_one(ExecutionsView)
+        table = view.query_one(DataTable)
+        view.executions = [
+            make_execution_summary(3, "Running"),
+            make_execution_summary(2),
+            make_execution_summary(1),
+        ]
+        await pilot.pause()
+        table.move_cursor(row=1, column=2)
+        await pilot.pause()
+
+        calls = []
+        for name in ("add_row", "update_cell", "remove_row", "clear"):
+            method = getattr(table, name)
+            setattr(
+                table,
+                name,
+                lambda *args, name=name, method=method, **kwargs: (
+                    calls.append((name, args[0])) or method(*args, **kwargs)
+                ),
+            )
+
+        view.executions = [
+            make_execution_summary(5, "Running"),
+            make_execution_summary(4),
+            make_execution_summary(3, "Failed"),
+            make_execution_summary(2),
+        ]
+        await pilot.pause()
+        assert _keys(table) == ["plan-5", "plan-4", "plan-3", "plan-2"]
+        # Only the new rows are added, the removed row removed and the changed
+        # status updated
+        assert sorted(name for name, _ in calls) == [
+            "add_row",
+            "add_row",
+            "remove_row",
+            "update_cell",
+        ]
+        assert ("update_cell", "plan-3") in calls and ("remove_row", "plan-1") in calls
+        assert table.get_cell("plan-3", "status").plain == "Failed"
+        # The cursor stays on the execution it was on
+        assert table.coordinate_to_cell_key(table.cursor_coordinate).row_key == "plan-2"
+        assert table.cursor_coordinate.column == 2
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from harness_tui.log_index import LogIndex
+
+
+def _add(index, key, content, pipeline, status="Success", day=1):
+    index.add(
+        key,
+        content,
+        pipeline=pipeline,
+        execution=f"{pipeline}-{day}",
+        run_sequence=day,
+        stage="build",
+        step=key.rsplit("/", 1)[-1],
+        status=status,
+        started_at=datetime(2024, 5, day, tzinfo=timezone.utc),
+    )
+
+
+def test_log_index_ranks_filters_and_replaces(tmp_path):
+    index = LogIndex(tmp_path / "logs.db")
+    _add(
+        index, "a/compile", "error: connection refused (os error 111)", "api", "Failed"
+    )
+    _add(index, "b/compile", "compiled 12 files", "web")
+    _add(index, "c/test", "retrying: connection refused", "web", "Failed", day=2)
+    assert len(index) == 3 and "a/compile" in index
+
+    matches = index.search("connection-refused (os")
+    assert [m.log_key for m in matches] == ["a/compile"]
+    assert matches[0].snippet == "error: »connection refused« (»os« error 111)"
+    assert str(matches[0]) == "api #1 build/compile [Failed] " + (
+        f"{matches[0].started_at.astimezone():%Y-%m-%d %H:%M}"
+    )
+
+    assert {m.pipeline for m in index.search("connection refused")} == {"api", "web"}
+    assert [m.pipeline for m in index.search("pipeline:web refused")] == ["web"]
+    assert index.search("status:success refused") == []
+    assert [m.log_key for m in index.search("fil*")] == ["b/compile"]
+
+    _add(index, "b/compile", "connection refused while compiling", "web")
+    assert len(index) == 3
+    assert len(index.search("status:success connection")) == 1
+    index.discard("b/compile")
+    assert index.search("compiling") == []
+    with pytest.raises(ValueError):
+        index.search("status:failed")
+    index.close()
+
+    # The index persists
+    assert len(LogIndex(tmp_path / "logs.db")) == 2
@@ -0,0 +1,64 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from harness_tui.log_search import LogColumns, LogQuery, level_code, parse_time
+
+
+def _record(level, second, pos):
+    return {"level": level, "pos": pos, "time": f"2024-05-28T20:00:{second:02d}.5Z"}
+
+
+def test_parse_time_and_levels():
+    assert parse_time("2024-05-28T20:00:37.637136016Z") == pytest.approx(
+        1716926437.637136
+    )
+    assert parse_time("2024-05-28T22:00:37+02:00") == 1716926437.0
+    assert math.isnan(parse_time("yesterday")) and math.isnan(parse_time(None))
+    assert level_code("WARNING") == level_code("warn") > level_code("info")
+    assert level_code("verbose") == 0
+
+
+def test_query_filters_lines_by_pattern_level_and_time():
+    lines = ["starting", "pulling image", "Connection refused", "retrying", "done"]
+    levels = ["info", "info", "error", "warn", "info"]
+    columns = LogColumns()
+    for i, level in enumerate(levels):
+        columns.append(*LogColumns.encode(_record(level, i * 10, i)))
+    start = columns.first_time()
+    assert start == parse_time("2024-05-28T20:00:00.5Z")
+
+    def search(text):
+        return list(LogQuery.parse(text, start).matches(lines, columns))
+
+    assert search("connection") == [2]
+    assert search("Connection|DONE") == [2]
+    assert search("connection|done") == [2, 4]
+    # Invalid expressions are searched for literally
+    assert search("refused (") == []
+    assert search("level:warn") == [2, 3]
+    assert search("level:error refused") == [2]
+    after = datetime.fromtimestamp(start + 15).strftime("%H:%M:%S")
+    assert search(f"after:{after}") == [2, 3, 4]
+    assert search(f"after:{after} level:info ing") == [3]
+    assert LogQuery.parse("", start).empty
+    with pytest.raises(ValueError):
+        LogQuery.parse("level:loud")
+    with pytest.raises(ValueError):
+        LogQuery.parse("before:noon")
+
+
+def test_columns_pad_lines_without_records():
+    columns = LogColumns()
+    columns.append(*LogColumns.encode(None))
+    columns.pad(3)
+    columns.append(*LogColumns.encode(_record("error", 1, 7)))
+    assert len(columns) == 4
+    assert list(columns.levels) == [0, 0, 0, level_code("error")]
+    assert list(columns.positions) == [-1, -1, -1, 7]
+    lines = ["a", "b", "c", "d", "e"]
+    # Lines past the columns never match a level filter
+    assert list(LogQuery.parse("level:info").matches(lines, columns)) == [3]
+    columns.clear()
+    assert len(columns) == 0
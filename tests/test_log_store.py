@@ -0,0 +1,81 @@
+import gzip
+
+from harness_tui.log_store import Codec, LogStore, split_chunks
+
+
+def _log(run, lines=400):
+    install = "".join(f"Downloading package-{i}==1.{i}.0\n" for i in range(lines))
+    return install + f"run {run} finished\n"
+
+
+def test_log_store_deduplicates_and_reads_back(tmp_path):
+    store = LogStore(tmp_path, codec="gzip")
+    for run in range(10):
+        assert store.put(f"run/{run}", _log(run)) == []
+
+    assert len(store) == 10 and "run/3" in store
+    assert store.read("run/3") == _log(3)
+    assert store.open("run/4").readline() == "Downloading package-0==1.0.0\n"
+    assert store.read("missing") is None
+    stats = store.stats
+    # Only the tail of each log differs
+    assert stats.unique < stats.size / 2 and stats.ratio > 10
+    chunk = next((tmp_path / "chunks").glob("*/*"))
+    assert gzip.decompress(chunk.read_bytes())
+
+    store.put("run/3", "replaced")
+    assert store.read("run/3") == "replaced" and len(store) == 10
+    assert store.discard("run/3") and not store.discard("run/3")
+    store.close()
+
+    reopened = LogStore(tmp_path)
+    assert reopened.read("run/9") == _log(9)
+    assert reopened.nbytes == reopened.stats.stored
+
+
+def test_log_store_keeps_shared_chunks_when_a_log_is_stored_again(tmp_path):
+    store = LogStore(tmp_path, codec="gzip")
+    compressed = []
+    store.codec = Codec(
+        "gzip",
+        lambda data: compressed.append(data) or gzip.compress(data),
+        gzip.decompress,
+    )
+    growing = _log(0)
+    store.put("run/0", growing)
+    chunks = {path: path.stat().st_mtime_ns for path in tmp_path.glob("chunks/*/*")}
+    compressed.clear()
+
+    # A running step's log is stored again as it grows, only its tail is new
+    store.put("run/0", growing + "more output\n")
+    assert len(compressed) <= 2
+    assert store.read("run/0") == growing + "more output\n"
+    unchanged = [p for p, mtime in chunks.items() if p.exists()]
+    assert len(unchanged) >= len(chunks) - 1
+    assert all(p.stat().st_mtime_ns == chunks[p] for p in unchanged)
+
+    compressed.clear()
+    store.put("run/0", growing)
+    assert len(compressed) <= 1 and store.read("run/0") == growing
+    assert store.stats.chunks == len(split_chunks(growing.encode()))
+
+
+def test_log_store_evicts_oldest_logs_over_budget(tmp_path):
+    store = LogStore(tmp_path, max_bytes=2048, codec="gzip")
+    for run in range(5):
+        body = "".join(f"{run}-{i}-{i * run * 7919 % 10007}\n" for i in range(400))
+        evicted = store.put(f"run/{run}", body, stored_at=run)
+    assert evicted and "run/4" in store and "run/0" not in store
+    assert store.nbytes <= 2048 or len(store) == 1
+    assert store.stats.evictions >= 1
+    assert sorted(store.keys()) == sorted(key for key, _ in store.items())
+
+
+def test_split_chunks_is_stable_across_offsets():
+    body = "".join(f"line {i}\n" for i in range(5000)).encode()
+    shifted = b"a different first line\n" + body
+    assert b"".join(split_chunks(body)) == body
+    assert (
+        len(set(split_chunks(body)) & set(split_chunks(shifted)))
+        >= len(split_chunks(body)) - 2
+    )
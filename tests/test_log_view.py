@@ -0,0 +1,158 @@
+import asyncio
+import threading
+from array import array
+
+import pytest
+from textual import work
+from textual.app import App
+from textual.worker import get_current_worker
+from textual.widgets import Tree
+
+from harness_tui.components import BufferedLogWriter, LogTailer, LogView
+from harness_tui.log_search import LogQuery
+
+from conftest import make_execution
+
+
+class LogViewApp(App):
+    def compose(self):
+        yield LogView(id="logs-view")
+
+
+@pytest.mark.asyncio
+async def test_log_search_scans_lines_off_the_ui_thread(tmp_path, monkeypatch):
+    scanned_on = set()
+    matches = LogQuery.matches
+
+    def record_thread(self, *args, **kwargs):
+        scanned_on.add(threading.current_thread())
+        return matches(self, *args, **kwargs)
+
+    monkeypatch.setattr(LogQuery, "matches", record_thread)
+    monkeypatch.setattr(LogView, "SEARCH_CHUNK", 7)
+    app = LogViewApp()
+    async with app.run_test() as pilot:
+        view = app.query_one(LogView)
+        view.execution = make_execution({"compile": "Success"})
+        await pilot.pause()
+        log = view.query_one(LogTailer)
+        log.clear()
+        log.write_lines(
+            [f"line {i}" + (" error" if i % 10 == 3 else "") for i in range(50)]
+        )
+
+        await view.search_log("error").wait()
+        await pilot.pause()
+        assert list(view._matches) == [3, 13, 23, 33, 43]
+        assert log.match_line == 3
+        assert scanned_on and threading.main_thread() not in scanned_on
+
+        # Results of a search of lines which were since cleared are dropped
+        log.clear()
+        view._show_matches(log.generation - 1, array("q", [1, 2]))
+        assert list(view._matches) == [3, 13, 23, 33, 43]
+
+
+@pytest.mark.asyncio
+async def test_newer_execution_patches_the_tree_in_place():
+    app = LogViewApp()
+    async with app.run_test() as pilot:
+        view = app.query_one(LogView)
+        view.execution = make_execution({"compile": "Running", "test": "NotStarted"})
+        await pilot.pause()
+        tree = view.query_one(Tree)
+        view._groups["test"].collapse()
+        cursor = tree.cursor_node
+        await pilot.pause()
+
+        view.execution = make_execution(
+            {"compile": "Failed", "test": "Running", "deploy": "Running"}
+        )
+        await pilot.pause()
+        assert view.query_one(Tree) is tree
+        assert tree.cursor_node is cursor
+        assert not view._groups["test"].is_expanded
+        assert view._groups["compile"].is_expanded
+        assert str(view._tree_nodes["compile"].label) == "🔴 compile"
+        assert str(view._tree_nodes["test"].label) == "🟡 test"
+        assert view._tree_nodes["deploy"].data.status == "Running"
+
+        # Another execution rebuilds the tree
+        view.execution = make_execution(
+            {"compile": "Running"}, plan_execution_id="next"
+        )
+        await pilot.pause()
+        assert view.query_one(Tree) is not tree
+
+
+class LogTailerApp(App):
+    def compose(self):
+        yield LogTailer(id="log-tailer")
+
+
+@pytest.mark.asyncio
+async def test_buffered_writer_flushes_at_most_max_batch_lines_per_frame():
+    app = LogTailerApp()
+    async with app.run_test() as pilot:
+        log = app.query_one(LogTailer)
+        batches = []
+        write_records = log.write_records
+
+        def record_batch(records):
+            batches.append(len(records))
+            return write_records(records)
+
+        log.write_records = record_batch
+        writer = BufferedLogWriter(log, fps=20, max_batch=10, max_pending=15)
+
+        def produce():
+            with writer:
+                for i in range(35):
+                    writer.write(f"line {i}", {"level": "info", "pos": i})
+
+        await asyncio.to_thread(produce)
+        await pilot.pause()
+        assert sum(batches) == 35 and max(batches) == 10
+        assert len(batches) < 35
+        assert writer.stats.lines == 35 and writer.stats.batches == len(batches)
+        # The producer waited while 15 lines were queued
+        assert writer.stats.blocked > 0
+        assert list(log.lines) == [f"line {i}" for i in range(35)]
+        assert list(log.columns.positions) == list(range(35))
+
+
+class StreamingLogViewApp(LogViewApp):
+    @work(group="log_view_ui", thread=True)
+    def stream(self, log, writer, done):
+        worker = get_current_worker()
+        with writer:
+            for i in range(10_000):
+                if worker.is_cancelled:
+                    break
+                writer.write(f"line {i}", {"level": "info", "pos": i})
+        done.set()
+
+
+@pytest.mark.asyncio
+async def test_recomposing_the_log_view_stops_a_stream_in_progress():
+    app = StreamingLogViewApp()
+    async with app.run_test() as pilot:
+        view = app.query_one(LogView)
+        view.execution = make_execution({"compile": "Success"})
+        await pilot.pause()
+        log = view.query_one(LogTailer)
+        # The producer fills the queue and waits for the log to catch up
+        writer = BufferedLogWriter(log, fps=1, max_batch=1, max_pending=5)
+        done = threading.Event()
+        worker = app.stream(log, writer, done)
+        await pilot.pause(0.2)
+        assert log.writer is writer and not done.is_set()
+
+        view.execution = make_execution(
+            {"compile": "Success"}, plan_execution_id="next"
+        )
+        await pilot.pause()
+        assert view.query_one(LogTailer) is not log
+        assert await asyncio.to_thread(done.wait, 5)
+        assert worker.is_cancelled
+        assert writer.stats.lines < 10_000
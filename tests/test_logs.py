@@ -0,0 +1,93 @@
+import asyncio
+import io
+import json
+
+import httpx
+import requests
+import requests.adapters
+
+from harness_tui.api.logs import LogClient
+
+BLOB = b"".join(
+    json.dumps({"pos": i, "out": f"line {i}\n"}).encode() + b"\n" for i in range(5)
+)
+
+
+def _respond(range_header, honor_range, blob):
+    if range_header and honor_range:
+        start = int(range_header[len("bytes=") : -1])
+        return 206, blob[start:]
+    return 200, blob
+
+
+class _Adapter(requests.adapters.BaseAdapter):
+    def __init__(self, honor_range, blob):
+        super().__init__()
+        self.honor_range = honor_range
+        self.blob = blob
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        if request.path_url.startswith("/gateway/log-service/token"):
+            response.status_code, body = 200, b"token"
+        else:
+            response.status_code, body = _respond(
+                request.headers.get("Range"), self.honor_range, self.blob
+            )
+        response.raw = io.BytesIO(body)
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def _client(honor_range, blob=BLOB):
+    session = requests.Session()
+    session.mount("https://", _Adapter(honor_range, blob))
+
+    def handler(request):
+        if request.url.path.endswith("/token"):
+            return httpx.Response(200, text="token")
+        status, body = _respond(request.headers.get("Range"), honor_range, blob)
+        return httpx.Response(status, content=body)
+
+    return LogClient(
+        session,
+        account=f"account-{honor_range}",
+        org="org",
+        project="project",
+        async_session=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+async def _collect(iterator):
+    return [payload async for payload in iterator]
+
+
+def test_blob_streams_and_resumes_from_an_offset_or_position():
+    offset = len(BLOB.splitlines(keepends=True)[0]) * 2
+    for honor_range in (True, False):
+        client = _client(honor_range)
+        assert [p["pos"] for p in client.blob("key")] == [0, 1, 2, 3, 4]
+        assert [p["pos"] for p in client.blob("key", start=offset)] == [2, 3, 4]
+        assert [p["pos"] for p in client.blob("key", pos=3)] == [3, 4]
+        payloads = asyncio.run(_collect(client.ablob("key", start=offset, pos=3)))
+        assert [p["pos"] for p in payloads] == [3, 4]
+        assert len(asyncio.run(_collect(client.ablob("key")))) == 5
+
+
+def test_blob_resumes_crlf_lines_from_a_server_which_ignores_the_range():
+    lines = [
+        json.dumps({"pos": i, "out": "x" * i}).encode() + b"\r\n" for i in range(4)
+    ]
+    # The last line hasn't been terminated yet
+    blob = b"".join(lines) + json.dumps({"pos": 4, "out": ""}).encode()
+    offset = len(lines[0]) + len(lines[1])
+    client = _client(False, blob)
+    assert [p["pos"] for p in client.blob("key")] == [0, 1, 2, 3, 4]
+    assert [p["pos"] for p in client.blob("key", start=offset)] == [2, 3, 4]
+    payloads = asyncio.run(_collect(client.ablob("key", start=offset)))
+    assert [p["pos"] for p in payloads] == [2, 3, 4]
+    offset += len(lines[2]) + len(lines[3])
+    assert [p["pos"] for p in client.blob("key", start=offset)] == [4]
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import requests
+
+from harness_tui.api.mixin import ClientMixin
+
+
+class _Client(ClientMixin):
+    BASE_URL = "https://app.harness.io/api/"
+
+    def __init__(self, handler=None):
+        self.session = requests.Session()
+        if handler is not None:
+            self.async_session = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+
+
+def _echo(request):
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"message": "not found"})
+    return httpx.Response(
+        200,
+        json={
+            "method": request.method,
+            "url": str(request.url.copy_with(query=None)),
+            "params": dict(request.url.params),
+            "headers": {k: v for k, v in request.headers.items() if k.startswith("x-")},
+            "body": request.content.decode(),
+            "content_type": request.headers.get("content-type"),
+        },
+    )
+
+
+def test_async_requests_translate_requests_arguments():
+    client = _Client(_echo)
+
+    async def run():
+        return await asyncio.gather(
+            client.aget("pipelines", params={"page": 1}, headers={"X-Trace": "1"}),
+            client.apost("pipelines/list", json={"a": 1}, stream=True),
+            client.aput(
+                "pipelines/v2/build",
+                data="pipeline: {}",
+                headers={"Content-Type": "application/yaml"},
+            ),
+            client.adelete("https://app.harness.io/v1/pipelines/build"),
+            client._arequest("GET", "pipelines", parse_json=False),
+        )
+
+    get, post, put, delete, raw = asyncio.run(run())
+    assert get["method"] == "GET"
+    assert get["url"] == "https://app.harness.io/api/pipelines"
+    assert get["params"] == {"page": "1"} and get["headers"] == {"x-trace": "1"}
+    assert json.loads(post["body"]) == {"a": 1}
+    assert put["body"] == "pipeline: {}"
+    assert put["content_type"] == "application/yaml"
+    assert delete["url"] == "https://app.harness.io/v1/pipelines/build"
+    assert isinstance(raw, httpx.Response) and raw.json()["method"] == "GET"
+
+
+def test_async_requests_raise_on_error_status_or_without_a_session():
+    with pytest.raises(httpx.HTTPStatusError) as e:
+        asyncio.run(_Client(_echo).aget("missing"))
+    assert e.value.response.status_code == 404
+    with pytest.raises(RuntimeError):
+        asyncio.run(_Client().aget("pipelines"))
+
+
+def test_async_stream_yields_the_unread_response():
+    async def chunks():
+        yield b"first\nsec"
+        yield b"ond\n"
+
+    def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=chunks())
+
+    client = _Client(handler)
+
+    async def read(path):
+        async with client._astream("GET", path, stream=True) as response:
+            assert not response.is_stream_consumed
+            return [line async for line in response.aiter_lines()]
+
+    assert asyncio.run(read("blob")) == ["first", "second"]
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(read("missing"))
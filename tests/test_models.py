@@ -0,0 +1,34 @@
+import harness_tui.models as M
+
+from conftest import execution_payload
+
+
+PAYLOAD = execution_payload(
+    {"a": "Success", "b": "Running"},
+    outcomes={"output": {"outputVariables": {"A": "1"}}},
+    stepParameters=None,
+    nodeRunInfo={"whenCondition": "true", "evaluatedCondition": True},
+    delegateInfoList=[{"id": "delegate"}],
+)
+
+
+def test_compact_execution_matches_full_execution():
+    full = M.PipelineExecution.model_validate(PAYLOAD)
+    compact = M.CompactPipelineExecution.model_validate(PAYLOAD)
+    assert isinstance(compact, M.PipelineExecution)
+    assert compact.node_statuses == full.node_statuses
+    for uuid, node in compact.execution_graph.node_map.items():
+        expected = full.execution_graph.node_map[uuid]
+        assert isinstance(node, M.CompactExecutionGraphNode)
+        assert node._full is None
+        for field in ("name", "base_fqn", "status", "start_ts", "log_base_key"):
+            assert getattr(node, field) == getattr(expected, field)
+        # Heavy fields are validated on first access
+        assert node.outcomes == expected.outcomes
+        assert node.step_parameters == {}
+        assert node.node_run_info == expected.node_run_info
+        assert node.full == expected
+    assert (
+        compact.model_dump(by_alias=True)["executionGraph"]["nodeMap"]
+        == PAYLOAD["executionGraph"]["nodeMap"]
+    )
@@ -0,0 +1,336 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from harness_tui.api.pipeline import (
+    HISTORY_MAX_PIPELINES,
+    INCREMENTAL_PAGE_SIZE,
+    ExecutionHistory,
+    PipelineClient,
+)
+from harness_tui.api.store import ExecutionStore
+
+from conftest import execution_payload, pipeline_payload, summary_payload
+
+_accounts = itertools.count()
+
+
+def _client(handler=None):
+    """A client with a unique scope so tests don't share cached responses."""
+    async_session = None
+    if handler is not None:
+        async_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PipelineClient(
+        requests.Session(),
+        account=f"account-{next(_accounts)}",
+        org="org",
+        project="project",
+        async_session=async_session,
+    )
+
+
+def test_execution_details_are_shared_between_references():
+    requests_made = []
+
+    async def handler(request):
+        requests_made.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"data": execution_payload(status="Success")})
+
+    client = _client(handler)
+
+    async def fetch():
+        return await asyncio.gather(
+            client.reference("build").aexecution_details("plan-1"),
+            client.reference("<none>").aexecution_details("plan-1"),
+        )
+
+    ui, scraper = asyncio.run(fetch())
+    assert ui == scraper
+    assert requests_made == ["/pipeline/api/pipelines/execution/v2/plan-1"]
+    assert client.reference("other").execution_details("plan-1") == ui
+    assert len(requests_made) == 1
+
+
+class FakeExecutions:
+    """Serves pages of an execution history, newest first, like the summary endpoint."""
+
+    def __init__(self, count, running=()):
+        self.statuses = {
+            seq: "Running" if seq in running else "Success"
+            for seq in range(1, count + 1)
+        }
+        self.pages = []
+
+    def __call__(self, method, path, params, **kwargs):
+        page, size = params["page"], params["size"]
+        self.pages.append((page, size))
+        newest = sorted(self.statuses, reverse=True)
+        content = [
+            summary_payload(seq, self.statuses[seq])
+            for seq in newest[page * size : (page + 1) * size]
+        ]
+        return {
+            "data": {
+                "content": content,
+                "totalPages": -(-len(newest) // size),
+                "totalItems": len(newest),
+            }
+        }
+
+
+def _sequences(executions):
+    return [e.run_sequence for e in executions]
+
+
+def test_execution_history_refresh_boundary_and_ingest():
+    history = ExecutionHistory()
+    assert history.refresh_boundary == -1
+    data = FakeExecutions(30, running={28})(None, None, {"page": 0, "size": 10})
+    assert not history.ingest(data["data"], 0)
+    assert len(history) == 10 and not history.exhausted
+    # The running execution and everything newer is fetched again
+    assert history.refresh_boundary == 27
+    assert history.refresh_page_size(25) == INCREMENTAL_PAGE_SIZE
+
+    older = FakeExecutions(30)(None, None, {"page": 2, "size": 10})["data"]
+    assert _sequences(history.ingest_older(older, 2)) == list(range(10, 0, -1))
+    assert history.exhausted
+
+
+def test_execution_history_revalidates_running_executions_which_changed():
+    history = ExecutionHistory()
+    running, finished = summary_payload(2, "Running"), summary_payload(1)
+    history.ingest({"content": [running, finished]}, 0)
+    held = {e.run_sequence: e for e in history.executions}
+
+    # Unchanged payloads are not validated again
+    history.ingest({"content": [dict(running), dict(finished)]}, 0)
+    assert all(a is b for a, b in zip(history.executions, [held[2], held[1]]))
+
+    # A running execution is replaced when anything changed, not just its status
+    history.ingest({"content": [{**running, "endTs": 1716926500000}, finished]}, 0)
+    latest = history.executions[0]
+    assert latest is not held[2] and latest.end_ts is not None
+    assert history.executions[1] is held[1]
+
+    history.ingest({"content": [{**running, "status": "Success"}, finished]}, 0)
+    assert history.executions[0].is_terminal and not history._running
+
+
+def test_refresh_executions_merges_new_executions_and_status_changes():
+    client = _client()
+    client._request = server = FakeExecutions(60, running={59})
+    ref = client.reference("build")
+
+    assert _sequences(ref.refresh_executions(size=25)) == list(range(60, 35, -1))
+    assert server.pages == [(0, 25)]
+    # Served locally while the history is fresh
+    ref.refresh_executions(size=25)
+    assert server.pages == [(0, 25)]
+
+    server.statuses.update({61: "Success", 62: "Running", 59: "Success"})
+    executions = ref.refresh_executions(size=25, force=True)
+    assert server.pages == [(0, 25), (0, INCREMENTAL_PAGE_SIZE)]
+    assert _sequences(executions) == list(range(62, 35, -1))
+    statuses = {e.run_sequence: e.status for e in executions}
+    assert statuses[59] == "Success" and statuses[62] == "Running"
+
+
+def test_load_more_executions_has_no_gaps_or_duplicates():
+    client = _client()
+    client._request = server = FakeExecutions(60)
+    ref = client.reference("build")
+    ref.refresh_executions(size=25)
+    server.statuses.update({61: "Success", 62: "Success"})
+    ref.refresh_executions(size=25, force=True)
+
+    older = ref.load_more_executions(size=25)
+    assert _sequences(older) == list(range(35, 12, -1))
+    assert not ref.history().exhausted
+    older = ref.load_more_executions(size=25)
+    assert _sequences(older) == list(range(12, 0, -1))
+    assert ref.history().exhausted
+    assert ref.load_more_executions(size=25) == []
+    assert _sequences(ref.history().executions) == list(range(62, 0, -1))
+
+
+def test_histories_are_bounded():
+    client = _client()
+    first = client.history("pipeline-0")
+    assert client.history("pipeline-0") is first
+    for i in range(1, HISTORY_MAX_PIPELINES + 1):
+        client.history(f"pipeline-{i}")
+    assert len(client._histories) == HISTORY_MAX_PIPELINES
+    assert client.history("pipeline-0") is not first
+
+
+def test_async_execution_details_use_the_store_off_the_event_loop(tmp_path):
+    store = ExecutionStore(tmp_path)
+    threads = []
+    get, put = store.get, store.put
+    store.get = lambda *args: threads.append(threading.current_thread()) or get(*args)
+    store.put = lambda *args: threads.append(threading.current_thread()) or put(*args)
+    requests_made = []
+
+    def handler(request):
+        requests_made.append(request.url.path)
+        return httpx.Response(200, json={"data": execution_payload(status="Success")})
+
+    for _ in range(2):
+        client = _client(handler)
+        client.store = store
+        details = asyncio.run(client.aexecution_details("plan-1"))
+        assert details.pipeline_execution_summary.run_sequence == 1
+    assert len(requests_made) == 1
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+class PipelineServer:
+    """Serves pages of pipelines, earlier pages slower, and tracks concurrency."""
+
+    def __init__(self, count, total_pages=None, fail_page=None):
+        self.count = count
+        self.total_pages = total_pages
+        self.fail_page = fail_page
+        self.requested = []
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def page(self, page, size):
+        if page == self.fail_page:
+            raise requests.HTTPError("boom")
+        content = [pipeline_payload(i) for i in range(self.count)][
+            page * size : (page + 1) * size
+        ]
+        total_pages = self.total_pages or -(-self.count // size)
+        return {"data": {"content": content, "totalPages": total_pages}}
+
+    def enter(self, page):
+        with self.lock:
+            self.requested.append(page)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        return max(0.01 * (10 - page), 0) if page else 0
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+    def __call__(self, method, path, params, **kwargs):
+        time.sleep(self.enter(params["page"]))
+        try:
+            return self.page(params["page"], params["size"])
+        finally:
+            self.leave()
+
+    async def handler(self, request):
+        page, size = int(request.url.params["page"]), int(request.url.params["size"])
+        await asyncio.sleep(self.enter(page))
+        try:
+            return httpx.Response(200, json=self.page(page, size))
+        except requests.HTTPError:
+            return httpx.Response(500)
+        finally:
+            self.leave()
+
+
+def _identifiers(pages):
+    return [p.identifier for page in pages for p in page.content]
+
+
+def test_list_keeps_its_positional_parameters():
+    requested = []
+
+    def request(method, path, params, **kwargs):
+        requested.append(params)
+        return {"data": {"content": [pipeline_payload(1)], "totalPages": 1}}
+
+    client = _client()
+    client._request = request
+    pipelines = client.list("PipelineSetup", 2, 10, "name,ASC", "pipe")
+    assert [p.identifier for p in pipelines] == ["pipeline_1"]
+    assert requested[0]["page"] == 2 and requested[0]["size"] == 10
+    assert requested[0]["sort"] == "name,ASC"
+    assert requested[0]["searchTerm"] == "pipe"
+
+
+def test_iter_pages_in_order_with_bounded_concurrency():
+    server = PipelineServer(95)
+    client = _client(server.handler)
+    client._request = server
+    pages = list(client.iter_pages(size=10, concurrency=3))
+    assert [page.page for page in pages] == list(range(10))
+    assert _identifiers(pages) == [f"pipeline_{i}" for i in range(95)]
+    assert server.peak == 3
+
+    server = PipelineServer(95)
+    client = _client(server.handler)
+
+    async def collect():
+        return [page async for page in client.aiter_pages(size=10, concurrency=3)]
+
+    pages = asyncio.run(collect())
+    assert [page.page for page in pages] == list(range(10))
+    assert _identifiers(pages) == [f"pipeline_{i}" for i in range(95)]
+    assert server.peak == 3
+
+
+def test_iter_pages_stops_at_a_partial_page():
+    # The server claims more pages than there are pipelines
+    server = PipelineServer(25, total_pages=6)
+    client = _client(server.handler)
+    client._request = server
+    pages = list(client.iter_pages(size=10, concurrency=1))
+    assert [len(page.content) for page in pages] == [10, 10, 5]
+
+    async def collect():
+        return [page async for page in client.aiter_pages(size=10, concurrency=1)]
+
+    pages = asyncio.run(collect())
+    assert [len(page.content) for page in pages] == [10, 10, 5]
+
+
+def test_iter_pages_cancels_outstanding_fetches():
+    server = PipelineServer(200)
+    client = _client(server.handler)
+    client._request = server
+    for page in client.iter_pages(size=10, concurrency=2):
+        if page.page == 1:
+            break
+    time.sleep(0.2)
+    assert len(server.requested) < 8
+
+    server = PipelineServer(200, fail_page=2)
+    client = _client(server.handler)
+    client._request = server
+    with pytest.raises(requests.HTTPError):
+        list(client.iter_pages(size=10, concurrency=1))
+    time.sleep(0.1)
+    assert len(server.requested) < 8
+
+
+def test_aiter_pages_cancels_outstanding_fetches():
+    async def consume(client, stop):
+        pages = client.aiter_pages(size=10, concurrency=2)
+        try:
+            async for page in pages:
+                if page.page == stop:
+                    break
+        finally:
+            await pages.aclose()
+        await asyncio.sleep(0.2)
+
+    server = PipelineServer(200)
+    asyncio.run(consume(_client(server.handler), 1))
+    assert len(server.requested) < 8
+
+    server = PipelineServer(200, fail_page=2)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(consume(_client(server.handler), None))
+    assert len(server.requested) < 8
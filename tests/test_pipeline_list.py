@@ -0,0 +1,105 @@
+import pytest
+from textual import events
+from textual.app import App
+from textual.widgets import ListView
+
+from harness_tui.components import PipelineCard, PipelineList
+
+from conftest import make_pipeline
+
+
+class PipelineListApp(App):
+    def __init__(self, virtual=None):
+        super().__init__()
+        self.virtual = virtual
+
+    def compose(self):
+        yield PipelineList(id="pipeline-view", virtual=self.virtual)
+
+
+def _identifiers(list_view):
+    return [
+        item.query_one(PipelineCard).pipeline.identifier for item in list_view.children
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_reconciles_cards_and_keeps_the_highlight():
+    app = PipelineListApp()
+    async with app.run_test() as pilot:
+        pipelines = app.query_one(PipelineList)
+        list_view = app.query_one(ListView)
+        pipelines.pipeline_list = [make_pipeline(i) for i in range(5)]
+        await pilot.pause()
+        list_view.index = 2
+        await pilot.pause()
+        items = {item.id: item for item in list_view.children}
+
+        # A new pipeline is added above the highlight, one is removed and one changed
+        pipelines.pipeline_list = [
+            make_pipeline(9),
+            make_pipeline(0),
+            make_pipeline(1, updated=1000),
+            make_pipeline(2),
+            make_pipeline(4),
+        ]
+        await pilot.pause()
+        assert _identifiers(list_view) == [f"pipeline_{i}" for i in (9, 0, 1, 2, 4)]
+        assert list_view.highlighted_child is items["pipeline-list-item-pipeline_2"]
+        assert list_view.index == 3
+        # Existing cards are kept, the changed one gets the new pipeline
+        for i in (0, 1, 2, 4):
+            item = list_view.query_one(f"#pipeline-list-item-pipeline_{i}")
+            assert item is items[f"pipeline-list-item-pipeline_{i}"]
+        card = items["pipeline-list-item-pipeline_1"].query_one(PipelineCard)
+        assert card.pipeline.last_updated_at.timestamp() == 1
+
+
+def _wheel(app, event):
+    """Turn the mouse wheel over the list like the driver does."""
+    region = app.query_one(ListView).region
+    x, y = region.x + region.width // 2, region.y + region.height // 2
+    app.post_message(event(x, y, 0, 0, 0, False, False, False, x, y))
+
+
+@pytest.mark.asyncio
+async def test_virtual_window_slides_with_the_cursor_and_the_mouse_wheel():
+    app = PipelineListApp(virtual=True)
+    async with app.run_test(size=(80, 40)) as pilot:
+        pipelines = app.query_one(PipelineList)
+        list_view = app.query_one(ListView)
+        pipelines.pipeline_list = [make_pipeline(i) for i in range(300)]
+        await pilot.pause()
+        size = pipelines.window_size
+        assert abs(len(list_view.children) - size) <= 1 and size < 300
+        assert _identifiers(list_view)[0] == "pipeline_0"
+
+        # Scrolling past the last mounted card slides the window down
+        list_view.scroll_end(animate=False)
+        await pilot.pause()
+        _wheel(app, events.MouseScrollDown)
+        await pilot.pause()
+        assert pipelines._start == PipelineList.SCROLL_STEP
+        assert _identifiers(list_view)[0] == f"pipeline_{PipelineList.SCROLL_STEP}"
+        assert len(list_view.children) == size
+
+        list_view.scroll_home(animate=False)
+        await pilot.pause()
+        _wheel(app, events.MouseScrollUp)
+        await pilot.pause()
+        assert pipelines._start == 0
+
+        # Moving the cursor near the end of the window slides it along, the window
+        # was slid away from the highlighted card so the first press highlights
+        # the first card
+        list_view.focus()
+        for _ in range(size - PipelineList.OVERSCAN + 1):
+            await pilot.press("down")
+        await pilot.pause()
+        assert pipelines._start == size - PipelineList.OVERSCAN - size // 2
+        highlighted = list_view.highlighted_child.query_one(PipelineCard)
+        assert (
+            highlighted.pipeline.identifier
+            == f"pipeline_{size - PipelineList.OVERSCAN}"
+        )
+        assert len(list_view.children) == size
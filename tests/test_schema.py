@@ -0,0 +1,102 @@
+import io
+import json
+import os
+
+import pytest
+import requests
+import requests.adapters
+
+from harness_tui import schema
+from harness_tui.schema import PIPELINE_SCHEMA, REGISTRY, SchemaCache
+
+SCHEMAS = {
+    PIPELINE_SCHEMA: {
+        "type": "object",
+        "properties": {"pipeline": {"$ref": f"{REGISTRY}/stage.json"}},
+    },
+    f"{REGISTRY}/stage.json": {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+    },
+}
+
+
+class _Adapter(requests.adapters.BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self.down = False
+
+    def send(self, request, **kwargs):
+        if self.down:
+            raise requests.ConnectionError("unreachable")
+        self.requests.append(request)
+        response = requests.Response()
+        response.request = request
+        if request.headers.get("If-None-Match") == '"v1"':
+            response.status_code, response.raw = 304, io.BytesIO()
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = '"v1"'
+            response.raw = io.BytesIO(json.dumps(SCHEMAS[request.url]).encode())
+        return response
+
+    def close(self):
+        pass
+
+
+def test_schema_cache_revalidates_and_works_offline(tmp_path):
+    adapter = _Adapter()
+    session = requests.Session()
+    session.mount("https://", adapter)
+    cache = SchemaCache(tmp_path, ttl=60, session=session)
+
+    validator = cache.validator()
+    assert validator.is_valid({"pipeline": {"name": "build"}})
+    assert not validator.is_valid({"pipeline": {"name": 1}})
+    assert len(adapter.requests) == 2
+
+    # Fresh schemas are served from disk
+    cache.get(PIPELINE_SCHEMA)
+    assert len(adapter.requests) == 2
+
+    # Expired schemas are revalidated with their ETag
+    for path in tmp_path.glob("*.json"):
+        os.utime(path, (0, 0))
+    assert cache.get(PIPELINE_SCHEMA) == SCHEMAS[PIPELINE_SCHEMA]
+    assert adapter.requests[-1].headers["If-None-Match"] == '"v1"'
+
+    # Cached schemas are used when the server is down, however old they are
+    adapter.down = True
+    for path in tmp_path.glob("*.json"):
+        os.utime(path, (0, 0))
+    offline = SchemaCache(tmp_path, offline=True, session=session)
+    for schemas in (cache, offline):
+        assert schemas.validator().is_valid({"pipeline": {"name": "build"}})
+    with pytest.raises(LookupError):
+        offline.get(f"{REGISTRY}/missing.json")
+    with pytest.raises(requests.ConnectionError):
+        cache.get(f"{REGISTRY}/missing.json")
+
+
+def test_pipeline_validator_retries_after_a_failure(monkeypatch):
+    attempts = []
+
+    def validator(self):
+        attempts.append(self.directory)
+        if len(attempts) == 1:
+            raise requests.ConnectionError("unreachable")
+        return "validator"
+
+    monkeypatch.setattr(SchemaCache, "validator", validator)
+    monkeypatch.setattr(schema, "_validator", None)
+    monkeypatch.setattr(schema, "_error", None)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            schema.pipeline_validator()
+    assert len(attempts) == 1
+
+    monkeypatch.setattr(schema, "RETRY_DELAY", 0.0)
+    assert schema.pipeline_validator() == "validator"
+    assert schema.pipeline_validator() == "validator"
+    assert len(attempts) == 2
@@ -0,0 +1,153 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from harness_tui.log_index import LogIndex
+from harness_tui.log_store import LogStore
+from harness_tui.scraper import LogScraper, ScrapeManifest, remove_legacy_logs
+
+
+class FakeClient:
+    """Serves a few executions per pipeline and counts concurrent log downloads."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.status = "Success"
+        self.downloads = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.pipelines = SimpleNamespace(reference=self.reference)
+        self.logs = SimpleNamespace(blob=self.blob)
+
+    def reference(self, pipeline):
+        if pipeline == "broken":
+
+            def executions(size):
+                raise ConnectionError("boom")
+        else:
+
+            def executions(size):
+                return [self.summary(f"{pipeline}-1")]
+
+        def execution_details(plan_execution_id):
+            nodes = {
+                f"{plan_execution_id}-{step}": SimpleNamespace(
+                    identifier=step,
+                    log_base_key=f"acct/org/p/pipelineId:{pipeline}/step:{step}",
+                    base_fqn=f"pipeline.stages.build.spec.execution.steps.{step}",
+                    status=self.status,
+                    start_ts=None,
+                )
+                for step in ("compile", "test", "liteEngineTask")
+            }
+            return SimpleNamespace(
+                pipeline_execution_summary=self.summary(plan_execution_id),
+                execution_graph=SimpleNamespace(node_map=nodes),
+            )
+
+        return SimpleNamespace(
+            executions=executions, execution_details=execution_details
+        )
+
+    def summary(self, plan_execution_id):
+        return SimpleNamespace(
+            plan_execution_id=plan_execution_id,
+            run_sequence=1,
+            start_ts=None,
+            status=self.status,
+        )
+
+    def blob(self, log_key):
+        with self.lock:
+            self.downloads += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return [{"out": f"{log_key} line {i}\n"} for i in range(3)]
+
+
+def test_scraper_downloads_logs_concurrently(tmp_path):
+    client = FakeClient()
+    index = LogIndex(":memory:")
+    reports = []
+    store = LogStore(tmp_path)
+    scraper = LogScraper(client, store, index, blobs=8, on_progress=reports.append)
+    pipelines = [SimpleNamespace(identifier=f"p{i}") for i in range(20)]
+    stats = scraper.run([*pipelines, SimpleNamespace(identifier="broken")])
+
+    assert stats.pipelines == 20 and stats.executions == 20
+    assert stats.logs == 40 and len(index) == 40
+    assert stats.errors == {"executions": 1} and "boom" in stats.last_error
+    assert len(store) == 40
+    assert store.read("acct/org/p/pipelineId:p3/step:test").startswith("acct/")
+    assert 1 < client.peak <= 8
+    assert reports and reports[-1] is stats
+    assert index.search("line")[0].stage == "build"
+
+
+def test_scraper_skips_what_finished_in_earlier_runs(tmp_path):
+    client = FakeClient(delay=0)
+    manifest = ScrapeManifest(tmp_path / "manifest.db")
+    pipelines = [SimpleNamespace(identifier=f"p{i}") for i in range(3)]
+
+    client.status = "Running"
+    stats = LogScraper(client, LogStore(tmp_path), manifest=manifest).run(pipelines)
+    assert stats.logs == 6 and len(manifest) == 6
+    assert sorted(manifest.unfinished()) == [
+        ("p0", "p0-1"),
+        ("p1", "p1-1"),
+        ("p2", "p2-1"),
+    ]
+
+    # Running executions are scraped again until they finish
+    client.status = "Success"
+    stats = LogScraper(client, LogStore(tmp_path), manifest=manifest).run(pipelines[:1])
+    assert stats.executions == 3 and stats.logs == 6
+    assert manifest.unfinished() == [] and manifest.execution_done("p1-1")
+
+    stats = LogScraper(client, LogStore(tmp_path), manifest=manifest).run(pipelines)
+    assert stats.executions == 0 and stats.skipped == 3
+    assert client.downloads == 12
+
+
+def test_scraper_cancel_stops_promptly(tmp_path):
+    client = FakeClient(delay=0.2)
+    scraper = LogScraper(client, LogStore(tmp_path), blobs=2)
+    pipelines = [SimpleNamespace(identifier=f"p{i}") for i in range(50)]
+    threading.Timer(0.3, scraper.cancel).start()
+    started = time.monotonic()
+    stats = scraper.run(pipelines)
+
+    assert scraper.cancelled and time.monotonic() - started < 1.0
+    assert stats.logs < 100
+
+
+def test_scraper_cancel_returns_once_tasks_in_flight_finish(tmp_path):
+    client = FakeClient(delay=0.2)
+    scraper = LogScraper(client, LogStore(tmp_path), blobs=4)
+    pipelines = [SimpleNamespace(identifier=f"p{i}") for i in range(50)]
+    runner = threading.Thread(target=scraper.run, args=(pipelines,))
+    runner.start()
+    while not client.active:
+        time.sleep(0.01)
+    scraper.cancel()
+    assert client.active == 0
+    downloads = client.downloads
+    runner.join()
+    assert client.downloads == downloads
+
+
+def test_legacy_plain_text_logs_are_removed_once(tmp_path):
+    (tmp_path / "pipeline__1__build__compile.log").write_text("hello\n")
+    (tmp_path / "last_update").write_text("0")
+    store = LogStore(tmp_path / "store")
+    assert remove_legacy_logs(tmp_path) == ["pipeline__1__build__compile.log"]
+    assert not list(tmp_path.glob("*.log")) and len(store) == 0
+    assert (tmp_path / "last_update").exists()
+    # Later scrapes leave the directory alone
+    (tmp_path / "notes.log").write_text("mine\n")
+    assert remove_legacy_logs(tmp_path) == []
+    assert (tmp_path / "notes.log").exists()
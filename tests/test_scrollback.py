@@ -0,0 +1,30 @@
+import pytest
+
+from harness_tui.scrollback import Scrollback
+
+
+def test_scrollback_spills_old_lines_and_reads_them_back(tmp_path):
+    scrollback = Scrollback(tmp_path, memory_lines=8)
+    lines = [f"line {i} ✓" for i in range(50)]
+    scrollback.extend(lines[:10])
+    for line in lines[10:]:
+        scrollback.append(line)
+
+    assert len(scrollback) == 50
+    assert scrollback.spilled > 0 and len(scrollback._recent) <= 8
+    assert list(scrollback) == lines
+    assert scrollback[-1] == lines[-1]
+    assert scrollback[3:6] == lines[3:6]
+
+    scrollback[-1] += " done"
+    assert scrollback[49] == "line 49 ✓ done"
+    with pytest.raises(IndexError):
+        scrollback[0] = "rewritten"
+    with pytest.raises(IndexError):
+        scrollback[50]
+
+    scrollback.clear()
+    assert len(scrollback) == 0 and scrollback.spilled_bytes == 0
+    scrollback.extend(["again"] * 20)
+    assert scrollback[0] == "again" and len(scrollback) == 20
+    scrollback.close()
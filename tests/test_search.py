@@ -0,0 +1,49 @@
+from harness_tui.search import PIPELINE_FIELDS, SearchIndex
+
+
+def _index():
+    index = SearchIndex(PIPELINE_FIELDS)
+    index.add(
+        "build_prod",
+        {
+            "name": ["Build Prod"],
+            "identifier": ["build_prod"],
+            "tags": ["team:data", "data"],
+            "stages": ["Compile", "Deploy"],
+            "description": [""],
+        },
+    )
+    index.add(
+        "nightly",
+        {
+            "name": ["Nightly Sync"],
+            "identifier": ["nightly"],
+            "tags": ["team:platform", "platform"],
+            "stages": ["Sync"],
+            "description": ["Syncs the production warehouse"],
+        },
+    )
+    return index
+
+
+def test_search_index_ranks_and_matches_all_fields():
+    index = _index()
+    assert [key for key, _ in index.search("prod")] == ["build_prod", "nightly"]
+    assert [key for key, _ in index.search("team:platform")] == ["nightly"]
+    assert [key for key, _ in index.search("deploy")] == ["build_prod"]
+    assert [key for key, _ in index.search("bld-prd")] == ["build_prod"]
+    assert [key for key, _ in index.search("nightyl")] == ["nightly"]
+    assert index.search("warehouse zzz") == []
+    assert [key for key, _ in index.search("nightyl sync")] == ["nightly"]
+    assert [key for key, _ in index.search("data sync")] == []
+    assert index.search("  ") == []
+
+
+def test_search_index_replaces_and_discards_documents():
+    index = _index()
+    index.add("nightly", {"name": ["Hourly Sync"]})
+    assert [key for key, _ in index.search("hourly")] == ["nightly"]
+    assert index.search("production") == []
+    index.discard("nightly")
+    assert "nightly" not in index and len(index) == 1
+    assert index.search("sync") == []
@@ -0,0 +1,25 @@
+import os
+
+from harness_tui.api.store import ExecutionStore
+
+
+def test_execution_store_round_trip_and_lru_eviction(tmp_path):
+    store = ExecutionStore(tmp_path)
+    payloads = {
+        name: {"status": "Success", "blob": os.urandom(2048).hex()}
+        for name in ("exec_a", "exec_b", "exec_c")
+    }
+    store.put("exec_a", payloads["exec_a"])
+    assert store.get("exec_a") == payloads["exec_a"]
+    assert store.get("missing") is None
+    assert store.get("../escape") is None
+
+    store.put("exec_b", payloads["exec_b"])
+    os.utime(tmp_path / "exec_a.json.gz", (0, 0))
+    store._index = None
+    store.max_bytes = store.nbytes + store.nbytes // 4
+    store.put("exec_c", payloads["exec_c"])
+    assert store.get("exec_a") is None
+    assert store.get("exec_b") == payloads["exec_b"]
+    assert store.get("exec_c") == payloads["exec_c"]
+    assert store.stats.evictions == 1
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import yaml
+
+from harness_tui.utils import (
+    YAML_CACHE,
+    CacheStats,
+    SingleFlight,
+    TTLCache,
+    load_yaml,
+    ttl_cache,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expiry_and_stale_window():
+    clock = FakeClock()
+    cache = TTLCache(10, stale_ttl=5, timer=clock)
+    cache.set("a", 1)
+    assert cache.lookup("a") == (True, 1, False)
+    clock.now = 12
+    assert cache.lookup("a") == (True, 1, True)
+    clock.now = 16
+    assert cache.lookup("a") == (False, None, False)
+    assert cache.stats.hits == 1
+    assert cache.stats.stale_hits == 1
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction_by_count_and_bytes():
+    cache = TTLCache(60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.stats.evictions == 1
+
+    cache = TTLCache(60, max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+    assert "a" not in cache and "b" in cache
+    assert cache.nbytes == 6
+    cache.set("c", "z" * 11)
+    assert "c" not in cache
+
+
+def test_ttl_cache_decorator_keys_and_invalidation():
+    calls = []
+
+    class Ref:
+        cache_key = ("acct", "pipe")
+
+        @ttl_cache(60, namespace="test.value")
+        def value(self, size: int = 25):
+            calls.append(size)
+            return size
+
+        @ttl_cache(60, namespace="test.value")
+        async def avalue(self, size: int = 25):
+            calls.append(size)
+            return size
+
+    assert Ref().value() == 25
+    assert Ref().value(size=25) == 25
+    assert asyncio.run(Ref().avalue(25)) == 25
+    assert calls == [25]
+
+    Ref.value.cache_invalidate(Ref())
+    assert Ref().value() == 25
+    assert calls == [25, 25]
+
+
+def test_ttl_cache_bounds_async_results():
+    @ttl_cache(60, maxsize=2)
+    async def double(value):
+        return value * 2
+
+    async def run():
+        return [await double(value) for value in range(5)]
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8]
+    assert len(double.cache) == 2 and double.cache.stats.evictions == 3
+
+
+def test_ttl_cache_does_not_cache_errors():
+    calls = []
+
+    @ttl_cache(60)
+    def boom():
+        calls.append(1)
+        raise ValueError
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            boom()
+    assert len(calls) == 2
+
+
+def test_single_flight_coalesces_async_and_sync_callers():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "payload"
+
+    def sync_fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "payload"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["payload"] * 5
+    assert len(calls) == 1
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", sync_fetch)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["payload"] * 5
+    assert len(calls) == 2
+    assert flight.stats.calls == 2
+    assert flight.stats.coalesced == 8
+
+
+def test_single_flight_follower_takes_over_cancelled_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("key", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == 2
+    assert flight.stats.takeovers == 1
+
+
+def test_load_yaml_shares_parses_and_returns_copies(monkeypatch):
+    YAML_CACHE.clear()
+    # Earlier tests may have parsed YAML through the shared cache
+    monkeypatch.setattr(YAML_CACHE, "stats", CacheStats())
+    text = "pipeline:\n  stages: [build, deploy]\n"
+    first = load_yaml(text)
+    first["pipeline"]["stages"].append("mutated")
+    assert load_yaml(text) == {"pipeline": {"stages": ["build", "deploy"]}}
+    assert YAML_CACHE.stats.misses == 1
+    assert YAML_CACHE.stats.hits == 1
+    with pytest.raises(yaml.YAMLError):
+        load_yaml("key: [unclosed")
+    assert len(YAML_CACHE) == 1